@@ -0,0 +1,103 @@
+"""
+Synthetic, deterministic fixtures for the offline benchmarks: article texts, article HTML pages,
+news API payloads and Delta table frames.
+"""
+import random
+from html import escape
+from typing import Dict, List
+
+import pandas as pd
+
+
+SCALES = {
+    "small": 200,
+    "medium": 1_000,
+    "large": 5_000,
+}
+
+WORDS = (
+    "bitcoin price market investors traders exchange etf inflows analysts rally support resistance "
+    "halving miners hashrate liquidity volatility regulators approval futures options funding rate "
+    "institutional demand supply wallet whales accumulation selloff breakout treasury federal reserve "
+    "interest rates dollar index equities correlation network fees adoption custody stablecoin "
+    "the a of and to in on for with as by from that this which is was were has have will could"
+).split()
+
+PROMO_SENTENCES = [
+    "Click here to claim your exclusive free bonus code now!!",
+    "Limited offer, deposit today and win an instant prize!!",
+]
+
+
+def article_text(rng: random.Random, sentences: int, spam: bool = False) -> str:
+    """A news-like article of the given number of sentences, optionally padded with promotional lines."""
+    lines = []
+    for _ in range(sentences):
+        words = rng.choices(WORDS, k=rng.randint(12, 28))
+        lines.append(" ".join(words).capitalize() + ".")
+    if spam:
+        lines.extend(rng.choices(PROMO_SENTENCES, k=max(3, sentences // 3)))
+    return " ".join(lines)
+
+
+def article_texts(count: int, seed: int = 7) -> List[str]:
+    """Articles with a realistic mix of lengths, roughly one in ten promotional."""
+    rng = random.Random(seed)
+    return [
+        article_text(rng, sentences=rng.choice([4, 15, 40, 90]), spam=rng.random() < 0.1)
+        for _ in range(count)
+    ]
+
+
+def article_html(title: str, text: str) -> str:
+    """Wrap an article in the boilerplate of a typical news site page."""
+    paragraphs = "\n".join(f"<p>{escape(chunk)}</p>" for chunk in text.split(". ") if chunk)
+    navigation = "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(20))
+    return (
+        "<!DOCTYPE html><html><head>"
+        f"<title>{escape(title)}</title><meta charset=\"utf-8\"></head><body>"
+        f"<header><nav><ul>{navigation}</ul></nav></header>"
+        f"<main><article><h1>{escape(title)}</h1>{paragraphs}</article></main>"
+        "<aside><h3>Related</h3><ul><li>Markets wrap</li><li>Price analysis</li></ul></aside>"
+        "<footer><p>Copyright Example News. All rights reserved.</p></footer>"
+        "</body></html>"
+    )
+
+
+def article_pages(count: int, seed: int = 7) -> Dict[str, str]:
+    """HTML pages keyed by their request path."""
+    return {
+        f"/news/{i}.html": article_html(f"Bitcoin market update {i}", text)
+        for i, text in enumerate(article_texts(count, seed))
+    }
+
+
+def news_api_payload(count: int, base_url: str = "http://127.0.0.1", seed: int = 7) -> List[Dict]:
+    """Records shaped like the `data` items returned by the crypto news API."""
+    rng = random.Random(seed)
+    start = pd.Timestamp("2024-01-01", tz="US/Eastern")
+    return [
+        {
+            "news_id": str(100_000_000 + i),
+            "date": (start + pd.Timedelta(minutes=17 * i)).strftime("%a, %d %b %Y %H:%M:%S %z"),
+            "type": "Article",
+            "source_name": rng.choice(["CoinDesk", "Cointelegraph", "Decrypt", "The Block"]),
+            "tickers": ["BTC"],
+            "topics": rng.sample(["ETF", "mining", "regulation", "halving", "whales"], k=2),
+            "news_url": f"{base_url}/news/{i}.html",
+            "rank_score": str(round(rng.uniform(0, 10), 2)),
+            "sentiment": rng.choice(["Positive", "Negative", "Neutral"]),
+            "title": f"Bitcoin market update {i}",
+            "text": article_text(rng, sentences=2),
+        }
+        for i in range(count)
+    ]
+
+
+def scraped_frame(news_metadata: pd.DataFrame, texts: List[str]) -> pd.DataFrame:
+    """Scraped-table rows for the given metadata, as written by the scrape stage."""
+    frame = news_metadata[['news_id', 'date_utc', 'year_utc', 'month_utc', 'day_utc']].copy()
+    frame['full_text'] = [texts[i % len(texts)] for i in range(len(frame))]
+    frame['status_code'] = 200
+    frame['error'] = pd.Series(None, index=frame.index, dtype='string')
+    return frame
@@ -0,0 +1,44 @@
+"""
+Local HTTP stand-in for news sites, serves pre-generated pages so the scraper is benchmarked without network.
+"""
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+
+def _handler(pages: Dict[str, bytes]) -> type:
+
+    class PageHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            page = pages.get(self.path.split("?", 1)[0])
+            if page is None:
+                self.send_error(404)
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+
+        def log_message(self, *_):
+            pass
+
+    return PageHandler
+
+
+@contextmanager
+def serve_pages(pages: Dict[str, str]):
+    """Serve the pages keyed by request path on a free local port, yields the base URL."""
+    encoded = {path: html.encode("utf-8") for path, html in pages.items()}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(encoded))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,258 @@
+"""
+Offline benchmark suite of the news pipeline hot paths, run on synthetic fixtures with no network access.
+
+Results are written as JSON under benchmarks/results/ and can be compared against an earlier run,
+the exit code is 1 when a benchmark failed or got slower than the allowed threshold.
+
+Usage:
+    python -m benchmarks.run_benchmarks --scale medium
+    python -m benchmarks.run_benchmarks --scale medium --baseline benchmarks/results/<earlier run>.json
+    python -m benchmarks.run_benchmarks --skip summarizer scraper
+
+The summarizer benchmark loads the sentence embedding model, which has to be in the local cache.
+"""
+import argparse
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+import pyprojroot
+
+from benchmarks import fixtures
+from benchmarks.local_server import serve_pages
+
+
+RESULTS_DIR = pyprojroot.here() / Path("benchmarks") / "results"
+DEFAULT_REGRESSION_THRESHOLD = 0.2
+
+
+def measure(
+    function: Callable[[], object], items: int, repeats: int = 3, setup: Optional[Callable[[], object]] = None
+) -> Dict:
+    """Best wall time of several repeats, along with the throughput. `setup` runs untimed before each repeat."""
+    timings = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start_time = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start_time)
+
+    best = min(timings)
+    return {
+        "items": items,
+        "repeats": repeats,
+        "seconds": round(best, 4),
+        "items_per_second": round(items / best, 1) if best else None,
+    }
+
+
+# # Benchmarks
+
+def bench_news_api(count: int, repeats: int) -> Dict[str, Dict]:
+    from src.collect.news.utils.news_api_caller import CryptoNewsFetcher
+
+    payload = fixtures.news_api_payload(count)
+    fetcher = CryptoNewsFetcher()
+    return {"news_api.post_process": measure(lambda: fetcher._post_process_news(payload), count, repeats)}
+
+
+def bench_scraper(count: int, repeats: int) -> Dict[str, Dict]:
+    from src.collect.news.utils.article_url_scraper import PowerScraper
+
+    pages = fixtures.article_pages(count)
+    with serve_pages(pages) as base_url, PowerScraper() as scraper:
+        urls = [base_url + path for path in pages]
+
+        results = scraper.scrape_urls(urls[:1])
+        if not results[0].success:
+            raise RuntimeError(f"Local page could not be scraped: {results[0].error}")
+
+        return {
+            "power_scraper.scrape_urls": measure(lambda: scraper.scrape_urls(urls), count, repeats),
+        }
+
+
+def bench_text_processing(count: int, repeats: int) -> Dict[str, Dict]:
+    from src.clean.news.utils.text_processor import TextProcessor
+    from src.clean.news.utils.spam_detector import SpamDetector
+
+    texts = fixtures.article_texts(count)
+    processor = TextProcessor()
+    detector = SpamDetector()
+    # Warm up the stopwords and tokenizer so model loading is not part of the measurement
+    detector.get_scores(texts[:1])
+    processor.measure_text(texts[0])
+
+    def cold_spam_scores():
+        with SpamDetector._cache_lock:
+            SpamDetector._cache.clear()
+        detector.get_scores(texts)
+
+    return {
+        "spam_detector.get_scores.cold": measure(cold_spam_scores, count, repeats),
+        "spam_detector.get_scores.cached": measure(lambda: detector.get_scores(texts), count, repeats),
+        "text_processor.clean_text": measure(lambda: [processor.clean_text(text) for text in texts], count, repeats),
+        "text_processor.generate_curated_texts": measure(
+            lambda: processor.generate_curated_texts(texts, [None] * count), count, repeats
+        ),
+    }
+
+
+def bench_summarizer(count: int, repeats: int) -> Dict[str, Dict]:
+    from src.clean.news.utils.text_summarizer import TextSummarizer
+
+    texts = fixtures.article_texts(count)
+    summarizer = TextSummarizer()
+    summarizer.text_summarize(max(texts, key=len))
+
+    result = {
+        "text_summarizer.text_summarize": measure(
+            lambda: [summarizer.text_summarize(text) for text in texts], count, repeats
+        ),
+    }
+    result["text_summarizer.text_summarize"]["paths"] = dict(summarizer.path_counts)
+    return result
+
+
+def bench_delta(count: int, repeats: int) -> Dict[str, Dict]:
+    from src.collect.news.utils.news_api_caller import CryptoNewsFetcher
+    from src.core.storage.delta_lake import DeltaLakeManager, TableNames
+
+    metadata = CryptoNewsFetcher()._post_process_news(fixtures.news_api_payload(count))
+    scraped = fixtures.scraped_frame(metadata, fixtures.article_texts(200))
+
+    # Half of the merge batch updates existing rows, the other half inserts new ones
+    updates = scraped.iloc[: count // 2].assign(status_code=201)
+    inserts = scraped.iloc[: count // 2].assign(news_id=lambda frame: frame['news_id'] + "x")
+    merge_batch = pd.concat([updates, inserts], ignore_index=True)
+
+    table = TableNames.SCRAPED_ARTICLES.value
+    results = {}
+    with tempfile.TemporaryDirectory() as root:
+        deltalake = None
+
+        def recreate_table():
+            # Every merge repeat starts from a freshly created table, so its inserts stay inserts
+            nonlocal deltalake
+            if deltalake is not None:
+                shutil.rmtree(deltalake.root)
+            deltalake = DeltaLakeManager(root=Path(tempfile.mkdtemp(dir=root)))
+            deltalake.write_table(table, scraped)
+
+        results["delta.write.create"] = measure(recreate_table, count, repeats=1)
+        results["delta.write.merge"] = measure(
+            lambda: deltalake.write_table(table, merge_batch), len(merge_batch), repeats, setup=recreate_table
+        )
+        # Every repeat reads through the manager's cached table handle
+        results["delta.read.full"] = measure(lambda: deltalake.read_table(table), count, max(repeats, 2))
+        results["delta.read.filtered_columns"] = measure(
+            lambda: deltalake.read_table(table, filters=[('status_code', '=', 200)], columns=['news_id']),
+            count, repeats,
+        )
+
+    return results
+
+
+BENCHMARKS = {
+    "news_api": bench_news_api,
+    "scraper": bench_scraper,
+    "text_processing": bench_text_processing,
+    "summarizer": bench_summarizer,
+    "delta": bench_delta,
+}
+
+
+# # Reporting
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=pyprojroot.here(),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scale: str, repeats: int, skip: List[str]) -> Dict:
+    count = fixtures.SCALES[scale]
+    results, errors = {}, {}
+    for name, benchmark in BENCHMARKS.items():
+        if name in skip:
+            continue
+        print(f"Running {name} at {count} items...", flush=True)
+        try:
+            results.update(benchmark(count, repeats))
+        except Exception as e:
+            errors[name] = str(e)
+            print(f"  {name} failed: {e}", flush=True)
+
+    return {
+        "commit": _git_commit(),
+        "timestamp_utc": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": scale,
+        "results": results,
+        "errors": errors,
+    }
+
+
+def compare(report: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Benchmarks that got slower than the baseline by more than the threshold."""
+    if baseline.get("scale") != report["scale"]:
+        print(f"Warning: comparing scale '{report['scale']}' against baseline scale '{baseline.get('scale')}'")
+
+    regressions = []
+    for name, result in report["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous.get("seconds"):
+            continue
+        ratio = result["seconds"] / previous["seconds"]
+        print(f"  {name:45s} {previous['seconds']:9.4f}s -> {result['seconds']:9.4f}s  ({ratio:5.2f}x)")
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=fixtures.SCALES, default="small", help="Number of synthetic articles")
+    parser.add_argument("--repeats", type=int, default=3, help="Repeats per benchmark, the best one is kept")
+    parser.add_argument("--skip", nargs="*", default=[], choices=BENCHMARKS, help="Benchmarks to leave out")
+    parser.add_argument("--output", type=Path, default=None, help="Result file, defaults to benchmarks/results/")
+    parser.add_argument("--baseline", type=Path, default=None, help="Earlier result file to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+        help="Allowed slowdown against the baseline before failing, 0.2 is 20%%",
+    )
+    args = parser.parse_args()
+
+    report = run(args.scale, args.repeats, args.skip)
+
+    output = args.output or RESULTS_DIR / f"{datetime.now():%Y%m%d_%H%M%S}_{report['commit'] or 'nogit'}_{args.scale}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}")
+
+    failed = bool(report["errors"])
+    if failed:
+        print(f"Failed benchmarks: {', '.join(report['errors'])}")
+
+    if args.baseline:
+        regressions = compare(report, json.loads(args.baseline.read_text()), args.threshold)
+        if regressions:
+            print(f"Regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+            failed = True
+
+    if failed:
+        sys.exit(1)
@@ -0,0 +1,106 @@
+"""
+Parity check and throughput benchmark of the TextSummarizer embedding backends.
+
+Usage:
+    python scripts/benchmark_embedding_backends.py --export --limit 200
+"""
+import argparse
+import time
+
+import numpy as np
+from nltk.tokenize import sent_tokenize
+
+from src.core.storage.delta_lake import DeltaLakeManager, TableNames
+from src.core.config import constants
+from src.clean.news.utils.text_summarizer import TextSummarizer
+from src.clean.news.utils.embedding_backends import (
+    TorchEmbeddingBackend, OnnxEmbeddingBackend, export_onnx_model
+)
+
+
+def load_articles(limit: int) -> list:
+    """Selected texts long enough to go through the summarizer."""
+    cleaned = DeltaLakeManager().read_table(
+        table_name=TableNames.CLEANED_ARTICLES.value,
+        columns=['selected_text', 'selected_text_token_count'],
+    )
+    cleaned = cleaned[cleaned['selected_text_token_count'] >= constants.MAXIMUM_ARTICLE_TOKENS]
+    return cleaned['selected_text'].dropna().head(limit).tolist()
+
+
+def check_parity(reference: TextSummarizer, candidate: TextSummarizer, articles: list, top_k: int = 10) -> dict:
+    """Compare sentence rankings and the resulting summaries of two summarizers."""
+    identical_rankings, identical_summaries, top_k_overlaps, max_deviation = 0, 0, [], 0.0
+
+    sentence_lists = [s for s in map(sent_tokenize, articles) if len(s) >= TextSummarizer.WINDOW_SIZE]
+    for sentences in sentence_lists:
+        reference_ranking = reference.rank_sentences(sentences)
+        candidate_ranking = candidate.rank_sentences(sentences)
+
+        identical_rankings += np.array_equal(reference_ranking, candidate_ranking)
+        top_k_overlaps.append(len(set(reference_ranking[:top_k]) & set(candidate_ranking[:top_k])) / min(top_k, len(sentences)))
+
+        reference_embeddings = reference.backend.encode(sentences)
+        candidate_embeddings = candidate.backend.encode(sentences)
+        cosine = (reference_embeddings * candidate_embeddings).sum(axis=1)
+        max_deviation = max(max_deviation, float(1 - cosine.min()))
+
+    for article in articles:
+        identical_summaries += reference.text_summarize(article) == candidate.text_summarize(article)
+
+    return {
+        "articles": len(articles),
+        "identical_rankings": f"{identical_rankings}/{len(sentence_lists)}",
+        "identical_summaries": f"{identical_summaries}/{len(articles)}",
+        f"mean_top_{top_k}_overlap": round(float(np.mean(top_k_overlaps)), 4) if top_k_overlaps else None,
+        "max_embedding_cosine_deviation": round(max_deviation, 6),
+    }
+
+
+def benchmark(summarizer: TextSummarizer, articles: list, repeats: int = 3) -> dict:
+    """Embedding throughput of a summarizer backend, best of several repeats."""
+    sentence_lists = [sent_tokenize(article) for article in articles]
+    num_sentences = sum(map(len, sentence_lists))
+
+    # Warm up so model loading is not part of the measurement
+    summarizer.backend.encode(sentence_lists[0])
+
+    timings = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        for sentences in sentence_lists:
+            summarizer.backend.encode(sentences)
+        timings.append(time.perf_counter() - start_time)
+
+    best = min(timings)
+    return {
+        "backend": summarizer.backend.name,
+        "sentences": num_sentences,
+        "seconds": round(best, 3),
+        "sentences_per_second": round(num_sentences / best, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=200, help="Number of articles to sample")
+    parser.add_argument("--export", action="store_true", help="Export and quantize the ONNX model first")
+    parser.add_argument("--threads", type=int, default=None, help="ONNX Runtime intra-op threads")
+    parser.add_argument("--fp32", action="store_true", help="Use the unquantized ONNX model")
+    args = parser.parse_args()
+
+    if args.export:
+        export_onnx_model()
+
+    articles = load_articles(args.limit)
+    if not articles:
+        raise SystemExit("No articles above the summarization threshold found in the cleaned table")
+
+    torch_summarizer = TextSummarizer(backend=TorchEmbeddingBackend())
+    onnx_summarizer = TextSummarizer(
+        backend=OnnxEmbeddingBackend(quantized=not args.fp32, intra_op_threads=args.threads)
+    )
+
+    print("Parity:", check_parity(torch_summarizer, onnx_summarizer, articles))
+    for summarizer in (torch_summarizer, onnx_summarizer):
+        print("Benchmark:", benchmark(summarizer, articles))
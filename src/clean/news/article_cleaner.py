@@ -1,13 +1,19 @@
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 from pathlib import Path
 import numpy as np
 import pandas as pd
 
-from src.core.storage.delta_lake import DeltaLakeManager, TableNames
+from src.core.storage.delta_lake import get_deltalake, TableNames, article_status, DUPLICATE_FLAG
+from src.core.storage.change_feed import ChangeFeedConsumer
+from src.core.storage.sharding import ShardSpec
+from src.core.storage.write_coordinator import DeltaWriteCoordinator
 from src.clean.news.utils.text_summarizer import TextSummarizer
 from src.clean.news.utils.text_processor import TextProcessor
 from src.core.config import constants
+from src.core.models.model_registry import model_registry
 from src.core.logging.logger import setup_logger
+from src.core.metrics.metrics import metrics, instrumented_endpoint
+from src.core.profiling.profiler import profiled_endpoint
 
 logger = setup_logger("ArticleCleanEndpoint", Path("crypto_news.log"))
 
@@ -15,34 +21,100 @@ logger = setup_logger("ArticleCleanEndpoint", Path("crypto_news.log"))
 class ArticleCleanEndpoint:
     """Endpoint for cleaning and processing article text."""
     
-    def __init__(self):
-        self.deltalake = DeltaLakeManager()
+    def __init__(self, shard: Optional[ShardSpec] = None):
+        # Models behind the text utilities are loaded lazily from the shared registry
+        self.deltalake = get_deltalake()
+        self.shard = shard or ShardSpec()
+        self.feed = ChangeFeedConsumer(f"clean/{self.shard}", TableNames.SCRAPED_ARTICLES.value, self.deltalake)
         self.text_processor = TextProcessor()
         self.text_summarizer = TextSummarizer()
         
-    def _get_pending_articles(self) -> Tuple[pd.DataFrame, List[str]]:
+    def _get_pending_articles(self, news_ids: Optional[List[str]] = None) -> Tuple[pd.DataFrame, List[str]]:
         """Get articles pending cleaning from status table."""
         try:
+            filters = [
+                (TableNames.METADATA_ARTICLES.value, "=", True),
+                (TableNames.SCRAPED_ARTICLES.value, "=", True),
+                (TableNames.CLEANED_ARTICLES.value, "=", False),
+                (DUPLICATE_FLAG, "=", False),
+            ]
+            if news_ids is not None:
+                filters.append(("news_id", "in", news_ids))
+
             status_table = self.deltalake.read_table(
                 table_name=TableNames.STATUS_ARTICLES.value,
-                filters=[
-                    (TableNames.METADATA_ARTICLES.value, "=", True),
-                    (TableNames.SCRAPED_ARTICLES.value, "=", True),
-                    (TableNames.CLEANED_ARTICLES.value, "=", False),
-                ]
+                filters=filters
             )
+            status_table = status_table[self.shard.mask(status_table['news_id'])]
             
             if status_table.empty:
                 logger.info("No pending articles to clean")
                 return pd.DataFrame(), []
                 
             news_id_list = status_table['news_id'].tolist()
+
+            # Near-duplicates of an already known article are left to their canonical article
+            duplicates = self.deltalake.read_table(
+                table_name=TableNames.DEDUP_ARTICLES.value,
+                filters=[("news_id", "in", news_id_list), ("is_canonical", "=", False)],
+                columns=['news_id'],
+            )
+            if not duplicates.empty:
+                logger.info(f"Skipping {len(duplicates)} near-duplicate articles")
+                # Duplicates linked before the dedup stage flagged them are taken out of the pending set once
+                self.deltalake.write_table(
+                    TableNames.STATUS_ARTICLES.value,
+                    article_status(duplicates['news_id'], TableNames.SCRAPED_ARTICLES, duplicate=True)
+                )
+                status_table = status_table[~status_table['news_id'].isin(duplicates['news_id'])]
+                news_id_list = status_table['news_id'].tolist()
+
             return status_table, news_id_list
             
         except Exception as e:
             logger.error(f"Error fetching pending articles: {e}")
             raise
             
+    def _get_new_articles(self) -> Optional[pd.DataFrame]:
+        """
+        Scraped rows changed since the last full run that are not cleaned yet, without the near-duplicates.
+        None without a feed checkpoint.
+        """
+        try:
+            changes = self.feed.read_changes()
+            if changes is None or changes.empty:
+                return changes
+
+            changes = changes[self.shard.mask(changes['news_id'])]
+            cleaned = self.deltalake.read_matching(TableNames.CLEANED_ARTICLES.value, changes, columns=['news_id'])
+            duplicates = self.deltalake.read_matching(
+                TableNames.DEDUP_ARTICLES.value, changes, columns=['news_id'], filters=[("is_canonical", "=", False)]
+            )
+            if not duplicates.empty:
+                logger.info(f"Skipping {len(duplicates)} near-duplicate articles")
+
+            skipped = set(cleaned['news_id']) | set(duplicates['news_id'])
+            return changes[~changes['news_id'].isin(skipped)].reset_index(drop=True)
+
+        except Exception as e:
+            logger.error(f"Error fetching changed articles: {e}")
+            raise
+
+    def _fetch_changed_article_data(self, changes: pd.DataFrame) -> pd.DataFrame:
+        """Combine the changed scraped rows with their metadata and text, looked up in their partitions only."""
+        try:
+            news_metadata = self.deltalake.read_matching(TableNames.METADATA_ARTICLES.value, changes)
+            full_text = self.deltalake.read_matching(
+                TableNames.SCRAPED_ARTICLES.value, changes, columns=['news_id', 'full_text']
+            )
+            news_articles = changes.drop(columns='full_text', errors='ignore').merge(full_text, on='news_id', how='left')
+
+            return pd.merge(news_metadata, news_articles, how='left')
+
+        except Exception as e:
+            logger.error(f"Error fetching article data: {e}")
+            raise
+
     def _fetch_article_data(self, news_id_list: List[str]) -> pd.DataFrame:
         """Fetch and combine metadata and scraped content."""
         try:
@@ -72,13 +144,10 @@ class ArticleCleanEndpoint:
             df['full_cleaned_text'] = df['full_text'].map(self.text_processor.clean_text)
             
             # Generate curated text
-            df[['full_cleaned_text', 'error', 'spam_score']] = df.apply(
-                lambda row: self.text_processor.generate_curated_text(
-                    row['full_cleaned_text'], 
-                    row['error']
-                ), 
-                axis=1
-            ).apply(pd.Series)
+            df[['full_cleaned_text', 'error', 'spam_score']] = pd.DataFrame(
+                self.text_processor.generate_curated_texts(df['full_cleaned_text'], df['error']),
+                index=df.index,
+            )
             
             # Calculate word and token counts
             for text_type in ['preview_text', 'full_cleaned_text']:
@@ -110,7 +179,10 @@ class ArticleCleanEndpoint:
             )
             
             # Generate LLM-ready text
-            df['llm_ready_text'] = df['selected_text'].map(self.text_summarizer.text_summarize)
+            self.text_summarizer.path_counts.clear()
+            with metrics.timer("clean_step_seconds", step="summarize"):
+                df['llm_ready_text'] = df['selected_text'].map(self.text_summarizer.text_summarize)
+            logger.info(f"Summarization paths: {dict(self.text_summarizer.path_counts)}")
             df[['llm_ready_text_word_count', 'llm_ready_text_token_count']] = (
                 df['llm_ready_text'].map(self.text_processor.measure_text).apply(pd.Series)
             )
@@ -131,22 +203,21 @@ class ArticleCleanEndpoint:
     def _persist_results(self, cleaned_data: pd.DataFrame, status_table: pd.DataFrame) -> None:
         """Persist cleaned data and update status."""
         try:
-            # Write cleaned data
-            self.deltalake.write_table(
-                table_name=TableNames.CLEANED_ARTICLES.value,
-                df=cleaned_data
-            )
-            
-            # Update status table
             status_table.loc[
                 status_table['news_id'].isin(cleaned_data['news_id']),
                 TableNames.CLEANED_ARTICLES.value
             ] = True
-            
-            self.deltalake.write_table(
-                table_name=TableNames.STATUS_ARTICLES.value,
-                df=status_table
-            )
+
+            # Cleaned data is committed before the status update that points at it
+            with DeltaWriteCoordinator(self.deltalake) as writer:
+                writer.buffer(
+                    table_name=TableNames.CLEANED_ARTICLES.value,
+                    df=cleaned_data
+                )
+                writer.buffer(
+                    table_name=TableNames.STATUS_ARTICLES.value,
+                    df=status_table
+                )
             
             logger.info(f"Successfully persisted {len(cleaned_data)} cleaned articles")
             
@@ -154,13 +225,25 @@ class ArticleCleanEndpoint:
             logger.error(f"Error persisting results: {e}")
             raise
             
-    def execute(self) -> Dict:
-        """Execute the article cleaning process."""
+    @profiled_endpoint("clean")
+    @instrumented_endpoint("clean")
+    def execute(self, news_ids: Optional[List[str]] = None) -> Dict:
+        """
+        Execute the article cleaning process, optionally for a batch of news_ids only.
+
+        Without news_ids the articles scraped since the last full run are read from the change feed.
+        """
         try:
-            # Get pending articles
-            status_table, news_id_list = self._get_pending_articles()
+            # Get pending articles, from the status table for batches or when the feed has no checkpoint yet
+            changes = self._get_new_articles() if news_ids is None else None
+            if changes is not None:
+                news_id_list = [] if changes.empty else changes['news_id'].tolist()
+            else:
+                status_table, news_id_list = self._get_pending_articles(news_ids)
             
             if not news_id_list:
+                if news_ids is None:
+                    self.feed.commit()
                 return {
                     "status": "success",
                     "articles_cleaned": 0,
@@ -168,22 +251,32 @@ class ArticleCleanEndpoint:
                 }
             
             # Fetch and combine article data
-            cleaning_data = self._fetch_article_data(news_id_list)
+            if changes is not None:
+                cleaning_data = self._fetch_changed_article_data(changes)
+                status_table = article_status(news_id_list, TableNames.SCRAPED_ARTICLES)
+            else:
+                cleaning_data = self._fetch_article_data(news_id_list)
             
             # Clean text
             logger.info("Cleaning Data...")
-            cleaning_data = self._clean_text(cleaning_data)
+            with metrics.timer("clean_step_seconds", step="clean_text"):
+                cleaning_data = self._clean_text(cleaning_data)
             
             # Engineer features
             logger.info("Feature Engineering Data...")
-            cleaned_data = self._engineer_features(cleaning_data)
+            with metrics.timer("clean_step_seconds", step="engineer_features"):
+                cleaned_data = self._engineer_features(cleaning_data)
             
             # Persist results
             self._persist_results(cleaned_data, status_table)
+            if news_ids is None:
+                self.feed.commit()
             
             return {
                 "status": "success",
                 "articles_cleaned": len(cleaned_data),
+                "summarization_paths": dict(self.text_summarizer.path_counts),
+                "model_load_seconds": model_registry.load_times(),
             }
             
         except Exception as e:
@@ -191,9 +284,9 @@ class ArticleCleanEndpoint:
             raise
 
 
-def run_article_cleaning() -> Dict:
+def run_article_cleaning(news_ids: Optional[List[str]] = None, shard: Optional[ShardSpec] = None) -> Dict:
     """Entry point for the article cleaning endpoint."""
-    return ArticleCleanEndpoint().execute()
+    return ArticleCleanEndpoint(shard=shard).execute(news_ids)
 
 
 if __name__ == "__main__":
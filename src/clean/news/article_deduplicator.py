@@ -0,0 +1,157 @@
+from typing import List, Dict, Tuple, Optional
+from pathlib import Path
+import pandas as pd
+
+from src.core.storage.delta_lake import get_deltalake, TableNames, article_status, DUPLICATE_FLAG
+from src.core.storage.write_coordinator import DeltaWriteCoordinator
+from src.clean.news.utils.near_duplicate_detector import NearDuplicateDetector
+from src.core.logging.logger import setup_logger
+from src.core.metrics.metrics import metrics, instrumented_endpoint
+from src.core.profiling.profiler import profiled_endpoint
+
+logger = setup_logger("ArticleDedupEndpoint", Path("crypto_news.log"))
+
+
+class ArticleDedupEndpoint:
+    """Endpoint for linking near-duplicate scraped articles to a canonical article."""
+    
+    def __init__(self):
+        self.deltalake = get_deltalake()
+        self.detector = NearDuplicateDetector()
+        
+    def _get_pending_articles(self, news_ids: Optional[List[str]] = None) -> List[str]:
+        """Get scraped articles that have not been deduplicated yet."""
+        try:
+            filters = [
+                (TableNames.SCRAPED_ARTICLES.value, "=", True),
+                (TableNames.CLEANED_ARTICLES.value, "=", False),
+                (DUPLICATE_FLAG, "=", False),
+            ]
+            if news_ids is not None:
+                filters.append(("news_id", "in", news_ids))
+
+            status_table = self.deltalake.read_table(
+                table_name=TableNames.STATUS_ARTICLES.value,
+                filters=filters,
+                columns=['news_id'],
+            )
+            
+            if status_table.empty:
+                logger.info("No pending articles to deduplicate")
+                return []
+
+            news_id_list = status_table['news_id'].tolist()
+
+            deduplicated = self.deltalake.read_table(
+                table_name=TableNames.DEDUP_ARTICLES.value,
+                filters=[("news_id", "in", news_id_list)],
+                columns=['news_id'],
+            )
+            
+            return sorted(set(news_id_list) - set(deduplicated['news_id']))
+            
+        except Exception as e:
+            logger.error(f"Error fetching pending articles: {e}")
+            raise
+
+    def _lookup_candidates(self, band_keys: List[str]) -> pd.DataFrame:
+        """Previously indexed canonical articles sharing any of the band keys."""
+        empty = pd.DataFrame(columns=['news_id', 'canonical_news_id', 'signature'])
+        if not band_keys:
+            return empty
+
+        index_rows = self.deltalake.read_table(
+            table_name=TableNames.DEDUP_INDEX.value,
+            filters=[("band_key", "in", band_keys)],
+            columns=['news_id'],
+        )
+        if index_rows.empty:
+            return empty
+
+        return self.deltalake.read_table(
+            table_name=TableNames.DEDUP_ARTICLES.value,
+            filters=[("news_id", "in", index_rows['news_id'].unique().tolist())],
+            columns=['news_id', 'canonical_news_id', 'signature'],
+        )
+            
+    def _deduplicate(self, news_id_list: List[str]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Compute signatures and link the pending articles to their canonical article."""
+        try:
+            news_articles = self.deltalake.read_table(
+                table_name=TableNames.SCRAPED_ARTICLES.value,
+                filters=[("news_id", "in", news_id_list)],
+                columns=['news_id', 'full_text', 'date_utc', 'year_utc', 'month_utc', 'day_utc'],
+            )
+            with metrics.timer("dedup_seconds"):
+                return self.detector.deduplicate(news_articles, self._lookup_candidates)
+            
+        except Exception as e:
+            logger.error(f"Error deduplicating articles: {e}")
+            raise
+            
+    def _persist_results(self, dedup_records: pd.DataFrame, index_rows: pd.DataFrame) -> None:
+        """Persist canonical links, the new LSH index entries and the status of the duplicates."""
+        try:
+            # Index entries land first, a canonical link is only recorded once it can be matched against
+            with DeltaWriteCoordinator(self.deltalake) as writer:
+                writer.buffer(
+                    table_name=TableNames.DEDUP_INDEX.value,
+                    df=index_rows
+                )
+                writer.buffer(
+                    table_name=TableNames.DEDUP_ARTICLES.value,
+                    df=dedup_records
+                )
+                # Duplicates are never cleaned or analyzed, their flag keeps them out of the later pending sets
+                writer.buffer(
+                    table_name=TableNames.STATUS_ARTICLES.value,
+                    df=article_status(
+                        dedup_records.loc[~dedup_records['is_canonical'], 'news_id'], TableNames.SCRAPED_ARTICLES,
+                        duplicate=True,
+                    )
+                )
+            logger.info(f"Successfully persisted {len(dedup_records)} deduplicated articles")
+            
+        except Exception as e:
+            logger.error(f"Error persisting results: {e}")
+            raise
+            
+    @profiled_endpoint("dedup")
+    @instrumented_endpoint("dedup")
+    def execute(self, news_ids: Optional[List[str]] = None) -> Dict:
+        """Execute the article deduplication process, optionally for a batch of news_ids only."""
+        try:
+            news_id_list = self._get_pending_articles(news_ids)
+            
+            if not news_id_list:
+                return {
+                    "status": "success",
+                    "articles_checked": 0,
+                    "message": "No pending articles to deduplicate"
+                }
+
+            logger.info("Deduplicating Data...")
+            dedup_records, index_rows = self._deduplicate(news_id_list)
+            
+            self._persist_results(dedup_records, index_rows)
+
+            duplicates = int((~dedup_records['is_canonical']).sum())
+            return {
+                "status": "success",
+                "articles_checked": len(dedup_records),
+                "duplicates_found": duplicates,
+                "duplication_rate": f"{(duplicates/max(len(dedup_records), 1))*100:.1f}%",
+            }
+            
+        except Exception as e:
+            logger.error(f"Error in article deduplication process: {e}")
+            raise
+
+
+def run_article_dedup(news_ids: Optional[List[str]] = None) -> Dict:
+    """Entry point for the article deduplication endpoint."""
+    return ArticleDedupEndpoint().execute(news_ids)
+
+
+if __name__ == "__main__":
+    run_article_dedup()
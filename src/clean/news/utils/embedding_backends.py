@@ -0,0 +1,178 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Optional
+import numpy as np
+import psutil
+import pyprojroot
+
+from src.core.config import settings
+from src.core.models.model_registry import model_registry, ModelNames
+from src.core.logging.logger import setup_logger
+from src.core.metrics.metrics import metrics
+
+logger = setup_logger("EmbeddingBackends", Path("models.log"))
+
+
+class EmbeddingBackend(ABC):
+    """Sentence embedding backend returning L2-normalized float32 vectors."""
+
+    name: str
+
+    @abstractmethod
+    def encode(self, sentences: List[str]) -> np.ndarray:
+        """Embed sentences into an array of shape (num_sentences, dim)."""
+
+
+class TorchEmbeddingBackend(EmbeddingBackend):
+    """Full precision SentenceTransformer running on PyTorch."""
+
+    name = "torch"
+
+    def encode(self, sentences: List[str]) -> np.ndarray:
+        model = model_registry.get(ModelNames.SENTENCE_EMBEDDER.value)
+        with metrics.timer("embedding_seconds", backend=self.name):
+            embeddings = model.encode(
+                sentences,
+                batch_size=len(sentences),
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+        metrics.increment("sentences_embedded_total", len(sentences), backend=self.name)
+        return embeddings
+
+
+class OnnxEmbeddingBackend(EmbeddingBackend):
+    """Exported transformer running on ONNX Runtime, optionally int8 dynamically quantized."""
+
+    name = "onnx"
+
+    FP32_FILE = "model.onnx"
+    INT8_FILE = "model.int8.onnx"
+    MAX_SEQUENCE_LENGTH = 256
+
+    def __init__(
+        self,
+        model_dir: Optional[Path] = None,
+        quantized: bool = settings.EMBEDDING_PARAMS['onnx_quantized'],
+        intra_op_threads: Optional[int] = settings.EMBEDDING_PARAMS['intra_op_threads'],
+    ):
+        self.model_dir = Path(model_dir or pyprojroot.here() / settings.EMBEDDING_PARAMS['onnx_model_dir'])
+        self.model_path = self.model_dir / (self.INT8_FILE if quantized else self.FP32_FILE)
+        # Intra-op parallelism beyond the physical cores only adds contention on hyperthreads
+        self.intra_op_threads = intra_op_threads or psutil.cpu_count(logical=False) or 1
+
+    def _load(self):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        if not self.model_path.exists():
+            raise FileNotFoundError(
+                f"ONNX model not found at {self.model_path}, export it with export_onnx_model() first"
+            )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.intra_op_num_threads = self.intra_op_threads
+        options.inter_op_num_threads = 1
+
+        session = ort.InferenceSession(str(self.model_path), options, providers=["CPUExecutionProvider"])
+        tokenizer = AutoTokenizer.from_pretrained(self.model_dir)
+        return session, tokenizer
+
+    def encode(self, sentences: List[str]) -> np.ndarray:
+        session, tokenizer = model_registry.get_or_register(
+            f"{ModelNames.SENTENCE_EMBEDDER_ONNX.value}:{self.model_path}", self._load
+        )
+
+        with metrics.timer("embedding_seconds", backend=self.name):
+            inputs = tokenizer(
+                sentences,
+                padding=True,
+                truncation=True,
+                max_length=self.MAX_SEQUENCE_LENGTH,
+                return_tensors="np",
+            )
+            input_names = {node.name for node in session.get_inputs()}
+            feed = {name: value.astype(np.int64) for name, value in inputs.items() if name in input_names}
+
+            (token_embeddings,) = session.run(["last_hidden_state"], feed)
+        metrics.increment("sentences_embedded_total", len(sentences), backend=self.name)
+
+        # Mean pooling over the attention mask, as in the sentence-transformers pooling layer
+        mask = inputs["attention_mask"][..., np.newaxis].astype(np.float32)
+        embeddings = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        return embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+
+
+def get_embedding_backend(name: str = settings.EMBEDDING_PARAMS['backend']) -> EmbeddingBackend:
+    """Build the configured embedding backend."""
+    backends = {
+        TorchEmbeddingBackend.name: TorchEmbeddingBackend,
+        OnnxEmbeddingBackend.name: OnnxEmbeddingBackend,
+    }
+    if name not in backends:
+        raise ValueError(f"Unknown embedding backend '{name}', expected one of {list(backends)}")
+    return backends[name]()
+
+
+# Positional order of the transformer's forward(), the traced inputs are passed in this order
+FORWARD_INPUT_NAMES = ["input_ids", "attention_mask", "token_type_ids"]
+PARITY_SENTENCES = [
+    "Bitcoin rallies.",
+    "A longer example sentence, padded against the short one, to compare the exported graph with PyTorch.",
+]
+PARITY_TOLERANCE = 1e-4
+
+
+def export_onnx_model(model_dir: Optional[Path] = None, opset_version: int = 14) -> Path:
+    """
+    Export the sentence transformer to ONNX and write an int8 dynamically quantized copy next to it.
+
+    The fp32 export is checked against the PyTorch embeddings of a padded batch before it is quantized.
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    model_dir = Path(model_dir or pyprojroot.here() / settings.EMBEDDING_PARAMS['onnx_model_dir'])
+    model_dir.mkdir(parents=True, exist_ok=True)
+
+    sentence_model = SentenceTransformer(settings.EMBEDDING_PARAMS['model_name'], device="cpu")
+    transformer = sentence_model[0].auto_model.eval()
+    tokenizer = sentence_model.tokenizer
+
+    dummy = tokenizer(["An example sentence to trace the graph."], return_tensors="pt")
+    input_names = [name for name in FORWARD_INPUT_NAMES if name in dummy]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    fp32_path = model_dir / OnnxEmbeddingBackend.FP32_FILE
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(dummy[name] for name in input_names),
+            str(fp32_path),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset_version,
+        )
+    tokenizer.save_pretrained(model_dir)
+
+    expected = sentence_model.encode(PARITY_SENTENCES, convert_to_numpy=True, normalize_embeddings=True)
+    exported = OnnxEmbeddingBackend(model_dir, quantized=False).encode(PARITY_SENTENCES)
+    max_difference = float(np.abs(exported - expected).max())
+    if max_difference > PARITY_TOLERANCE:
+        raise RuntimeError(
+            f"ONNX export differs from PyTorch by up to {max_difference:.2e} (tolerance {PARITY_TOLERANCE:.0e})"
+        )
+    logger.info(f"ONNX export matches PyTorch within {max_difference:.2e}")
+
+    int8_path = model_dir / OnnxEmbeddingBackend.INT8_FILE
+    quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+
+    logger.info(f"Exported ONNX model to {fp32_path} and quantized copy to {int8_path}")
+    return model_dir
@@ -0,0 +1,136 @@
+import re
+import zlib
+import hashlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+
+class MinHasher:
+    """Deterministic MinHash signatures over word shingles, stable across processes and runs."""
+
+    NUM_PERM = 128
+    SHINGLE_SIZE = 5
+    SEED = 1
+
+    MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+    MAX_HASH = np.uint64((1 << 32) - 1)
+
+    WORD_PATTERN = re.compile(r'\w+')
+
+    def __init__(self):
+        generator = np.random.RandomState(self.SEED)
+        self.a = generator.randint(1, self.MERSENNE_PRIME, size=self.NUM_PERM, dtype=np.uint64)
+        self.b = generator.randint(0, self.MERSENNE_PRIME, size=self.NUM_PERM, dtype=np.uint64)
+
+    def _shingle_hashes(self, text: str) -> np.ndarray:
+        tokens = self.WORD_PATTERN.findall(text.lower())
+        size = min(self.SHINGLE_SIZE, len(tokens))
+        shingles = {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+        return np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+    def signature(self, text: Optional[str]) -> Optional[np.ndarray]:
+        """MinHash signature of a text, None when the text has no words."""
+        if pd.isna(text):
+            return None
+
+        hashes = self._shingle_hashes(text)
+        if hashes.size == 0:
+            return None
+
+        # Universal hashing of every shingle under every permutation, uint64 overflow wraps deterministically
+        permuted = ((hashes[:, np.newaxis] * self.a + self.b) % self.MERSENNE_PRIME) & self.MAX_HASH
+        return permuted.min(axis=0)
+
+
+class NearDuplicateDetector:
+    """
+    Links near-duplicate articles to a canonical article with MinHash LSH.
+
+    Signatures are split into bands, articles sharing any band key become candidates and are
+    confirmed with the estimated Jaccard similarity of their full signatures.
+    """
+
+    BANDS = 16
+    ROWS_PER_BAND = MinHasher.NUM_PERM // BANDS
+    SIMILARITY_THRESHOLD = 0.8
+
+    def __init__(self):
+        self.hasher = MinHasher()
+
+    def band_keys(self, signature: np.ndarray) -> List[str]:
+        return [
+            f"{band}:{hashlib.blake2b(rows.tobytes(), digest_size=8).hexdigest()}"
+            for band, rows in enumerate(signature.reshape(self.BANDS, self.ROWS_PER_BAND))
+        ]
+
+    @staticmethod
+    def similarity(signature: np.ndarray, other: np.ndarray) -> float:
+        return float(np.mean(signature == other))
+
+    def deduplicate(
+        self,
+        articles: pd.DataFrame,
+        lookup_candidates,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Assign a canonical news_id to every article, earlier articles win.
+
+        `lookup_candidates(band_keys)` returns previously indexed canonical articles sharing any of the
+        band keys, as a frame with news_id, canonical_news_id and signature columns.
+        Returns the dedup records and the new LSH index rows.
+        """
+        articles = articles.sort_values('date_utc', kind='stable').reset_index(drop=True)
+
+        signatures = [self.hasher.signature(text) for text in articles['full_text']]
+        keys = [self.band_keys(signature) if signature is not None else [] for signature in signatures]
+
+        existing = lookup_candidates(sorted({key for article_keys in keys for key in article_keys}))
+        known_signatures: Dict[str, np.ndarray] = {
+            row.news_id: np.asarray(row.signature, dtype=np.uint64) for row in existing.itertuples()
+        }
+        canonical_of: Dict[str, str] = dict(zip(existing['news_id'], existing['canonical_news_id']))
+
+        buckets: Dict[str, List[str]] = defaultdict(list)
+        for row in existing.itertuples():
+            for key in self.band_keys(known_signatures[row.news_id]):
+                buckets[key].append(row.news_id)
+
+        records, index_rows = [], []
+        for article, signature, article_keys in zip(articles.itertuples(), signatures, keys):
+            canonical_news_id, best_similarity = article.news_id, None
+
+            candidates = {candidate for key in article_keys for candidate in buckets.get(key, [])}
+            for candidate in candidates:
+                similarity = self.similarity(signature, known_signatures[candidate])
+                if similarity >= self.SIMILARITY_THRESHOLD and (best_similarity is None or similarity > best_similarity):
+                    canonical_news_id, best_similarity = canonical_of[candidate], similarity
+
+            # Only canonical articles are indexed, duplicates are matched through their canonical
+            if signature is not None and canonical_news_id == article.news_id:
+                known_signatures[article.news_id] = signature
+                canonical_of[article.news_id] = article.news_id
+                for key in article_keys:
+                    buckets[key].append(article.news_id)
+                    index_rows.append({
+                        'band_id': f"{article.news_id}:{key.split(':')[0]}",
+                        'news_id': article.news_id,
+                        'band_key': key,
+                    })
+
+            records.append({
+                'news_id': article.news_id,
+                'canonical_news_id': canonical_news_id,
+                'is_canonical': canonical_news_id == article.news_id,
+                'similarity': best_similarity,
+                'signature': signature.astype(np.int64).tolist() if signature is not None else [],
+            })
+
+        dedup_records = pd.DataFrame(records, columns=['news_id', 'canonical_news_id', 'is_canonical', 'similarity', 'signature'])
+        dedup_records['similarity'] = dedup_records['similarity'].astype(float)
+        dedup_records = dedup_records.merge(
+            articles[['news_id', 'date_utc', 'year_utc', 'month_utc', 'day_utc']], on='news_id', how='left'
+        )
+
+        return dedup_records, pd.DataFrame(index_rows, columns=['band_id', 'news_id', 'band_key'])
@@ -1,10 +1,15 @@
 import emoji
 import re
+import hashlib
+import threading
+import numpy as np
 import pandas as pd
-from nltk.corpus import stopwords
-from functools import lru_cache
+from collections import Counter, OrderedDict
+from typing import Iterable, List, Optional
 import string
 
+from src.core.models.model_registry import model_registry, ModelNames
+
 
 class SpamDetector:
     """Thread-safe utility for calculating spam scores from text."""
@@ -16,42 +21,87 @@ class SpamDetector:
         'new', 'lucky', 'winner'
     })
     EMOJI_SET = frozenset(emoji.EMOJI_DATA.keys())
-    STOP_WORDS = frozenset(stopwords.words('english'))
 
+    # Only single code point emoji can equal a character of the text, one regex pass counts all of them
+    EMOJI_PATTERN = re.compile(
+        '[' + ''.join(re.escape(char) for char in sorted(EMOJI_SET) if len(char) == 1) + ']'
+    )
     WORD_PATTERN = re.compile(r'\b\w+\b')
     EXCLAMATION_PATTERN = re.compile(r'!{2,}')
 
     TRANS_TABLE = str.maketrans('', '', string.punctuation.replace('!', ''))
 
-    def __init__(self):
-        """Initialize the detector with cache size."""
-        self.get_score = lru_cache(maxsize=1024)(self._get_score)
-
-    def _get_score(self, text: str) -> float:
-
-        if pd.isna(text):
-            return None
-
-        # Convert to lowercase once
-        text_lower = text.lower()
-
-        # Word tokenization and stop word removal
-        words = [
-            word for word in self.WORD_PATTERN.findall(text_lower.translate(self.TRANS_TABLE))
-            if word not in self.STOP_WORDS
-        ]
-        total_words = len(words) or 1
-
-        # Count promotional words
-        promo_count = sum(word in self.PROMO_WORDS for word in words)
-        
-        # Count emojis
-        emoji_count = sum(char in self.EMOJI_SET for char in text)
-        
-        scores = {
-            'emoji': min(emoji_count / (total_words * 0.1), 1.0),
-            'promo': min(promo_count / (total_words * 0.25), 1.0),
-            'exclamations': min(len(self.EXCLAMATION_PATTERN.findall(text)) / (total_words * 0.05), 1.0)
-        }
-        
-        return min(sum(scores.values()) / 2, 1)
+    # Scores are cached by content digest and shared by every detector in the process, so republished
+    # articles and re-runs of a stage hit the cache without keeping the texts themselves alive
+    CACHE_SIZE = 100_000
+    _cache: OrderedDict = OrderedDict()
+    _cache_lock = threading.Lock()
+
+    @property
+    def stop_words(self) -> frozenset:
+        return model_registry.get(ModelNames.ENGLISH_STOPWORDS.value)
+
+    @staticmethod
+    def _cache_key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+    def _count_features(self, text: str) -> tuple[int, int, int, int]:
+        """Count non stop words, promotional words, emojis and exclamation runs in a single pass each."""
+
+        word_counts = Counter(self.WORD_PATTERN.findall(text.lower().translate(self.TRANS_TABLE)))
+
+        stop_words = self.stop_words
+        total_words = sum(count for word, count in word_counts.items() if word not in stop_words)
+        promo_count = sum(
+            count for word, count in word_counts.items() if word in self.PROMO_WORDS and word not in stop_words
+        )
+
+        return (
+            total_words,
+            promo_count,
+            len(self.EMOJI_PATTERN.findall(text)),
+            len(self.EXCLAMATION_PATTERN.findall(text)),
+        )
+
+    def get_scores(self, texts: Iterable[str]) -> List[Optional[float]]:
+        """Spam scores for a batch of texts, None for missing texts."""
+
+        texts = list(texts)
+        scores: List[Optional[float]] = [None] * len(texts)
+
+        pending_positions, pending_keys = [], []
+        with self._cache_lock:
+            for position, text in enumerate(texts):
+                if pd.isna(text):
+                    continue
+                key = self._cache_key(text)
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    scores[position] = self._cache[key]
+                else:
+                    pending_positions.append(position)
+                    pending_keys.append(key)
+
+        if not pending_positions:
+            return scores
+
+        counts = np.array([self._count_features(texts[position]) for position in pending_positions], dtype=float)
+        total_words = np.where(counts[:, 0] > 0, counts[:, 0], 1)
+
+        emoji_scores = np.minimum(counts[:, 2] / (total_words * 0.1), 1.0)
+        promo_scores = np.minimum(counts[:, 1] / (total_words * 0.25), 1.0)
+        exclamation_scores = np.minimum(counts[:, 3] / (total_words * 0.05), 1.0)
+        batch_scores = np.minimum((emoji_scores + promo_scores + exclamation_scores) / 2, 1).tolist()
+
+        with self._cache_lock:
+            for position, key, score in zip(pending_positions, pending_keys, batch_scores):
+                scores[position] = score
+                self._cache[key] = score
+            while len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+        return scores
+
+    def get_score(self, text: str) -> Optional[float]:
+        """Spam score of a single text."""
+        return self.get_scores([text])[0]
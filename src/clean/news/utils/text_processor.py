@@ -1,19 +1,24 @@
 from cleantext import clean
-import tiktoken
 from textblob import TextBlob
 import pandas as pd
 
 from src.core.config import constants
+from src.core.models.model_registry import model_registry
 from src.clean.news.utils.spam_detector import SpamDetector
 
 
 class TextProcessor:
 
+    ENCODING_NAME = "cl100k_base"
+
     def __init__(self):
         
-        self.tokenizer = tiktoken.get_encoding("cl100k_base")
         self.spam_scorer = SpamDetector()
 
+    @property
+    def tokenizer(self):
+        return model_registry.tokenizer(self.ENCODING_NAME)
+
     def clean_text(self, text):
 
         if pd.isna(text):
@@ -42,12 +47,13 @@ class TextProcessor:
 
         return word_count, token_count
 
-    def generate_curated_text(self, text, error):
+    def generate_curated_text(self, text, error, spam_score=None):
 
         if pd.isna(text):
             return text, error, None
 
-        spam_score = self.spam_scorer.get_score(text)
+        if spam_score is None:
+            spam_score = self.spam_scorer.get_score(text)
         word_count = len(TextBlob(text).words)
         
         if word_count < constants.MINIMUM_ARTICLE_WORDS:
@@ -57,3 +63,14 @@ class TextProcessor:
             return None, 'high spam score', spam_score
 
         return text, error, spam_score
+
+    def generate_curated_texts(self, texts, errors):
+        """Curate a batch of texts, spam scores are computed for the whole batch at once."""
+
+        texts, errors = list(texts), list(errors)
+        spam_scores = self.spam_scorer.get_scores(texts)
+
+        return [
+            self.generate_curated_text(text, error, spam_score)
+            for text, error, spam_score in zip(texts, errors, spam_scores)
+        ]
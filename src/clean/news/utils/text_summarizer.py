@@ -1,12 +1,13 @@
 import numpy as np
-import tiktoken
-from sentence_transformers import SentenceTransformer, util
 from nltk.tokenize import sent_tokenize
 import math
 import pandas as pd
+from collections import Counter
 from typing import Optional
 
 from src.core.config import constants
+from src.core.models.model_registry import model_registry
+from src.clean.news.utils.embedding_backends import EmbeddingBackend, get_embedding_backend
 
 
 class TextSummarizer:
@@ -21,10 +22,17 @@ class TextSummarizer:
 
     INTRO_SENTENCES = 3
     CONCLUSION_SENTENCES = 2
-    
-    def __init__(self):
-        self.tokenizer = tiktoken.get_encoding("cl100k_base")
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+
+    ENCODING_NAME = "cl100k_base"
+
+    def __init__(self, backend: Optional[EmbeddingBackend] = None):
+        self.backend = backend or get_embedding_backend()
+        # Which tier handled each text, used to tune LEXICAL_SUMMARY_MARGIN
+        self.path_counts = Counter()
+
+    @property
+    def tokenizer(self):
+        return model_registry.tokenizer(self.ENCODING_NAME)
 
     def _get_position_scores(self, sentences) -> tuple[np.ndarray, np.ndarray]:
         """
@@ -52,6 +60,9 @@ class TextSummarizer:
     def text_summarize(self, text:str) -> Optional[str]:
         """
         Summarizes text dynamically to meet max_tokens threshold with position weighting.
+
+        Texts within LEXICAL_SUMMARY_MARGIN of the limit are ranked with TF-IDF centrality,
+        only longer texts go through the embedding model.
         """
 
         if pd.isna(text):
@@ -61,37 +72,28 @@ class TextSummarizer:
         max_tokens = constants.MAXIMUM_ARTICLE_TOKENS
         
         if token_count < max_tokens:
+            self.path_counts['passthrough'] += 1
             return text
             
         # Step 1: Split the text into sentences
         sentences = sent_tokenize(text)
 
         if len(sentences) < self.WINDOW_SIZE:
+            self.path_counts['too_few_sentences'] += 1
             return None
-        
-        # Step 2: Generate embeddings and centrality scores
-        centrality_scores = self._compute_hybrid_scores(sentences)
-
-        # Step 3: Calculate position scores        
-        intro_scores, conclusion_scores = self._get_position_scores(sentences)
 
-        # Step 4: Combine scores with weights
-        final_scores = (
-            self.POSITION_WEIGHTS['centrality'] * centrality_scores +
-            self.POSITION_WEIGHTS['intro'] * intro_scores +
-            self.POSITION_WEIGHTS['conclusion'] * conclusion_scores
-        )
-        
-        # Step 5: Rank sentences by combined score
-        ranked_indices = final_scores.argsort()[::-1]
-
-        # Step 6: Accumulate sentences until breach token threshold
-        tally = 0
-        for num_sentences_to_keep, rank_index in enumerate(ranked_indices):
-            sentence = sentences[rank_index]
-            tally += len(self.tokenizer.encode(sentence))
-            if tally > max_tokens:
-                break
+        # Steps 2-5: Rank sentences by combined centrality and position score
+        if token_count <= max_tokens * (1 + constants.LEXICAL_SUMMARY_MARGIN):
+            self.path_counts['lexical'] += 1
+            ranked_indices = self.rank_sentences(sentences, similarities=self._lexical_similarities(sentences))
+        else:
+            self.path_counts['embedding'] += 1
+            ranked_indices = self.rank_sentences(sentences)
+
+        # Step 6: Keep the top ranked sentences until they breach the token threshold
+        sentence_token_counts = np.array([len(tokens) for tokens in self.tokenizer.encode_batch(sentences)])
+        cumulative_token_counts = np.cumsum(sentence_token_counts[ranked_indices])
+        num_sentences_to_keep = np.searchsorted(cumulative_token_counts, max_tokens, side='right')
             
         top_indices = ranked_indices[:num_sentences_to_keep]
         
@@ -106,18 +108,50 @@ class TextSummarizer:
 
         return summary_text
 
-    def _compute_hybrid_scores(self, sentences):
-        
-        num_sentences = len(sentences)
+    def rank_sentences(self, sentences, similarities: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Sentence indices ordered from most to least important.
+        Sentence similarities default to the cosine similarities of the sentence embeddings.
+        """
+
+        if similarities is None:
+            similarities = self._embedding_similarities(sentences)
+
+        # Calculate centrality scores
+        centrality_scores = self._compute_hybrid_scores(sentences, similarities)
 
-        embeddings = self.model.encode(
-            sentences,
-            batch_size=num_sentences,
-            convert_to_tensor=True,
-            show_progress_bar=False
+        # Calculate position scores
+        intro_scores, conclusion_scores = self._get_position_scores(sentences)
+
+        # Combine scores with weights
+        final_scores = (
+            self.POSITION_WEIGHTS['centrality'] * centrality_scores +
+            self.POSITION_WEIGHTS['intro'] * intro_scores +
+            self.POSITION_WEIGHTS['conclusion'] * conclusion_scores
         )
+
+        return final_scores.argsort()[::-1]
+
+    def _embedding_similarities(self, sentences) -> np.ndarray:
+        # Embeddings are L2-normalized, so their inner products are the cosine similarities
+        embeddings = self.backend.encode(sentences)
+        return embeddings @ embeddings.T
+
+    @staticmethod
+    def _lexical_similarities(sentences) -> np.ndarray:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        # TF-IDF rows are L2-normalized, so their inner products are the cosine similarities
+        try:
+            tfidf = TfidfVectorizer(stop_words='english').fit_transform(sentences)
+        except ValueError:
+            # Every sentence consists of stop words only
+            return np.zeros((len(sentences), len(sentences)))
+        return (tfidf @ tfidf.T).toarray()
+
+    def _compute_hybrid_scores(self, sentences, all_similarities: np.ndarray):
         
-        all_similarities = util.pytorch_cos_sim(embeddings, embeddings).cpu().numpy()
+        num_sentences = len(sentences)
 
         # Calculate length weights for each sentence
         sentence_lengths = np.array([len(sent.split()) for sent in sentences])
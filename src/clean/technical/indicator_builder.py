@@ -0,0 +1,117 @@
+from typing import Dict, List, Optional
+from datetime import timedelta
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from src.core.storage.delta_lake import get_deltalake, TableNames
+from src.collect.technical.price_importer import GetCryptoPrices
+from src.clean.technical.utils import indicators
+from src.core.logging.logger import setup_logger
+from src.core.metrics.metrics import instrumented_endpoint
+
+logger = setup_logger("IndicatorEndpoint", Path("crypto_prices.log"))
+
+
+class IndicatorEndpoint:
+    """Endpoint for keeping the technical indicators of the daily price bars up to date."""
+
+    def __init__(self):
+        self.deltalake = get_deltalake()
+        self.prices = GetCryptoPrices(self.deltalake)
+        self.table_name = TableNames.CRYPTO_INDICATORS.value
+
+    def _get_states(self) -> pd.DataFrame:
+        """Last indicator row per ticker, holding the smoothing state to resume from."""
+        watermarks = self.deltalake.read_table(self.table_name, columns=['ticker', 'timestamp'])
+        if watermarks.empty:
+            return pd.DataFrame(columns=['ticker', 'timestamp', *indicators.STATE_COLUMNS])
+
+        watermarks = watermarks.groupby('ticker', as_index=False)['timestamp'].max()
+        oldest = watermarks['timestamp'].min()
+        tail = self.deltalake.read_table(
+            self.table_name,
+            filters=[('year', '>=', oldest.year), ('timestamp', '>=', oldest.to_pydatetime())],
+            columns=['ticker', 'timestamp', *indicators.STATE_COLUMNS],
+        )
+        return tail.merge(watermarks, on=['ticker', 'timestamp'])
+
+    def _get_bars(self, states: pd.DataFrame) -> pd.DataFrame:
+        """Bars after each ticker's last indicator row, preceded by the warm-up bars of the windowed indicators."""
+        start = None
+        if not states.empty and states['ticker'].nunique() == len(self.prices.TICKERS):
+            # Calendar days, with slack for days missing from the bars
+            start = states['timestamp'].min() - timedelta(days=2 * indicators.WARMUP_BARS)
+
+        return self.prices.fetch_crypto_prices(self.prices.TICKERS, start=start, layout="long")
+
+    @staticmethod
+    def _update_ticker(bars: pd.DataFrame, state: Optional[pd.Series]) -> pd.DataFrame:
+        """Indicator rows of the bars newer than the state, computed from the tail window only."""
+        if state is None:
+            start = 0
+        else:
+            start = int(np.searchsorted(bars['timestamp'].to_numpy(), np.datetime64(state['timestamp']), side='right'))
+            bars = bars.iloc[max(0, start - indicators.WARMUP_BARS):]
+            start = min(start, indicators.WARMUP_BARS)
+
+        if start >= len(bars):
+            return pd.DataFrame()
+
+        values = indicators.compute_indicators(
+            bars['high'].to_numpy(float),
+            bars['low'].to_numpy(float),
+            bars['close'].to_numpy(float),
+            start=start,
+            state=None if state is None else state[indicators.STATE_COLUMNS].astype(float).to_dict(),
+        )
+
+        new_bars = bars.iloc[start:]
+        return pd.DataFrame({
+            'ticker': new_bars['ticker'].to_numpy(),
+            'timestamp': new_bars['timestamp'].to_numpy(),
+            **values,
+            'year': new_bars['timestamp'].dt.year.astype('int32').to_numpy(),
+            'month': new_bars['timestamp'].dt.month.astype('int32').to_numpy(),
+        })
+
+    @instrumented_endpoint("indicators")
+    def execute(self) -> Dict:
+        """Execute the indicator update, only bars newer than the stored indicators are computed."""
+        try:
+            states = self._get_states()
+            bars = self._get_bars(states)
+            if bars.empty:
+                logger.info("No price bars to compute indicators for")
+                return {"bars_processed": 0}
+
+            states = states.set_index('ticker')
+            updates: List[pd.DataFrame] = []
+            for ticker, ticker_bars in bars.groupby('ticker', sort=False):
+                state = states.loc[ticker] if ticker in states.index else None
+                updates.append(self._update_ticker(ticker_bars.reset_index(drop=True), state))
+
+            updates = [update for update in updates if not update.empty]
+            if not updates:
+                logger.info("Indicators are up to date")
+                return {"bars_processed": 0}
+
+            new_rows = pd.concat(updates, ignore_index=True)
+            self.deltalake.write_table(self.table_name, new_rows)
+
+            result = {
+                "bars_processed": len(new_rows),
+                "tickers_updated": new_rows['ticker'].nunique(),
+            }
+            logger.info(f"Indicator update completed: {result}")
+            return result
+
+        except Exception as e:
+            logger.error(f"Error in indicator update: {e}")
+            raise
+
+
+def run_indicator_update() -> Dict:
+    """Entry point for the indicator update"""
+    endpoint = IndicatorEndpoint()
+    return endpoint.execute()
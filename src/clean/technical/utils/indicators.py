@@ -0,0 +1,110 @@
+from typing import Dict, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+BOLLINGER_PERIOD, BOLLINGER_WIDTH = 20, 2.0
+VOLATILITY_PERIOD = 30
+
+# Bars preceding the first new bar that the windowed indicators need
+WARMUP_BARS = max(BOLLINGER_PERIOD, VOLATILITY_PERIOD + 1)
+
+# Columns carrying the recursive smoothing state from one update to the next
+STATE_COLUMNS = ['ema_fast', 'ema_slow', 'macd_signal', 'avg_gain', 'avg_loss', 'atr_14']
+INDICATOR_COLUMNS = [
+    'rsi_14', 'macd', 'macd_signal', 'macd_hist', 'atr_14',
+    'bb_mid', 'bb_upper', 'bb_lower', 'volatility_30',
+]
+
+
+def ema(values: np.ndarray, alpha: float, previous: Optional[float] = None) -> np.ndarray:
+    """
+    Exponential moving average y[n] = alpha * x[n] + (1 - alpha) * y[n - 1], run as a linear filter.
+
+    `previous` is the average at the bar before `values`; without it the average starts at the first value.
+    """
+    from scipy.signal import lfilter
+
+    if len(values) == 0:
+        return values.astype(float)
+    if previous is None or np.isnan(previous):
+        previous = values[0]
+
+    smoothed, _ = lfilter([alpha], [1.0, alpha - 1.0], values, zi=[(1.0 - alpha) * previous])
+    return smoothed
+
+
+def rolling_mean_std(values: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """Trailing mean and population standard deviation, NaN until a full window is available."""
+    mean = np.full(len(values), np.nan)
+    std = np.full(len(values), np.nan)
+    if len(values) >= window:
+        windows = sliding_window_view(values, window)
+        mean[window - 1:] = windows.mean(axis=1)
+        std[window - 1:] = windows.std(axis=1)
+    return mean, std
+
+
+def compute_indicators(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    start: int,
+    state: Optional[Dict[str, float]] = None,
+    periods_per_year: int = 365,
+) -> Dict[str, np.ndarray]:
+    """
+    Indicators and smoothing state of the bars from position `start` on.
+
+    The bars before `start` are warm-up bars already covered by `state`, the smoothing state stored
+    with the bar at `start - 1`. Without state every indicator is computed from the first bar.
+    """
+    state = state or {}
+    new_close = close[start:]
+    previous_close = close[start - 1: -1] if start > 0 else np.concatenate([[np.nan], close[:-1]])
+
+    # RSI and ATR use Wilder's smoothing, an EMA with alpha = 1 / period
+    change = new_close - previous_close
+    avg_gain = ema(np.nan_to_num(np.clip(change, 0, None)), 1 / RSI_PERIOD, state.get('avg_gain'))
+    avg_loss = ema(np.nan_to_num(np.clip(-change, 0, None)), 1 / RSI_PERIOD, state.get('avg_loss'))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
+    if not state:
+        # The averages have not seen a full period of changes yet
+        rsi[:RSI_PERIOD] = np.nan
+
+    true_range = np.fmax(
+        high[start:] - low[start:],
+        np.fmax(np.abs(high[start:] - previous_close), np.abs(low[start:] - previous_close)),
+    )
+    atr = ema(true_range, 1 / ATR_PERIOD, state.get('atr_14'))
+
+    ema_fast = ema(new_close, 2 / (MACD_FAST + 1), state.get('ema_fast'))
+    ema_slow = ema(new_close, 2 / (MACD_SLOW + 1), state.get('ema_slow'))
+    macd = ema_fast - ema_slow
+    macd_signal = ema(macd, 2 / (MACD_SIGNAL + 1), state.get('macd_signal'))
+
+    bb_mid, bb_std = rolling_mean_std(close, BOLLINGER_PERIOD)
+
+    log_returns = np.diff(np.log(close), prepend=np.nan)
+    _, return_std = rolling_mean_std(log_returns, VOLATILITY_PERIOD)
+
+    return {
+        'rsi_14': rsi,
+        'macd': macd,
+        'macd_signal': macd_signal,
+        'macd_hist': macd - macd_signal,
+        'atr_14': atr,
+        'bb_mid': bb_mid[start:],
+        'bb_upper': (bb_mid + BOLLINGER_WIDTH * bb_std)[start:],
+        'bb_lower': (bb_mid - BOLLINGER_WIDTH * bb_std)[start:],
+        'volatility_30': return_std[start:] * np.sqrt(periods_per_year),
+        'ema_fast': ema_fast,
+        'ema_slow': ema_slow,
+        'avg_gain': avg_gain,
+        'avg_loss': avg_loss,
+    }
@@ -1,12 +1,17 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Callable
 from pathlib import Path
 from more_itertools import chunked
-from tqdm.notebook import tqdm
+from tqdm.auto import tqdm
 import pandas as pd
 
-from src.core.storage.delta_lake import DeltaLakeManager, TableNames
+from src.core.storage.delta_lake import get_deltalake, TableNames, article_status
+from src.core.storage.change_feed import ChangeFeedConsumer
+from src.core.storage.sharding import ShardSpec
+from src.core.storage.write_coordinator import DeltaWriteCoordinator
 from src.collect.news.utils.article_url_scraper import PowerScraper, ScrapingResult
 from src.core.logging.logger import setup_logger
+from src.core.metrics.metrics import instrumented_endpoint
+from src.core.profiling.profiler import profiled_endpoint
 
 logger = setup_logger("ArticleScrapeEndpoint", Path("crypto_news.log"))
 
@@ -15,21 +20,57 @@ class ArticleScrapeEndpoint:
     """Endpoint for scraping article content from news URLs."""
     
     CHUNK_SIZE = 100
+    FLUSH_ROWS = 500
     
-    def __init__(self):
-        self.deltalake = DeltaLakeManager()
+    def __init__(self, scraper: Optional[PowerScraper] = None, shard: Optional[ShardSpec] = None):
+        # A long-lived scraper keeps its sessions and cookies warm, otherwise one is built per chunk
+        self.deltalake = get_deltalake()
+        self.scraper = scraper
+        self.shard = shard or ShardSpec()
+        self.feed = ChangeFeedConsumer(f"scrape/{self.shard}", TableNames.METADATA_ARTICLES.value, self.deltalake)
     
-    def _get_pending_articles(self) -> tuple[pd.DataFrame, pd.DataFrame]:
+    def _pending_filters(self, news_ids: Optional[List[str]] = None) -> List[tuple]:
+        """Status table filters selecting articles pending scraping, optionally restricted to a batch."""
+        filters = [
+            (TableNames.METADATA_ARTICLES.value, "=", True),
+            (TableNames.SCRAPED_ARTICLES.value, "=", False),
+        ]
+        if news_ids is not None:
+            filters.append(("news_id", "in", news_ids))
+        return filters
+
+    def _get_new_articles(self) -> Optional[pd.DataFrame]:
+        """Metadata of the articles imported since the last full run and not scraped yet, None without a feed checkpoint."""
+        changes = self.feed.read_changes()
+        if changes is None or changes.empty:
+            return changes
+
+        changes = changes[self.shard.mask(changes['news_id'])]
+        scraped = self.deltalake.read_matching(TableNames.SCRAPED_ARTICLES.value, changes, columns=['news_id'])
+        return changes[~changes['news_id'].isin(scraped['news_id'])].reset_index(drop=True)
+
+    def pending_news_ids(self) -> List[str]:
+        """List the news_ids waiting to be scraped, the feed checkpoint only moves on a full `execute()` that follows."""
+        news_metadata = self._get_new_articles()
+        if news_metadata is not None:
+            return [] if news_metadata.empty else news_metadata['news_id'].tolist()
+
+        status_table = self.deltalake.read_table(
+            table_name=TableNames.STATUS_ARTICLES.value,
+            filters=self._pending_filters(),
+            columns=['news_id'],
+        )
+        return status_table.loc[self.shard.mask(status_table['news_id']), 'news_id'].tolist()
+
+    def _get_pending_articles(self, news_ids: Optional[List[str]] = None) -> tuple[pd.DataFrame, pd.DataFrame]:
         """Get articles pending scraping from status table."""
         try:
             # Get articles marked for scraping
             status_table = self.deltalake.read_table(
                 table_name=TableNames.STATUS_ARTICLES.value,
-                filters=[
-                    (TableNames.METADATA_ARTICLES.value, "=", True),
-                    (TableNames.SCRAPED_ARTICLES.value, "=", False),
-                ]
+                filters=self._pending_filters(news_ids)
             )
+            status_table = status_table[self.shard.mask(status_table['news_id'])]
             
             if status_table.empty:
                 logger.info("No pending articles to scrape")
@@ -49,8 +90,12 @@ class ArticleScrapeEndpoint:
             logger.error(f"Error fetching pending articles: {e}")
             raise
     
-    def _scrape_urls(self, urls: List[str]) -> List[ScrapingResult]:
-        """Scrape content from URLs in chunks with progress tracking."""
+    def _scrape_urls(
+        self,
+        urls: List[str],
+        on_chunk: Optional[Callable[[List[ScrapingResult]], None]] = None
+    ) -> List[ScrapingResult]:
+        """Scrape content from URLs in chunks with progress tracking, handing each chunk to `on_chunk`."""
         try:
             url_chunks = list(chunked(urls, self.CHUNK_SIZE))
             all_results = []
@@ -58,18 +103,24 @@ class ArticleScrapeEndpoint:
             
             with tqdm(total=len(urls)) as pbar:
                 for chunk in url_chunks:
-                    with PowerScraper() as scraper:
-                        results = scraper.scrape_urls(chunk)
-                        all_results.extend(results)
-                        
-                        chunk_success = sum(1 for r in results if r.success)
-                        total_success += chunk_success
-                        
-                        pbar.update(len(chunk))
-                        pbar.set_postfix(
-                            chunk=f"{chunk_success}/{len(chunk)}",
-                            total=f"{total_success}/{len(all_results)} ({total_success/len(all_results)*100:.1f}%)"
-                        )
+                    if self.scraper is not None:
+                        results = self.scraper.scrape_urls(chunk)
+                    else:
+                        with PowerScraper() as scraper:
+                            results = scraper.scrape_urls(chunk)
+                    all_results.extend(results)
+
+                    if on_chunk is not None:
+                        on_chunk(results)
+                    
+                    chunk_success = sum(1 for r in results if r.success)
+                    total_success += chunk_success
+                    
+                    pbar.update(len(chunk))
+                    pbar.set_postfix(
+                        chunk=f"{chunk_success}/{len(chunk)}",
+                        total=f"{total_success}/{len(all_results)} ({total_success/len(all_results)*100:.1f}%)"
+                    )
             
             return all_results
             
@@ -81,60 +132,79 @@ class ArticleScrapeEndpoint:
         self, 
         news_metadata: pd.DataFrame, 
         scraping_results: List[ScrapingResult],
-        status_table: pd.DataFrame
+        status_table: pd.DataFrame,
+        writer: DeltaWriteCoordinator,
     ) -> None:
-        """Persist scraped content and update status."""
+        """Queue scraped content and the matching status updates for a batched commit."""
         try:
+            scraped_metadata = news_metadata[
+                news_metadata['news_url'].isin([result.news_url for result in scraping_results])
+            ]
+
             # Merge metadata with scraping results
             news_articles = pd.merge(
-                news_metadata[['news_id', 'news_url', 'date_utc', 'year_utc', 'month_utc', 'day_utc']],
+                scraped_metadata[['news_id', 'news_url', 'date_utc', 'year_utc', 'month_utc', 'day_utc']],
                 pd.DataFrame(scraping_results),
                 how='left'
             )
             
             # Write scraped content
-            self.deltalake.write_table(
+            writer.buffer(
                 table_name=TableNames.SCRAPED_ARTICLES.value,
                 df=news_articles
             )
             
             # Update status table
-            status_table.loc[
-                status_table['news_id'].isin(news_metadata['news_id']), 
-                TableNames.SCRAPED_ARTICLES.value
-            ] = True
-            
-            self.deltalake.write_table(
+            writer.buffer(
                 table_name=TableNames.STATUS_ARTICLES.value,
-                df=status_table
+                df=status_table[status_table['news_id'].isin(scraped_metadata['news_id'])].assign(**{
+                    TableNames.SCRAPED_ARTICLES.value: True
+                })
             )
             
-            logger.info(f"Successfully persisted {len(news_articles)} articles")
+            logger.info(f"Queued {len(news_articles)} scraped articles for persistence")
             
         except Exception as e:
             logger.error(f"Error persisting results: {e}")
             raise
     
-    def execute(self) -> Dict:
-        """Execute the article scraping process."""
+    @profiled_endpoint("scrape")
+    @instrumented_endpoint("scrape")
+    def execute(self, news_ids: Optional[List[str]] = None) -> Dict:
+        """
+        Execute the article scraping process, optionally for a batch of news_ids only.
+
+        Without news_ids the articles imported since the last full run are read from the change feed.
+        """
         
         try:
-            # Get pending articles
-            status_table, news_metadata = self._get_pending_articles()
+            # Get pending articles, from the status table for batches or when the feed has no checkpoint yet
+            news_metadata = self._get_new_articles() if news_ids is None else None
+            if news_metadata is not None:
+                status_table = article_status(
+                    [] if news_metadata.empty else news_metadata['news_id'], TableNames.METADATA_ARTICLES
+                )
+            else:
+                status_table, news_metadata = self._get_pending_articles(news_ids)
             
             if news_metadata.empty:
+                if news_ids is None:
+                    self.feed.commit()
                 return {
                     "status": "success",
                     "articles_scraped": 0,
                     "message": "No pending articles to scrape"
                 }
             
-            # Scrape URLs
+            # Scrape URLs, persisting finished chunks in batched commits as the scrape progresses
             urls = pd.unique(news_metadata['news_url']).tolist()
-            scraping_results = self._scrape_urls(urls)
-            
-            # Persist results
-            self._persist_results(news_metadata, scraping_results, status_table)
+            with DeltaWriteCoordinator(self.deltalake, flush_rows=self.FLUSH_ROWS) as writer:
+                scraping_results = self._scrape_urls(
+                    urls,
+                    on_chunk=lambda results: self._persist_results(news_metadata, results, status_table, writer)
+                )
+            if news_ids is None:
+                self.feed.commit()
             
             successful_scrapes = sum(1 for r in scraping_results if r.success)
             return {
@@ -149,9 +219,9 @@ class ArticleScrapeEndpoint:
             raise
 
 
-def run_article_scraping() -> Dict:
+def run_article_scraping(news_ids: Optional[List[str]] = None, shard: Optional[ShardSpec] = None) -> Dict:
     """Entry point for the article scraping endpoint."""
-    return ArticleScrapeEndpoint().execute()
+    return ArticleScrapeEndpoint(shard=shard).execute(news_ids)
 
 
 if __name__ == "__main__":
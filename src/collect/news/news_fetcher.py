@@ -3,24 +3,34 @@ from datetime import timedelta
 import pandas as pd
 from pathlib import Path
 
-from src.core.storage.delta_lake import DeltaLakeManager, TableNames
+from src.core.storage.delta_lake import get_deltalake, TableNames, DUPLICATE_FLAG
 from src.collect.news.utils.news_api_caller import CryptoNewsFetcher
 from src.core.logging.logger import setup_logger
+from src.core.metrics.metrics import instrumented_endpoint
+from src.core.profiling.profiler import profiled_endpoint
 
 logger = setup_logger("ImportNewsEndpoint", Path("crypto_news.log"))
 
 
 class NewsImportEndpoint:
     """Endpoint for importing crypto news data."""
+
+    INITIAL_LOOKBACK_DAYS = 30
     
     def __init__(self):
         self.fetcher = CryptoNewsFetcher()
-        self.deltalake = DeltaLakeManager()
+        self.deltalake = get_deltalake()
+
+        self.last_fetch_date = self._get_last_fetch_date()
+        self._refresh_date_range()
 
-        last_fetch_date = self._get_last_fetch_date()
-        if last_fetch_date:
-            self.start_date = (last_fetch_date - timedelta(days=1))
-            self.end_date = pd.Timestamp.now(tz = 'US/Eastern')
+    def _refresh_date_range(self) -> None:
+        """Fetch window from a day before the newest stored article up to now."""
+        self.end_date = pd.Timestamp.now(tz = 'US/Eastern')
+        if self.last_fetch_date:
+            self.start_date = (self.last_fetch_date - timedelta(days=1))
+        else:
+            self.start_date = self.end_date - timedelta(days=self.INITIAL_LOOKBACK_DAYS)
         
     def _get_last_fetch_date(self) -> Optional[pd.Timestamp]:
         """Get the most recent date from existing data."""
@@ -40,9 +50,8 @@ class NewsImportEndpoint:
     def _update_status_table(self, news_metadata: pd.DataFrame) -> None:
         """Update the status tracking table with new articles."""
         try:
-            status_table = self.deltalake.read_table(
-                table_name=TableNames.STATUS_ARTICLES.value, 
-                columns=['news_id']
+            status_table = self.deltalake.read_matching(
+                TableNames.STATUS_ARTICLES.value, news_metadata, columns=['news_id']
             )
             
             # Create status entries for new articles
@@ -54,6 +63,7 @@ class NewsImportEndpoint:
                 TableNames.SCRAPED_ARTICLES.value: False,
                 TableNames.CLEANED_ARTICLES.value: False,
                 TableNames.LLM_ARTICLES.value: False,
+                DUPLICATE_FLAG: False,
             }).reset_index(drop=True)
             
             if not new_status.empty:
@@ -73,10 +83,12 @@ class NewsImportEndpoint:
         # Fetch new data
         news_metadata = self.fetcher.fetch_news(self.start_date, self.end_date)
         
-        # Filter out existing articles
-        existing_articles = self.deltalake.read_table(
-            table_name=TableNames.METADATA_ARTICLES.value,
-            columns=['news_id']
+        if news_metadata.empty:
+            return news_metadata
+
+        # Filter out existing articles, looked up in the partitions of the fetched ones only
+        existing_articles = self.deltalake.read_matching(
+            TableNames.METADATA_ARTICLES.value, news_metadata, columns=['news_id']
         )
         news_metadata = news_metadata[
             ~news_metadata['news_id'].isin(existing_articles['news_id'])
@@ -84,10 +96,13 @@ class NewsImportEndpoint:
 
         return news_metadata
 
+    @profiled_endpoint("import")
+    @instrumented_endpoint("import")
     def execute(self) -> dict:
-        """Execute the news import process."""
+        """Execute the news import process, endpoints kept alive across runs fetch from their last import onwards."""
         try:
 
+            self._refresh_date_range()
             news_metadata = self._get_data()
             
             if news_metadata.empty:
@@ -106,6 +121,10 @@ class NewsImportEndpoint:
             
             # Update status table
             self._update_status_table(news_metadata)
+
+            newest_date = pd.Timestamp(news_metadata['date_utc'].max()).tz_localize('UTC').tz_convert('US/Eastern')
+            if self.last_fetch_date is None or newest_date > self.last_fetch_date:
+                self.last_fetch_date = newest_date
             
             return {
                 "status": "success",
@@ -1,4 +1,5 @@
 from concurrent.futures import ThreadPoolExecutor, as_completed
+import contextvars
 from typing import List, Optional, Dict
 import cloudscraper
 import psutil
@@ -8,13 +9,19 @@ from fake_useragent import UserAgent
 from requests.adapters import HTTPAdapter
 import requests
 import trafilatura
-import winreg
+try:
+    import winreg
+except ImportError:
+    # Only available on Windows, the default Chrome version is used elsewhere
+    winreg = None
 from pathlib import Path
+from urllib.parse import urlparse
 import random
 import time
 from http import HTTPStatus
 
 from src.core.logging.logger import setup_logger
+from src.core.metrics.metrics import metrics
 
 logger = setup_logger("ScapeNewsURLs", Path("crypto_news.log"))
 
@@ -49,6 +56,8 @@ class PowerScraper:
 
     def _get_chrome_version(self) -> int:
         """Get Chrome version or fallback to default"""
+        if winreg is None:
+            return self.DEFAULT_CHROME_VERSION
         try:
             key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon")
             version = winreg.QueryValueEx(key, "version")[0].split(".")[0]
@@ -113,9 +122,11 @@ class PowerScraper:
         start_time = time.perf_counter()
         scraper = self.scraper_pool.get()
         result = ScrapingResult(news_url=news_url)
+        domain = urlparse(news_url).netloc
         
         try:
-            response = scraper.get(news_url, headers=self.headers, timeout=self.DEFAULT_TIMEOUT)
+            with metrics.timer("http_fetch_seconds", domain=domain):
+                response = scraper.get(news_url, headers=self.headers, timeout=self.DEFAULT_TIMEOUT)
 
             response.raise_for_status()
 
@@ -125,14 +136,15 @@ class PowerScraper:
             result.status_code = response.status_code
             
             if response.text:
-                result.full_text = trafilatura.extract(
-                    response.text,
-                    include_comments=False,
-                    include_tables=False,
-                    include_links=False,
-                    no_fallback=False,
-                    
-                )
+                with metrics.timer("trafilatura_extract_seconds"):
+                    result.full_text = trafilatura.extract(
+                        response.text,
+                        include_comments=False,
+                        include_tables=False,
+                        include_links=False,
+                        no_fallback=False,
+                        
+                    )
                 result.success = bool(result.full_text)
             else:
                 result.error = "empty response"
@@ -148,6 +160,7 @@ class PowerScraper:
             result.status_code = 500            
         finally:
             result.elapsed_time = time.perf_counter() - start_time
+            metrics.increment("http_fetches_total", domain=domain, status_code=result.status_code)
             self.scraper_pool.put(scraper)
             
         return result
@@ -158,7 +171,10 @@ class PowerScraper:
         results = [ScrapingResult(news_url=url) for url in urls]
         
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {executor.submit(self.scrape_url, url): i for i, url in enumerate(urls)}
+            # Each fetch runs in a copy of the caller's context, so its metrics count towards the calling endpoint
+            futures = {
+                executor.submit(contextvars.copy_context().run, self.scrape_url, url): i for i, url in enumerate(urls)
+            }
             for future in as_completed(futures):
                 try:
                     results[futures[future]] = future.result(timeout=self.DEFAULT_TIMEOUT)
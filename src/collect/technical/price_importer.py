@@ -1,18 +1,22 @@
 # +
-import os
 from datetime import timedelta
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
 
 import pandas as pd
+import pyprojroot
 import yfinance as yf
-from logger_config import setup_logger
-from tqdm.autonotebook import tqdm
+
+from src.core.storage.delta_lake import DeltaLakeManager, TableNames, get_deltalake
+from src.collect.technical.utils.bar_resampler import interval_to_timedelta, resample_bars
+from src.core.logging.logger import setup_logger
 
 
 # -
 
 
 class GetCryptoPrices:
+    """Incremental crypto price ingestion into the long-format price table."""
 
     TICKERS = [
         "ETH-USD",
@@ -29,83 +33,337 @@ class GetCryptoPrices:
     ]
 
     TIME_WINDOW_DAYS = 365 * 2
+    PRICE_FIELDS = ["open", "high", "low", "close", "volume"]
 
-    def __init__(self):
+    # Finest intraday grain stored, coarser bars are resampled from it at query time
+    INTRADAY_INTERVAL = "1h"
+    # How far back yfinance serves each intraday interval
+    INTRADAY_LOOKBACK_DAYS = {"1m": 7, "5m": 59, "15m": 59, "30m": 59, "1h": 729}
+    # Holes older than this are not fetched again, a refetch downloads everything from the hole on
+    MAX_GAP_REFETCH_DAYS = 30
 
-        self.data_dir = Path("../data/crypto_prices")
-        self.data_dir.mkdir(parents=True, exist_ok=True)
+    def __init__(self, deltalake: Optional[DeltaLakeManager] = None):
 
-        log_file = Path("../logs/crypto_prices.log")
-        self.logger = setup_logger("GetCryptoPrices", log_file)
+        self.deltalake = deltalake or get_deltalake()
+        self.table_name = TableNames.CRYPTO_PRICES.value
+        self.intraday_table_name = TableNames.CRYPTO_PRICES_INTRADAY.value
+        # Per ticker parquet parts written before prices moved to Delta, imported once
+        self.legacy_dir = pyprojroot.here() / Path("data/crypto_prices")
 
-    def store_crypto_prices(self):
+        self.logger = setup_logger("GetCryptoPrices", Path("crypto_prices.log"))
 
-        end_date = pd.Timestamp.now()
+    @classmethod
+    def _to_long(cls, ticker: str, bars: pd.DataFrame) -> pd.DataFrame:
+        """Normalize bars of one ticker into the long price table layout."""
+        bars = bars.copy()
+        # Drop the ticker suffix of the former wide column names (close_BTC-USD)
+        bars.columns = ["_".join(str(c).lower().split()).removesuffix(f"_{ticker.lower()}") for c in bars.columns]
 
-        for ticker in tqdm(self.TICKERS, desc="Processing tickers"):
+        timestamps = pd.to_datetime(bars.index)
+        if timestamps.tz is not None:
+            timestamps = timestamps.tz_convert("UTC").tz_localize(None)
 
-            self.logger.info(f"Processing data for {ticker}...")
-            file_path = self.data_dir / f"{ticker}.parquet"
+        prices = pd.DataFrame({
+            'ticker': ticker,
+            'timestamp': timestamps.astype("datetime64[us]"),
+            **{name: bars[name].astype("float64").to_numpy() for name in cls.PRICE_FIELDS},
+        })
+        prices = prices.dropna(subset=["close"])
+        prices['year'] = prices['timestamp'].dt.year.astype("int32")
+        prices['month'] = prices['timestamp'].dt.month.astype("int32")
+        return prices.reset_index(drop=True)
 
-            # Load existing data or initialize start date
-            if os.path.exists(file_path):
-                existing_data = pd.read_parquet(file_path)
-                max_date = pd.to_datetime(existing_data.index.max())
+    def _import_legacy_store(self) -> None:
+        """Load the former per ticker parquet files into the price table when it does not exist yet."""
+        if self.deltalake.table_exists(self.table_name) or not self.legacy_dir.exists():
+            return
 
-                if max_date >= end_date.floor("D"):
-                    self.logger.info(f"Data for {ticker} is already up-to-date.")
-                    continue
+        frames = []
+        for ticker in self.TICKERS:
+            paths = sorted((self.legacy_dir / ticker).glob("*.parquet")) + sorted(self.legacy_dir.glob(f"{ticker}.parquet"))
+            if paths:
+                frames.append(self._to_long(ticker, pd.concat(pd.read_parquet(path) for path in paths)))
 
-                start_date = max_date + timedelta(days=1)
-                self.logger.info(
-                    f"Fetching new data for {ticker} from {start_date} to {end_date}..."
-                )
-            else:
-                # Explicitly handle the case where no file exists
-                self.logger.info(f"No existing data for {ticker}. Initializing fresh download.")
-                existing_data = None
+        if frames:
+            prices = pd.concat(frames, ignore_index=True).drop_duplicates(['ticker', 'timestamp'], keep='last')
+            self.deltalake.write_table(self.table_name, prices)
+            self.logger.info(f"Imported {len(prices)} bars from {self.legacy_dir} into {self.table_name}")
+
+    def _get_watermarks(self, table_name: Optional[str] = None) -> Dict[str, pd.Timestamp]:
+        """Timestamp of the last stored bar per ticker."""
+        stored = self.deltalake.read_table(table_name or self.table_name, columns=['ticker', 'timestamp'])
+        if stored.empty:
+            return {}
+        return stored.groupby('ticker')['timestamp'].max().to_dict()
+
+    def _download(
+        self, tickers: List[str], start_date: pd.Timestamp, end_date: Optional[pd.Timestamp], interval: str = "1d"
+    ) -> Dict[str, pd.DataFrame]:
+        """Download bars of several tickers in one batched request."""
+        data = yf.download(
+            tickers,
+            start=start_date,
+            end=end_date,
+            interval=interval,
+            group_by="ticker",
+            threads=True,
+            progress=False,
+        )
+
+        bars = {}
+        for ticker in tickers:
+            if data.empty or ticker not in data.columns.get_level_values(0):
+                continue
+            ticker_data = data[ticker].dropna(how="all")
+            if not ticker_data.empty:
+                bars[ticker] = self._to_long(ticker, ticker_data)
+
+        return bars
+
+    def store_crypto_prices(self) -> Dict[str, int]:
+        """
+        Append the daily bars published since each ticker's watermark.
+
+        Only completed days are stored, so stored bars never need to be amended.
+        Tickers sharing a watermark are downloaded together in one request.
+        """
+        self._import_legacy_store()
+
+        # yfinance treats the end date as exclusive, today's bar is still forming. Bars are stored
+        # in UTC, so the day boundary is the UTC one whatever the host's timezone
+        end_date = pd.Timestamp.now(tz="UTC").tz_localize(None).floor("D")
+        watermarks = self._get_watermarks()
+
+        tickers_by_start: Dict[pd.Timestamp, List[str]] = {}
+        for ticker in self.TICKERS:
+            watermark = watermarks.get(ticker)
+            if watermark is not None and watermark >= end_date - timedelta(days=1):
+                self.logger.info(f"Data for {ticker} is already up-to-date.")
+                continue
 
-            # Fetch data and update
+            start_date = watermark + timedelta(days=1) if watermark is not None else end_date - timedelta(days=self.TIME_WINDOW_DAYS)
+            tickers_by_start.setdefault(start_date, []).append(ticker)
+
+        new_bars = []
+        for start_date, tickers in tickers_by_start.items():
+            self.logger.info(f"Fetching {len(tickers)} tickers from {start_date.date()} to {end_date.date()}...")
             try:
-                start_date = end_date - timedelta(days=self.TIME_WINDOW_DAYS)
-
-                new_data = yf.download(
-                    ticker,
-                    start=start_date,
-                    end=end_date,
-                    interval="1d",
-                    multi_level_index=False,
-                    progress=False,
-                )
-                new_data.columns = ["_".join(c.lower().split() + [ticker]) for c in new_data]
+                bars = self._download(tickers, start_date, end_date)
+            except Exception as e:
+                self.logger.error(f"Error fetching data for {tickers}: {e}")
+                continue
 
-                if new_data.empty:
+            for ticker in tickers:
+                ticker_bars = bars.get(ticker)
+                if ticker_bars is not None:
+                    ticker_bars = ticker_bars[(ticker_bars['timestamp'] >= start_date) & (ticker_bars['timestamp'] < end_date)]
+                if ticker_bars is None or ticker_bars.empty:
                     self.logger.info(f"No new data fetched for {ticker}. Skipping update.")
                     continue
+                new_bars.append(ticker_bars)
+
+        if not new_bars:
+            return {}
+
+        # One commit for every ticker, the merge only touches the months that received bars
+        new_bars = pd.concat(new_bars, ignore_index=True)
+        self.deltalake.write_table(self.table_name, new_bars)
+
+        rows_added = new_bars['ticker'].value_counts().to_dict()
+        self.logger.info(f"Stored {len(new_bars)} new bars: {rows_added}")
+        return rows_added
+
+    def _get_gap_checks(self, interval: str) -> Dict[str, pd.Timestamp]:
+        """Per ticker, the time up to which missing bars were already requested again."""
+        checks = self.deltalake.read_table(
+            TableNames.INTRADAY_GAP_CHECKS.value,
+            filters=[('interval', '=', interval)],
+            columns=['ticker', 'checked_through'],
+        )
+        return {} if checks.empty else checks.set_index('ticker')['checked_through'].to_dict()
+
+    def _find_gaps(
+        self, since: pd.Timestamp, interval: str, checked_through: Optional[Dict[str, pd.Timestamp]] = None
+    ) -> Dict[str, pd.Timestamp]:
+        """
+        Earliest stored bar per ticker that is followed by missing bars, within the fetchable window.
+        Gaps starting before a ticker's `checked_through` were requested once already and are ignored.
+        """
+        stored = self.deltalake.read_table(
+            self.intraday_table_name,
+            filters=[('year', '>=', since.year), ('timestamp', '>=', since.to_pydatetime())],
+            columns=['ticker', 'timestamp'],
+        )
+        if stored.empty:
+            return {}
+
+        # Crypto trades around the clock, consecutive bars are exactly one interval apart
+        stored = stored.sort_values(['ticker', 'timestamp'])
+        time_to_next_bar = -stored.groupby('ticker')['timestamp'].diff(-1)
+        gap_starts = stored.loc[time_to_next_bar.gt(interval_to_timedelta(interval))]
+        if checked_through:
+            checked = gap_starts['ticker'].map(checked_through)
+            gap_starts = gap_starts[checked.isna() | (gap_starts['timestamp'] >= checked)]
+        return gap_starts.groupby('ticker')['timestamp'].min().to_dict()
+
+    def store_intraday_prices(self) -> Dict[str, int]:
+        """
+        Append intraday bars at the INTRADAY_INTERVAL grain since each ticker's watermark.
+
+        The table holds that single grain, coarser bars are resampled when read. Missing stretches of the
+        last MAX_GAP_REFETCH_DAYS are fetched again once, a stretch yfinance does not serve on that attempt
+        is left as a gap. The bar still forming is not stored.
+        """
+        interval = self.INTRADAY_INTERVAL
+        bar_length = interval_to_timedelta(interval)
+        now = pd.Timestamp.now(tz="UTC").tz_localize(None)
+        earliest_available = (now - timedelta(days=self.INTRADAY_LOOKBACK_DAYS[interval])).ceil(bar_length)
 
-                if existing_data is not None:
-                    updated_data = pd.concat([existing_data, new_data])
-                    updated_data = updated_data[~updated_data.index.duplicated(keep="last")]
-                else:
-                    updated_data = new_data
+        watermarks = self._get_watermarks(self.intraday_table_name)
+        gap_window_start = max(earliest_available, (now - timedelta(days=self.MAX_GAP_REFETCH_DAYS)).ceil(bar_length))
+        gaps = self._find_gaps(gap_window_start, interval, self._get_gap_checks(interval))
 
-                updated_data.to_parquet(file_path)
-                self.logger.info(f"Data for {ticker} saved to {file_path}.")
+        tickers_by_start: Dict[pd.Timestamp, List[str]] = {}
+        for ticker in self.TICKERS:
+            watermark = watermarks.get(ticker)
+            start_date = earliest_available if watermark is None else watermark + bar_length
+            if ticker in gaps:
+                start_date = min(start_date, gaps[ticker] + bar_length)
+
+            if start_date < earliest_available:
+                self.logger.warning(
+                    f"{ticker} {interval} bars between {start_date} and {earliest_available} are no longer served, "
+                    f"leaving a gap"
+                )
+                start_date = earliest_available
+            if start_date + bar_length > now:
+                self.logger.info(f"{interval} data for {ticker} is already up-to-date.")
+                continue
+
+            tickers_by_start.setdefault(start_date, []).append(ticker)
+
+        new_bars, checked_tickers = [], []
+        for start_date, tickers in tickers_by_start.items():
+            self.logger.info(f"Fetching {interval} bars of {len(tickers)} tickers from {start_date}...")
+            try:
+                bars = self._download(tickers, start_date, None, interval=interval)
             except Exception as e:
-                self.logger.error(f"Error fetching data for {ticker}: {e}")
+                self.logger.error(f"Error fetching {interval} data for {tickers}: {e}")
+                continue
+            checked_tickers.extend(tickers)
+
+            for ticker, ticker_bars in bars.items():
+                completed = (ticker_bars['timestamp'] >= start_date) & (ticker_bars['timestamp'] + bar_length <= now)
+                if completed.any():
+                    new_bars.append(ticker_bars[completed])
+
+        if new_bars:
+            new_bars = pd.concat(new_bars, ignore_index=True)
+            self.deltalake.write_table(self.intraday_table_name, new_bars)
+
+        # Every hole before now has been requested again, the next runs only refetch newer ones
+        if checked_tickers:
+            self.deltalake.write_table(TableNames.INTRADAY_GAP_CHECKS.value, pd.DataFrame({
+                'ticker': checked_tickers,
+                'interval': interval,
+                'checked_through': pd.Timestamp(now).floor(bar_length).to_datetime64().astype('datetime64[us]'),
+            }))
+
+        if len(new_bars) == 0:
+            return {}
+
+        rows_added = new_bars['ticker'].value_counts().to_dict()
+        self.logger.info(f"Stored {len(new_bars)} new {interval} bars: {rows_added}")
+        return rows_added
+
+    def _read_prices(
+        self,
+        table_name: str,
+        tickers: Union[str, Iterable[str]],
+        start: Optional[Union[str, pd.Timestamp]],
+        end: Optional[Union[str, pd.Timestamp]],
+    ) -> pd.DataFrame:
+        """Long-format bars of the tickers between start (inclusive) and end (exclusive), pruned by partition."""
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        # Bare symbols such as "ETH" refer to the USD pair
+        tickers = [ticker if "-" in ticker else f"{ticker}-USD" for ticker in tickers]
 
-    def fetch_crypto_prices(self, ticker):
+        filters = [('ticker', 'in', tickers)]
+        if start is not None:
+            start = pd.Timestamp(start)
+            filters += [('year', '>=', start.year), ('timestamp', '>=', start.to_pydatetime())]
+        if end is not None:
+            end = pd.Timestamp(end)
+            filters += [('year', '<=', end.year), ('timestamp', '<', end.to_pydatetime())]
 
-        file_path = self.data_dir / f"{ticker}-USD.parquet"
-        if not file_path.exists():
-            self.logger.warning(f"No data found for {ticker}. Returning an empty DataFrame.")
+        prices = self.deltalake.read_table(
+            table_name, filters=filters, columns=['ticker', 'timestamp', *self.PRICE_FIELDS]
+        )
+        if prices.empty:
+            self.logger.warning(f"No data found for {tickers}. Returning an empty DataFrame.")
             return pd.DataFrame()
-        return pd.read_parquet(file_path)
 
+        return prices.sort_values(['ticker', 'timestamp'], ignore_index=True)
+
+    def _to_layout(self, prices: pd.DataFrame, layout: str) -> pd.DataFrame:
+        if prices.empty or layout == "long":
+            return prices
+
+        wide = prices.pivot(index='timestamp', columns='ticker', values=self.PRICE_FIELDS)
+        wide.columns = [f"{field}_{ticker}" for field, ticker in wide.columns]
+        return wide
+
+    @staticmethod
+    def _check_layout(layout: str) -> None:
+        if layout not in ("wide", "long"):
+            raise ValueError(f"Unknown layout '{layout}', expected 'wide' or 'long'")
+
+    def fetch_crypto_prices(
+        self,
+        tickers: Union[str, Iterable[str]],
+        start: Optional[Union[str, pd.Timestamp]] = None,
+        end: Optional[Union[str, pd.Timestamp]] = None,
+        layout: str = "wide",
+    ) -> pd.DataFrame:
+        """
+        Read the daily bars of one or more tickers between start (inclusive) and end (exclusive).
+
+        Only the partitions of the requested tickers and years are scanned. The long layout has one row
+        per ticker and timestamp; the wide layout is indexed by timestamp with `<field>_<ticker>` columns.
+        """
+        self._check_layout(layout)
+        return self._to_layout(self._read_prices(self.table_name, tickers, start, end), layout)
+
+    def fetch_intraday_prices(
+        self,
+        tickers: Union[str, Iterable[str]],
+        start: Optional[Union[str, pd.Timestamp]] = None,
+        end: Optional[Union[str, pd.Timestamp]] = None,
+        interval: str = "1h",
+        layout: str = "wide",
+    ) -> pd.DataFrame:
+        """
+        Read intraday bars resampled from the stored grain to `interval` (1h, 4h, 1d, ...).
+
+        Timestamps are bar open times in UTC, same layouts as fetch_crypto_prices.
+        """
+        self._check_layout(layout)
+        if interval_to_timedelta(interval) < interval_to_timedelta(self.INTRADAY_INTERVAL):
+            raise ValueError(f"Bars are stored at {self.INTRADAY_INTERVAL}, cannot serve {interval}")
+
+        prices = self._read_prices(self.intraday_table_name, tickers, start, end)
+        if interval != self.INTRADAY_INTERVAL:
+            prices = resample_bars(prices, interval)
+        return self._to_layout(prices, layout)
+
+
+if __name__ == "__main__":
 
-cls = GetCryptoPrices()
+    cls = GetCryptoPrices()
 
-cls.store_crypto_prices()
+    cls.store_crypto_prices()
+    cls.store_intraday_prices()
 
-# Fetch the data
-cls.fetch_crypto_prices("ETH")
+    # Fetch the data
+    cls.fetch_crypto_prices(["BTC", "ETH"], start="2024-01-01")
+    cls.fetch_intraday_prices("BTC", start=pd.Timestamp.now() - timedelta(days=7), interval="4h")
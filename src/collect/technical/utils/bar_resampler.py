@@ -0,0 +1,47 @@
+import pandas as pd
+
+
+# Bar intervals as named by yfinance and their pandas frequencies
+INTERVAL_FREQUENCIES = {
+    "1m": "1min",
+    "5m": "5min",
+    "15m": "15min",
+    "30m": "30min",
+    "1h": "1h",
+    "4h": "4h",
+    "1d": "1D",
+}
+
+OHLCV_AGGREGATIONS = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "volume": "sum",
+}
+
+
+def interval_to_timedelta(interval: str) -> pd.Timedelta:
+    if interval not in INTERVAL_FREQUENCIES:
+        raise ValueError(f"Unknown interval '{interval}', expected one of {list(INTERVAL_FREQUENCIES)}")
+    return pd.Timedelta(INTERVAL_FREQUENCIES[interval])
+
+
+def resample_bars(prices: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    Aggregate long-format OHLCV bars (ticker, timestamp, open, high, low, close, volume) into coarser bars.
+
+    Bars are labelled by their open time and aligned to midnight UTC, every ticker is resampled in one
+    grouped aggregation. Periods without any source bar are left out rather than forward filled.
+    """
+    interval_to_timedelta(interval)
+    if prices.empty:
+        return prices
+
+    return (
+        prices
+        .groupby(['ticker', pd.Grouper(key='timestamp', freq=INTERVAL_FREQUENCIES[interval], label='left', closed='left')])
+        .agg(OHLCV_AGGREGATIONS)
+        .dropna(subset=['close'])
+        .reset_index()
+    )
@@ -1,2 +1,3 @@
 MINIMUM_ARTICLE_WORDS = 100
-MAXIMUM_ARTICLE_TOKENS = 1000
\ No newline at end of file
+MAXIMUM_ARTICLE_TOKENS = 1000
+LEXICAL_SUMMARY_MARGIN = 0.25
@@ -16,4 +16,26 @@ LLM_PARAMS = {
     'temperature':0.4,
     'max_tokens':3000,
     'timeout_seconds':30,
+    'encoding_name':"o200k_base",
+    'max_attempts':3,
+}
+
+EMBEDDING_PARAMS = {
+    'backend':"torch",
+    'model_name':"all-MiniLM-L6-v2",
+    'onnx_model_dir':"models/all-MiniLM-L6-v2-onnx",
+    'onnx_quantized':True,
+    'intra_op_threads':None,
+}
+
+LOGGING_PARAMS = {
+    'json':True,
+    'queue_size':10_000,
+    'sampling_window_seconds':60,
+    # Per logger sampling of high volume messages: the first `burst` records per level and window are
+    # written, then one in every 1 / `rate`
+    'sampling':{
+        'ScapeNewsURLs':{'burst':100, 'rate':0.05},
+        'ArticleScrapeEndpoint':{'burst':200, 'rate':0.1},
+    },
 }
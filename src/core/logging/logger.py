@@ -1,14 +1,181 @@
+import atexit
+import copy
+import json
 import logging
+import os
+import queue
 import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from typing import Dict, Optional
 import pyprojroot
 
-from tqdm.contrib.logging import logging_redirect_tqdm
+from tqdm import tqdm
 
+from src.core.config import settings
+from src.core.metrics.metrics import metrics
 
-def setup_logger(name:str, log_file:Path, level:logging=logging.INFO):
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno,
+            "thread": record.threadName,
+            "process": record.process,
+        }
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TqdmHandler(logging.StreamHandler):
+    """Writes through tqdm so log lines do not break progress bars."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            tqdm.write(self.format(record), file=sys.stdout)
+        except Exception:
+            self.handleError(record)
+
+
+class SamplingFilter(logging.Filter):
     """
-    Set up a logger with the specified name and integrate it with tqdm automatically.
+    Let the first `burst` records per level through in every window, then keep one in every 1 / `rate`.
+
+    The number of records dropped since the previous one kept is attached to it as `suppressed`.
+    Critical records are never sampled.
+    """
+
+    def __init__(self, burst: int, rate: float, window_seconds: float):
+        super().__init__()
+        self.burst = burst
+        self.keep_every = max(1, round(1 / rate)) if rate > 0 else None
+        self.window_seconds = window_seconds
+        self._windows: Dict[int, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.CRITICAL:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            # window start, records seen and records suppressed since the last one kept
+            window = self._windows.setdefault(record.levelno, [now, 0, 0])
+            if now - window[0] >= self.window_seconds:
+                window[0], window[1] = now, 0
+
+            window[1] += 1
+            overflow = window[1] - self.burst
+            keep = overflow <= 0 or (self.keep_every is not None and overflow % self.keep_every == 0)
+
+            if not keep:
+                window[2] += 1
+                return False
+
+            record.suppressed, window[2] = window[2], 0
+            return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Enqueues records without blocking, records are dropped and counted when the queue is full."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render the message and traceback in the calling thread, the arguments and the exception
+        # may not be picklable or may change before the listener formats them
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            metrics.increment("log_records_dropped_total", logger=record.name)
+
+
+# One queue and one listener thread per log file, every logger writing to a file shares its writer
+_file_handlers: Dict[Path, NonBlockingQueueHandler] = {}
+_listeners: Dict[Path, QueueListener] = {}
+_handlers_lock = threading.Lock()
+
+
+def _queue_handler(log_file_path: Path) -> NonBlockingQueueHandler:
+    with _handlers_lock:
+        if log_file_path not in _file_handlers:
+            log_file_path.parent.mkdir(parents=True, exist_ok=True)
+
+            file_handler = logging.FileHandler(log_file_path, encoding="utf-8")
+            file_handler.setFormatter(
+                JsonFormatter() if settings.LOGGING_PARAMS['json']
+                else logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+            )
+            console_handler = TqdmHandler()
+            console_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+
+            log_queue = queue.Queue(maxsize=settings.LOGGING_PARAMS['queue_size'])
+            listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+            listener.start()
+
+            _listeners[log_file_path] = listener
+            _file_handlers[log_file_path] = NonBlockingQueueHandler(log_queue)
+
+        return _file_handlers[log_file_path]
+
+
+def _restart_listeners_in_child() -> None:
+    """
+    A forked child inherits the queue handlers of its loggers but not the listener threads draining
+    them, every log file gets a new queue and listener thread in the child.
+    """
+    global _handlers_lock
+    # The lock may have been held by another thread of the parent at the time of the fork
+    _handlers_lock = threading.Lock()
+    for log_file_path, handler in _file_handlers.items():
+        handler.queue = queue.Queue(maxsize=settings.LOGGING_PARAMS['queue_size'])
+        listener = QueueListener(handler.queue, *_listeners[log_file_path].handlers, respect_handler_level=True)
+        listener.start()
+        _listeners[log_file_path] = listener
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listeners_in_child)
+
+
+@atexit.register
+def shutdown_logging() -> None:
+    """Flush every queued record and stop the writer threads."""
+    with _handlers_lock:
+        for listener in _listeners.values():
+            listener.stop()
+        _listeners.clear()
+        _file_handlers.clear()
+
+
+def setup_logger(name:str, log_file:Path, level:logging=logging.INFO, sampling: Optional[Dict] = None):
+    """
+    Set up a logger with the specified name that hands its records to the single writer of its log file.
+
+    `sampling` ({'burst': ..., 'rate': ...}) overrides the sampling configured for the logger in LOGGING_PARAMS.
     """
     # Create a custom logger
     logger = logging.getLogger(name)
@@ -16,24 +183,16 @@ def setup_logger(name:str, log_file:Path, level:logging=logging.INFO):
     if not logger.handlers:
         logger.setLevel(level)
 
-        # Formatter for log messages
-        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-
-        # File handler to write logs to a file
         log_file_path = pyprojroot.here() / Path("logs") / log_file
-        log_file_path.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(log_file_path)
-        file_handler.setLevel(level)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-
-        # Tqdm handler
-        tqdm_handler = logging.StreamHandler(stream=sys.stdout)
-        tqdm_handler.setFormatter(formatter)
-        logger.addHandler(tqdm_handler)
-
-        # Apply logging redirection automatically
-        logging_redirect_tqdm(logger)
+        logger.addHandler(_queue_handler(log_file_path))
+
+        sampling = sampling or settings.LOGGING_PARAMS['sampling'].get(name)
+        if sampling:
+            logger.addFilter(SamplingFilter(
+                burst=sampling['burst'],
+                rate=sampling['rate'],
+                window_seconds=settings.LOGGING_PARAMS['sampling_window_seconds'],
+            ))
 
     # Prevent logs from propagating to the root logger
     logger.propagate = False
@@ -0,0 +1,177 @@
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pyprojroot
+
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict[str, Any]) -> MetricKey:
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+def _format_key(key: MetricKey) -> str:
+    name, labels = key
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{label}="{value}"' for label, value in labels) + "}"
+
+
+# Registries of the endpoint calls running in the current context, metrics recorded are added to them too
+_scopes: ContextVar[Tuple["MetricsRegistry", ...]] = ContextVar("metric_scopes", default=())
+
+
+class MetricsRegistry:
+    """Thread-safe, process-wide timers and counters, exportable as Prometheus text."""
+
+    def __init__(self):
+        self._counters: Dict[MetricKey, float] = {}
+        # count, total seconds and max seconds per timer
+        self._timers: Dict[MetricKey, list] = {}
+        self._lock = threading.Lock()
+
+    def _add_counter(self, key: MetricKey, value: float) -> None:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def _add_timing(self, key: MetricKey, seconds: float) -> None:
+        with self._lock:
+            count, total, maximum = self._timers.get(key, (0, 0.0, 0.0))
+            self._timers[key] = [count + 1, total + seconds, max(maximum, seconds)]
+
+    def _registries(self) -> Tuple["MetricsRegistry", ...]:
+        return (self, *(scope for scope in _scopes.get() if scope is not self))
+
+    def increment(self, name: str, value: float = 1, **labels) -> None:
+        key = _key(name, labels)
+        for registry in self._registries():
+            registry._add_counter(key, value)
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        key = _key(name, labels)
+        for registry in self._registries():
+            registry._add_timing(key, seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Time the enclosed block, failures are timed as well."""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start_time, **labels)
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "timers": {key: list(value) for key, value in self._timers.items()},
+            }
+
+    def summary(self, since: Optional[Dict[str, dict]] = None) -> Dict[str, Any]:
+        """Readable counters and timers, relative to an earlier snapshot when given."""
+        current = self.snapshot()
+        since = since or {"counters": {}, "timers": {}}
+
+        counters = {}
+        for key, value in current["counters"].items():
+            delta = value - since["counters"].get(key, 0)
+            if delta:
+                counters[_format_key(key)] = round(delta, 3)
+
+        timers = {}
+        for key, (count, total, _) in current["timers"].items():
+            previous_count, previous_total, _ = since["timers"].get(key, (0, 0.0, 0.0))
+            if count > previous_count:
+                timers[_format_key(key)] = {
+                    "count": count - previous_count,
+                    "total_seconds": round(total - previous_total, 3),
+                    "mean_seconds": round((total - previous_total) / (count - previous_count), 4),
+                }
+
+        return {"counters": counters, "timers": timers}
+
+    def to_prometheus(self, **extra_labels) -> str:
+        """Render every metric in the Prometheus text exposition format, `extra_labels` are added to every series."""
+        current = self.snapshot()
+        lines = []
+
+        def with_extra_labels(key: MetricKey) -> MetricKey:
+            return _key(key[0], {**dict(key[1]), **extra_labels})
+
+        for name in sorted({key[0] for key in current["counters"]}):
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(
+                f"{_format_key(with_extra_labels(key))} {value}"
+                for key, value in current["counters"].items() if key[0] == name
+            )
+
+        for name in sorted({key[0] for key in current["timers"]}):
+            lines.append(f"# TYPE {name} summary")
+            for key, (count, total, maximum) in current["timers"].items():
+                if key[0] != name:
+                    continue
+                labels = _format_key(("", with_extra_labels(key)[1]))
+                lines.append(f"{name}_count{labels} {count}")
+                lines.append(f"{name}_sum{labels} {total:.6f}")
+                lines.append(f"{name}_max{labels} {maximum:.6f}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Optional[Path] = None) -> Path:
+        """
+        Write the metrics as a textfile for the Prometheus node exporter, replacing the previous one.
+
+        Every process keeps its own registry, so each one writes its own `metrics_<pid>.prom` with a
+        `pid` label on its series. Files of exited processes are left for the collector until removed.
+        """
+        pid = os.getpid()
+        path = path or pyprojroot.here() / Path("logs") / f"metrics_{pid}.prom"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_name(f"{path.name}.{pid}.tmp")
+        temporary_path.write_text(self.to_prometheus(pid=pid))
+        temporary_path.replace(path)
+        return path
+
+
+metrics = MetricsRegistry()
+
+
+def instrumented_endpoint(stage: str) -> Callable:
+    """
+    Time an endpoint's execute(), attach the metrics recorded during the run to its result dict
+    and refresh the Prometheus textfile.
+
+    The attached metrics are collected in a registry scoped to the call, so endpoints running at the
+    same time in other threads or tasks do not show up in each other's results. Worker threads started
+    by the endpoint have to run in a copy of its context to be counted.
+    """
+    def decorator(execute: Callable) -> Callable:
+        @functools.wraps(execute)
+        def wrapper(*args, **kwargs):
+            scope = MetricsRegistry()
+            token = _scopes.set((*_scopes.get(), scope))
+            try:
+                with metrics.timer("endpoint_execute_seconds", stage=stage):
+                    result = execute(*args, **kwargs)
+                metrics.increment("endpoint_runs_total", stage=stage)
+            finally:
+                _scopes.reset(token)
+
+            if isinstance(result, dict):
+                result["metrics"] = scope.summary()
+            try:
+                metrics.write_prometheus()
+            except OSError as e:
+                # Imported here, the logger module itself depends on the metrics registry
+                from src.core.logging.logger import setup_logger
+                setup_logger("MetricsRegistry", Path("metrics.log")).warning(f"Could not write the Prometheus textfile: {e}")
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,94 @@
+import threading
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+from src.core.config import settings
+from src.core.logging.logger import setup_logger
+
+logger = setup_logger("ModelRegistry", Path("models.log"))
+
+
+class ModelNames(Enum):
+    SENTENCE_EMBEDDER = "sentence_embedder"
+    SENTENCE_EMBEDDER_ONNX = "sentence_embedder_onnx"
+    ENGLISH_STOPWORDS = "english_stopwords"
+
+
+class ModelRegistry:
+    """Process-wide registry of heavyweight models, each loaded on first use and shared afterwards."""
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._load_times: Dict[str, float] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        """Register a loader, the model is only built when first requested."""
+        with self._registry_lock:
+            self._loaders[name] = loader
+            self._locks.setdefault(name, threading.Lock())
+            self._models.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """Return the shared model, loading it on first use."""
+        if name in self._models:
+            return self._models[name]
+
+        if name not in self._loaders:
+            raise KeyError(f"No loader registered for model '{name}'")
+
+        with self._locks[name]:
+            # Another thread may have finished loading while this one waited on the lock
+            if name not in self._models:
+                start_time = time.perf_counter()
+                model = self._loaders[name]()
+                self._load_times[name] = time.perf_counter() - start_time
+                self._models[name] = model
+                logger.info(f"Loaded model '{name}' in {self._load_times[name]:.2f}s")
+
+        return self._models[name]
+
+    def get_or_register(self, name: str, loader: Callable[[], Any]) -> Any:
+        """Return the shared model, registering its loader first if nobody has yet."""
+        with self._registry_lock:
+            if name not in self._loaders:
+                self._loaders[name] = loader
+                self._locks[name] = threading.Lock()
+        return self.get(name)
+
+    def tokenizer(self, encoding_name: str) -> Any:
+        """Return a shared tiktoken encoding."""
+        return self.get_or_register(f"tiktoken_{encoding_name}", lambda: _load_tiktoken(encoding_name))
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def load_times(self) -> Dict[str, float]:
+        """Seconds spent loading each model in this process."""
+        return {name: round(seconds, 3) for name, seconds in self._load_times.items()}
+
+
+# # Loaders
+
+def _load_tiktoken(encoding_name: str):
+    import tiktoken
+    return tiktoken.get_encoding(encoding_name)
+
+
+def _load_sentence_embedder():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(settings.EMBEDDING_PARAMS['model_name'])
+
+
+def _load_english_stopwords() -> frozenset:
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words('english'))
+
+
+model_registry = ModelRegistry()
+model_registry.register(ModelNames.SENTENCE_EMBEDDER.value, _load_sentence_embedder)
+model_registry.register(ModelNames.ENGLISH_STOPWORDS.value, _load_english_stopwords)
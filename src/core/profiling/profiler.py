@@ -0,0 +1,225 @@
+import cProfile
+import functools
+import itertools
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Union
+
+import pyprojroot
+
+from src.core.logging.logger import setup_logger
+
+logger = setup_logger("Profiler", Path("profiling.log"))
+
+# Comma separated stages to profile ("import", "scrape", "clean") or "all"
+PROFILE_ENV_VAR = "STOCKS_PROFILE"
+# "sample" for the low overhead sampling profiler, "cprofile" for the deterministic one
+PROFILE_MODE_ENV_VAR = "STOCKS_PROFILE_MODE"
+# "1" to also trace allocations with tracemalloc, which slows every allocation down
+PROFILE_MEMORY_ENV_VAR = "STOCKS_PROFILE_MEMORY"
+
+PROFILE_MODES = ("sample", "cprofile")
+SAMPLE_INTERVAL_SECONDS = 0.005
+ALLOCATION_HOTSPOTS = 25
+
+# Tells apart the profiles of runs of one stage started within the same second
+_run_ids = itertools.count(1)
+
+
+def enable_profiling(stages: Union[str, Iterable[str]] = "all", mode: str = "sample", memory: bool = False) -> None:
+    """Switch profiling on for the given stages, worker processes started afterwards inherit it."""
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode '{mode}', expected one of {PROFILE_MODES}")
+
+    os.environ[PROFILE_ENV_VAR] = stages if isinstance(stages, str) else ",".join(stages)
+    os.environ[PROFILE_MODE_ENV_VAR] = mode
+    os.environ[PROFILE_MEMORY_ENV_VAR] = "1" if memory else "0"
+
+
+def profiling_mode(stage: str) -> Optional[str]:
+    """Profiler to use for a stage, None when profiling is off."""
+    stages = {value.strip().lower() for value in os.environ.get(PROFILE_ENV_VAR, "").split(",") if value.strip()}
+    if not stages or not ({"all", stage} & stages):
+        return None
+
+    mode = os.environ.get(PROFILE_MODE_ENV_VAR, "sample").lower()
+    return mode if mode in PROFILE_MODES else "sample"
+
+
+def profiling_memory() -> bool:
+    """Whether profiled runs also trace their allocations."""
+    return os.environ.get(PROFILE_MEMORY_ENV_VAR, "0").strip().lower() in ("1", "true", "yes")
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of the process so far."""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        memory = psutil.Process().memory_info()
+        return getattr(memory, "peak_wset", memory.rss) / 1024 ** 2
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+class SamplingProfiler:
+    """
+    Samples the call stacks of every thread at a fixed interval and aggregates identical stacks,
+    written in the collapsed format read by flamegraph.pl and speedscope.
+
+    Each stack is rooted at its thread's name, so the worker threads of an endpoint show up next to
+    its calling thread. Threads of other endpoints running at the same time are sampled as well.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL_SECONDS):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    @staticmethod
+    def _frame_name(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+    def _run(self) -> None:
+        own_thread = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame_name(frame))
+                    frame = frame.f_back
+                if stack:
+                    stack.append(f"thread {thread_names.get(thread_id, thread_id)}")
+                    self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write_collapsed(self, path: Path) -> Path:
+        path.write_text("".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common()))
+        return path
+
+
+class _TracemallocSession:
+    """Reference counted tracemalloc, endpoints profiled concurrently share the tracing session."""
+
+    _lock = threading.Lock()
+    _users = 0
+    _started_here = False
+
+    @classmethod
+    def start(cls) -> None:
+        with cls._lock:
+            if cls._users == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                cls._started_here = True
+            cls._users += 1
+
+    @classmethod
+    def stop(cls) -> tracemalloc.Snapshot:
+        with cls._lock:
+            snapshot = tracemalloc.take_snapshot()
+            cls._users -= 1
+            if cls._users == 0 and cls._started_here:
+                tracemalloc.stop()
+                cls._started_here = False
+            return snapshot
+
+
+def _write_allocation_hotspots(snapshot: tracemalloc.Snapshot, path: Path) -> Path:
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ])
+    lines = [
+        f"{stat.size / 1024 ** 2:10.2f} MB {stat.count:10d} blocks  {stat.traceback}"
+        for stat in snapshot.statistics("lineno")[:ALLOCATION_HOTSPOTS]
+    ]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def profiled_endpoint(stage: str) -> Callable:
+    """
+    Profile an endpoint's execute() when profiling is enabled for its stage.
+
+    Writes the profile (collapsed stacks or a pstats file) under logs/profiles/ and attaches its path
+    and the peak RSS to the result dict. With memory profiling on, the allocation hotspots and the peak
+    traced memory are added.
+    """
+    def decorator(execute: Callable) -> Callable:
+        @functools.wraps(execute)
+        def wrapper(*args, **kwargs):
+            mode = profiling_mode(stage)
+            if mode is None:
+                return execute(*args, **kwargs)
+
+            output_dir = pyprojroot.here() / Path("logs") / "profiles"
+            output_dir.mkdir(parents=True, exist_ok=True)
+            stem = f"{stage}_{datetime.now():%Y%m%d_%H%M%S}_{os.getpid()}_{next(_run_ids)}"
+
+            memory = profiling_memory()
+            if memory:
+                _TracemallocSession.start()
+                tracemalloc.reset_peak()
+            if mode == "cprofile":
+                profiler = cProfile.Profile()
+                profiler.enable()
+            else:
+                profiler = SamplingProfiler()
+                profiler.start()
+
+            start_time = time.perf_counter()
+            try:
+                result = execute(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start_time
+                if mode == "cprofile":
+                    profiler.disable()
+                    profile_path = output_dir / f"{stem}.prof"
+                    profiler.dump_stats(profile_path)
+                else:
+                    profiler.stop()
+                    profile_path = profiler.write_collapsed(output_dir / f"{stem}.collapsed")
+
+                profile = {
+                    "mode": mode,
+                    "elapsed_seconds": round(elapsed, 3),
+                    "profile_path": str(profile_path),
+                    "peak_rss_mb": peak_rss_mb(),
+                }
+                if memory:
+                    _, traced_peak = tracemalloc.get_traced_memory()
+                    allocations_path = _write_allocation_hotspots(
+                        _TracemallocSession.stop(), output_dir / f"{stem}.allocations.txt"
+                    )
+                    profile["allocations_path"] = str(allocations_path)
+                    profile["peak_traced_mb"] = round(traced_peak / 1024 ** 2, 2)
+                logger.info(f"Profiled {stage} run: {profile}")
+
+            if isinstance(result, dict):
+                result["profile"] = profile
+            return result
+        return wrapper
+    return decorator
@@ -1,14 +1,22 @@
-from typing import Tuple, Set, Optional, List, Dict
+from typing import Tuple, Set, Optional, List, Dict, Union
 from dataclasses import dataclass, field
 from enum import Enum
+import threading
+import time
+import random
 import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import numpy as np
-from deltalake import DeltaTable, write_deltalake
+from deltalake import DeltaTable, write_deltalake, WriterProperties, ColumnProperties
+from deltalake.schema import Field, PrimitiveType
+from deltalake.exceptions import CommitFailedError, DeltaError
 from pathlib import Path
 import pyprojroot
 
 from src.core.logging.logger import setup_logger
+from src.core.metrics.metrics import metrics
 
 logger = setup_logger("DeltaLakeManager", Path("delta_lake.log"))
 
@@ -19,53 +27,156 @@ class TableNames(Enum):
     SCRAPED_ARTICLES = "scraped_data"
     CLEANED_ARTICLES = "cleaned_data"
     LLM_ARTICLES = "llm_data"
+    LLM_RETRIES = "llm_retries"
     STATUS_ARTICLES = 'article_status_data'
+    DEDUP_ARTICLES = "dedup_data"
+    DEDUP_INDEX = "dedup_index"
+    CRYPTO_PRICES = "crypto_prices"
+    CRYPTO_PRICES_INTRADAY = "crypto_prices_intraday"
+    INTRADAY_GAP_CHECKS = "crypto_prices_intraday_gap_checks"
+    CRYPTO_INDICATORS = "crypto_indicators"
+    TRAINING_FEATURES = "training_features"
+    SENTIMENT_CONTRIBUTIONS = "sentiment_contributions"
+    SENTIMENT_AGGREGATES = "sentiment_aggregates"
+    SENTIMENT_WATERMARK = "sentiment_watermark"
+    FEED_CHECKPOINTS = "change_feed_checkpoints"
+
+
+# Article processing stages in order, each one is a boolean column of the status table
+ARTICLE_STAGES = [
+    TableNames.METADATA_ARTICLES.value,
+    TableNames.SCRAPED_ARTICLES.value,
+    TableNames.CLEANED_ARTICLES.value,
+    TableNames.LLM_ARTICLES.value,
+]
+
+
+# Status flag of near-duplicates, they stop after the scrape and are left out of the later stages' pending sets
+DUPLICATE_FLAG = "duplicate"
+
+
+def article_status(news_ids: List[str], reached: TableNames, duplicate: bool = False) -> pd.DataFrame:
+    """Status rows of articles that completed `reached` and every stage before it, but none after."""
+    completed = ARTICLE_STAGES.index(reached.value)
+    return pd.DataFrame({
+        'news_id': list(news_ids),
+        **{stage: position <= completed for position, stage in enumerate(ARTICLE_STAGES)},
+        DUPLICATE_FLAG: duplicate,
+    })
+
+@dataclass
+class WriterSettings:
+    """Parquet settings of the files written to a table."""
+    compression_level: int = 3
+    dictionary_enabled: bool = True
+    max_row_group_size: int = 1_000_000
+
+    def to_writer_properties(self) -> WriterProperties:
+        return WriterProperties(
+            compression="ZSTD",
+            compression_level=self.compression_level,
+            max_row_group_size=self.max_row_group_size,
+            default_column_properties=ColumnProperties(dictionary_enabled=self.dictionary_enabled),
+        )
+
+
+# Article text is mostly unique and read a few rows at a time: compress harder, skip dictionaries,
+# and keep row groups small so a lookup by news_id decompresses little beyond the rows it needs
+COLD_WRITER_SETTINGS = WriterSettings(compression_level=9, dictionary_enabled=False, max_row_group_size=8_192)
+
 
 @dataclass
 class TableSchema:
     name: str
-    predicate: str
+    predicate: Union[str, List[str]]
     base_path: Path
     universal_path: Optional[Path] = None
     partition_columns: List[str] = field(default_factory=list)
+    sort_columns: List[str] = field(default_factory=list)
+    # Large text columns stored apart in the `{name}_text` table and joined back only when read
+    cold_columns: List[str] = field(default_factory=list)
+    writer: WriterSettings = field(default_factory=WriterSettings)
+    # Small tables read repeatedly keep their read results for as long as their version is unchanged
+    cache_reads: bool = False
+    # Record row level changes, read by the downstream stages through ChangeFeedConsumer
+    change_data_feed: bool = False
+    # Columns added after tables were created, name -> (Delta type, SQL value of the rows written before)
+    added_columns: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+
+    @property
+    def key_columns(self) -> List[str]:
+        """Columns identifying a row, the predicate may be a single column or a composite key."""
+        return [self.predicate] if isinstance(self.predicate, str) else list(self.predicate)
+
+    @property
+    def id_columns(self) -> List[str]:
+        """Key and partition columns, kept in both halves of a split table."""
+        return self.key_columns + [column for column in self.partition_columns if column not in self.key_columns]
 
 
 # -
 
 class DeltaLakeManager:
-    """Manages Delta Lake tables for the news processing pipeline."""
+    """Manages Delta Lake tables for the news processing and price pipelines."""
+
+    MAX_COMMIT_ATTEMPTS = 6
+    BASE_BACKOFF_SECONDS = 0.25
+    VACUUM_RETENTION_HOURS = 168
+    MAX_CACHED_READS = 16
+    CHANGE_DATA_FEED_PROPERTIES = {"delta.enableChangeDataFeed": "true"}
+    # Columns added to the rows of the change data feed
+    CHANGE_COLUMNS = ['_change_type', '_commit_version', '_commit_timestamp']
     
-    def __init__(self):
+    def __init__(self, root: Optional[Path] = None):
 
-        self.root = pyprojroot.here()
+        self.root = Path(root) if root is not None else pyprojroot.here()
         self.table_schemas = self._init_tables()
 
+        # Table handles are refreshed incrementally instead of replaying the log for every read and merge
+        self._handles: Dict[str, DeltaTable] = {}
+        self._table_locks: Dict[str, threading.RLock] = {}
+        self._locks_lock = threading.Lock()
+        self._read_cache: Dict[str, Dict[tuple, pd.DataFrame]] = {}
+        # Version of the snapshot each table was last read at
+        self.last_read_versions: Dict[str, int] = {}
+
+    @staticmethod
+    def cold_table_name(table_name: str) -> str:
+        return f"{table_name}_text"
+
     def _init_tables(self) -> Dict[TableNames, TableSchema]:
 
-        return {
+        tables = {
             TableNames.STATUS_ARTICLES.value: TableSchema(
                 name=TableNames.STATUS_ARTICLES.value,
                 predicate = "news_id",
                 base_path = self.root / Path('data/news/BTC/process_status'),
                 partition_columns=[],
+                cache_reads=True,
+                added_columns={DUPLICATE_FLAG: ("boolean", "false")},
             ),
             TableNames.METADATA_ARTICLES.value: TableSchema(
                 name=TableNames.METADATA_ARTICLES.value,
                 predicate = "news_id",
                 base_path = self.root / Path('data/news/BTC/raw_data/'),
                 partition_columns=['year_utc', 'month_utc', 'day_utc'],
+                change_data_feed=True,
             ),
             TableNames.SCRAPED_ARTICLES.value: TableSchema(
                 name=TableNames.SCRAPED_ARTICLES.value,
                 predicate = "news_id",
                 base_path = self.root / Path('data/news/BTC/scraped_data'),
                 partition_columns=['year_utc', 'month_utc', 'day_utc'],
+                change_data_feed=True,
+                cold_columns=['full_text'],
             ),
             TableNames.CLEANED_ARTICLES.value: TableSchema(
                 name=TableNames.CLEANED_ARTICLES.value,
                 predicate = "news_id",
                 base_path = self.root / Path('data/news/BTC/cleaned_data'),
                 partition_columns=['year_utc', 'month_utc', 'day_utc'],
+                change_data_feed=True,
+                cold_columns=['selected_text', 'llm_ready_text'],
             ),
             TableNames.LLM_ARTICLES.value: TableSchema(
                 name=TableNames.LLM_ARTICLES.value,
@@ -73,69 +184,530 @@ class DeltaLakeManager:
                 base_path = self.root / Path('data/news/BTC/llm_data'),
                 partition_columns=['year_utc', 'month_utc', 'day_utc'],
             ),   
+            TableNames.LLM_RETRIES.value: TableSchema(
+                name=TableNames.LLM_RETRIES.value,
+                predicate = "news_id",
+                base_path = self.root / Path('data/news/BTC/llm_retries'),
+                partition_columns=[],
+                cache_reads=True,
+            ),
+            TableNames.DEDUP_ARTICLES.value: TableSchema(
+                name=TableNames.DEDUP_ARTICLES.value,
+                predicate = "news_id",
+                base_path = self.root / Path('data/news/BTC/dedup_data'),
+                partition_columns=['year_utc', 'month_utc', 'day_utc'],
+            ),
+            TableNames.DEDUP_INDEX.value: TableSchema(
+                name=TableNames.DEDUP_INDEX.value,
+                predicate = "band_id",
+                base_path = self.root / Path('data/news/BTC/dedup_index'),
+                partition_columns=[],
+            ),
+            TableNames.CRYPTO_PRICES.value: TableSchema(
+                name=TableNames.CRYPTO_PRICES.value,
+                predicate = ['ticker', 'timestamp'],
+                base_path = self.root / Path('data/technical/crypto_prices'),
+                partition_columns=['ticker', 'year', 'month'],
+                sort_columns=['ticker', 'timestamp'],
+            ),
+            TableNames.CRYPTO_PRICES_INTRADAY.value: TableSchema(
+                name=TableNames.CRYPTO_PRICES_INTRADAY.value,
+                predicate = ['ticker', 'timestamp'],
+                base_path = self.root / Path('data/technical/crypto_prices_intraday'),
+                partition_columns=['ticker', 'year', 'month'],
+                sort_columns=['ticker', 'timestamp'],
+            ),
+            TableNames.INTRADAY_GAP_CHECKS.value: TableSchema(
+                name=TableNames.INTRADAY_GAP_CHECKS.value,
+                predicate = ['ticker', 'interval'],
+                base_path = self.root / Path('data/technical/crypto_prices_intraday_gap_checks'),
+                partition_columns=[],
+                cache_reads=True,
+            ),
+            TableNames.CRYPTO_INDICATORS.value: TableSchema(
+                name=TableNames.CRYPTO_INDICATORS.value,
+                predicate = ['ticker', 'timestamp'],
+                base_path = self.root / Path('data/technical/crypto_indicators'),
+                partition_columns=['ticker', 'year', 'month'],
+                sort_columns=['ticker', 'timestamp'],
+            ),
+            TableNames.TRAINING_FEATURES.value: TableSchema(
+                name=TableNames.TRAINING_FEATURES.value,
+                predicate = "news_id",
+                base_path = self.root / Path('data/news/BTC/training_features'),
+                partition_columns=['year_utc', 'month_utc'],
+                sort_columns=['date_utc'],
+            ),
+            TableNames.SENTIMENT_CONTRIBUTIONS.value: TableSchema(
+                name=TableNames.SENTIMENT_CONTRIBUTIONS.value,
+                predicate = "news_id",
+                base_path = self.root / Path('data/news/BTC/sentiment_contributions'),
+                partition_columns=['year_utc', 'month_utc'],
+                sort_columns=['bucket_hour'],
+            ),
+            TableNames.SENTIMENT_AGGREGATES.value: TableSchema(
+                name=TableNames.SENTIMENT_AGGREGATES.value,
+                predicate = ['granularity', 'bucket_start'],
+                base_path = self.root / Path('data/news/BTC/sentiment_aggregates'),
+                partition_columns=['granularity', 'year'],
+                sort_columns=['granularity', 'bucket_start'],
+            ),
+            TableNames.SENTIMENT_WATERMARK.value: TableSchema(
+                name=TableNames.SENTIMENT_WATERMARK.value,
+                predicate = "source_table",
+                base_path = self.root / Path('data/news/BTC/sentiment_watermark'),
+                partition_columns=[],
+                cache_reads=True,
+            ),
+            TableNames.FEED_CHECKPOINTS.value: TableSchema(
+                name=TableNames.FEED_CHECKPOINTS.value,
+                predicate = ['stage', 'table_name'],
+                base_path = self.root / Path('data/news/BTC/change_feed_checkpoints'),
+                partition_columns=[],
+                cache_reads=True,
+            ),
         }
 
-    def _create_table(self, path:Path, data: pd.DataFrame, partition_columns: Optional[List[str]] = None) -> None:
+        for table_config in list(tables.values()):
+            if table_config.cold_columns:
+                cold_name = self.cold_table_name(table_config.name)
+                tables[cold_name] = TableSchema(
+                    name=cold_name,
+                    predicate=table_config.predicate,
+                    base_path=table_config.base_path.with_name(f"{table_config.base_path.name}_text"),
+                    partition_columns=table_config.partition_columns,
+                    writer=COLD_WRITER_SETTINGS,
+                )
+
+        return tables
+
+    def _create_table(
+        self, path:Path, data: Union[pd.DataFrame, pa.Table], partition_columns: Optional[List[str]] = None,
+        writer_properties: Optional[WriterProperties] = None, configuration: Optional[Dict[str, str]] = None
+    ) -> None:
         """Create a new Delta table"""
-        write_args = {"table_or_uri": str(path), "data": data}
+        write_args = {
+            "table_or_uri": str(path), "data": data, "writer_properties": writer_properties, "configuration": configuration
+        }
         if partition_columns:
             write_args["partition_by"] = partition_columns
         write_deltalake(**write_args)
 
-    def _merge_table(self, path:Path, data: pd.DataFrame, predicate: str) -> dict:
+    @staticmethod
+    def _partition_values(data: Union[pd.DataFrame, pa.Table], column: str) -> list:
+        if isinstance(data, pa.Table):
+            return pc.unique(pc.drop_null(data[column])).to_pylist()
+        return data[column].dropna().unique().tolist()
+
+    @staticmethod
+    def _sql_literal(value) -> str:
+        if isinstance(value, str):
+            return "'" + value.replace("'", "''") + "'"
+        return str(value)
+
+    def _merge_predicate(self, data: Union[pd.DataFrame, pa.Table], table_config: TableSchema) -> str:
+        """
+        Join on the key and pin the target to the partitions present in the source, so merges
+        touching disjoint partitions read disjoint files and commit without conflicting.
+
+        Partition values of a row are assumed immutable: a row written again with another partition
+        value (e.g. a corrected date_utc) is inserted next to the old one instead of updating it.
+        """
+        conditions = [f"s.{column} = t.{column}" for column in table_config.key_columns]
+        for column in table_config.partition_columns:
+            values = self._partition_values(data, column)
+            if values:
+                conditions.append(f"t.{column} IN ({', '.join(map(self._sql_literal, sorted(values)))})")
+        return " AND ".join(conditions)
+
+    def table_lock(self, table_name: str) -> threading.RLock:
+        with self._locks_lock:
+            return self._table_locks.setdefault(table_name, threading.RLock())
+
+    def get_table(self, table_name: str) -> DeltaTable:
+        """
+        Cached handle of an existing table at its latest version. New commits are applied to the
+        cached snapshot rather than replayed from the last checkpoint, with nothing to apply this
+        only lists the log. Hold the table lock while using the handle, merges update it in place.
+        """
+        with self.table_lock(table_name):
+            table = self._handles.get(table_name)
+            if table is None:
+                table = DeltaTable(str(self.table_schemas[table_name].base_path))
+                self._add_columns(table_name, table)
+                self._handles[table_name] = table
+            else:
+                table.update_incremental()
+            return table
+
+    def _add_columns(self, table_name: str, table: DeltaTable) -> None:
+        """Add the configured columns missing from a table created before them, filling them in the existing rows."""
+        stored_columns = set(table.schema().to_pyarrow().names)
+        missing = {
+            name: column for name, column in self.table_schemas[table_name].added_columns.items()
+            if name not in stored_columns
+        }
+        if not missing:
+            return
+
+        table.alter.add_columns([Field(name, PrimitiveType(delta_type), nullable=True) for name, (delta_type, _) in missing.items()])
+        table.update(updates={name: value for name, (_, value) in missing.items()})
+        logger.info(f"Table: {table_name} - Added columns {list(missing)}")
+
+    def table_version(self, table_name: str) -> Optional[int]:
+        """Latest version of the table, None when it does not exist yet."""
+        if not self.table_exists(table_name):
+            return None
+        return self.get_table(table_name).version()
+
+    def _merge_table(
+        self, table_name: str, data: Union[pd.DataFrame, pa.Table], predicate: str,
+        writer_properties: Optional[WriterProperties] = None
+    ) -> dict:
         """Merge data into existing Delta table"""
-        
-        table = DeltaTable(str(path))
-        
-        merger = table.merge(
-            source=data,
-            predicate=f"s.{predicate} = t.{predicate}",
-            source_alias="s",
-            target_alias="t"
-        )
-        merger.when_matched_update_all()
-        merger.when_not_matched_insert_all()
-        results = merger.execute()
 
-        table.vacuum(retention_hours=168)
-        
-        return results
+        with self.table_lock(table_name):
+            table = self.get_table(table_name)
+
+            merger = table.merge(
+                source=data,
+                predicate=predicate,
+                source_alias="s",
+                target_alias="t",
+                writer_properties=writer_properties,
+            )
+            merger.when_matched_update_all()
+            merger.when_not_matched_insert_all()
+            return merger.execute()
+
+    def _vacuum_table(self, table_name: str) -> None:
+        """Remove files no longer referenced for a week, failures only delay the cleanup."""
+        try:
+            with self.table_lock(table_name):
+                self.get_table(table_name).vacuum(retention_hours=self.VACUUM_RETENTION_HOURS)
+        except Exception as e:
+            logger.warning(f"Table: {table_name} - Vacuum skipped: {e}")
+
+    def _commit_with_retry(self, table_name: str, data: Union[pd.DataFrame, pa.Table]) -> None:
+        """
+        Create or merge into the table, retrying the whole transaction against a fresh snapshot when
+        a concurrent writer committed first.
+        """
+        table_config = self.table_schemas.get(table_name)
+        predicate = self._merge_predicate(data, table_config)
+        writer_properties = table_config.writer.to_writer_properties()
+
+        for attempt in range(1, self.MAX_COMMIT_ATTEMPTS + 1):
+            try:
+                if not (table_config.base_path / '_delta_log').exists():
+                    try:
+                        self._create_table(
+                            table_config.base_path, data, table_config.partition_columns, writer_properties,
+                            self.CHANGE_DATA_FEED_PROPERTIES if table_config.change_data_feed else None,
+                        )
+                        logger.info(f"Created new table with {len(data)} rows")
+                        return
+                    except (DeltaError, FileExistsError):
+                        # Another writer created the table first, merge into it instead
+                        if not (table_config.base_path / '_delta_log').exists():
+                            raise
+
+                results = self._merge_table(table_name, data, predicate, writer_properties)
+                logger.info(f"Table: {table_name} - Merged data: {results['num_target_rows_inserted']} rows inserted, "
+                           f"{results['num_target_rows_updated']} rows updated")
+                self._vacuum_table(table_name)
+                return
+
+            except CommitFailedError as e:
+                metrics.increment("delta_commit_conflicts_total", table=table_name)
+                if attempt == self.MAX_COMMIT_ATTEMPTS:
+                    raise
+                delay = self.BASE_BACKOFF_SECONDS * 2 ** (attempt - 1) * (1 + random.random())
+                logger.warning(f"Table: {table_name} - Commit conflict on attempt {attempt}, retrying in {delay:.2f}s: {e}")
+                time.sleep(delay)
         
-    def write_table(self, table_name: str, df: pd.DataFrame) -> None:
+    @staticmethod
+    def _column_names(data: Union[pd.DataFrame, pa.Table]) -> List[str]:
+        return data.column_names if isinstance(data, pa.Table) else list(data.columns)
+
+    @staticmethod
+    def _select(data: Union[pd.DataFrame, pa.Table], columns: List[str]) -> Union[pd.DataFrame, pa.Table]:
+        return data.select(columns) if isinstance(data, pa.Table) else data[columns]
+
+    def _split_columns(
+        self, table_config: TableSchema, data: Union[pd.DataFrame, pa.Table]
+    ) -> Tuple[Union[pd.DataFrame, pa.Table], Optional[Union[pd.DataFrame, pa.Table]]]:
+        """Hot and cold halves of the data, the cold half is None when the data holds no cold column."""
+        columns = self._column_names(data)
+        cold_columns = [column for column in table_config.cold_columns if column in columns]
+        if not cold_columns:
+            return data, None
+
+        hot = self._select(data, [column for column in columns if column not in cold_columns])
+        return hot, self._select(data, table_config.id_columns + cold_columns)
+
+    def _is_split(self, table_config: TableSchema) -> bool:
+        """
+        Tables with cold columns are written split, except tables created before the split that still
+        hold them in their own files. Those keep working unsplit until `split_table` migrates them.
+        """
+        if not table_config.cold_columns:
+            return False
+        if self.table_exists(self.cold_table_name(table_config.name)) or not self.table_exists(table_config.name):
+            return True
+
+        with self.table_lock(table_config.name):
+            stored_columns = self.get_table(table_config.name).schema().to_pyarrow().names
+        return not set(table_config.cold_columns) & set(stored_columns)
+
+    def _persist(self, table_name: str, df: Union[pd.DataFrame, pa.Table]) -> None:
+        with metrics.timer("delta_write_seconds", table=table_name):
+            self._commit_with_retry(table_name, df)
+        metrics.increment("delta_rows_written_total", len(df), table=table_name)
+
+    def write_table(self, table_name: str, df: Union[pd.DataFrame, pa.Table]) -> None:
         """
         Persist data to Delta Lake format with upsert functionality.
         """
 
-        if df.empty:
+        if len(df) == 0:
             logger.warning(f"Empty DataFrame provided for {table_name}, skipping persist")
             return
 
-        df = df.copy()
+        logger.info(f"Table: {table_name} - Persisting data...")
+        table_config = self.table_schemas[table_name]
 
-        table_config = self.table_schemas.get(table_name)
+        # Arrow tables are already typed, only pandas frames need their list columns normalized
+        if isinstance(df, pd.DataFrame):
+            df = df.copy()
 
-        logger.info(f"Table: {table_name} - Persisting data...")
+            types = (list, set, np.ndarray)
+            list_columns = df.columns[df.apply(lambda x: x.apply(lambda y: isinstance(y, types)).any())]
+            for column in list_columns:
+                df[column] = df[column].map(lambda x: list(x) if isinstance(x, types) else [])
 
-        types = (list, set, np.ndarray)
-        list_columns = df.columns[df.apply(lambda x: x.apply(lambda y: isinstance(y, types)).any())]
-        for column in list_columns:
-            df[column] = df[column].map(lambda x: list(x) if isinstance(x, types) else [])
-        
-        if not (table_config.base_path / '_delta_log').exists():
-            self._create_table(table_config.base_path, df, table_config.partition_columns)
-            logger.info(f"Created new table with {len(df)} rows")
+        # Time series tables are written sorted so file statistics allow skipping on range reads
+        sort_columns = table_config.sort_columns
+        if sort_columns:
+            df = (
+                df.sort_by([(column, "ascending") for column in sort_columns]) if isinstance(df, pa.Table)
+                else df.sort_values(sort_columns, ignore_index=True)
+            )
+
+        if self._is_split(table_config):
+            df, cold = self._split_columns(table_config, df)
+            # Text first, so every row visible in the hot table already has its text
+            if cold is not None:
+                self._persist(self.cold_table_name(table_name), cold)
+
+        self._persist(table_name, df)
+
+    def split_table(self, table_name: str) -> Dict:
+        """
+        Move the cold columns of a table created before the split into its cold table and rewrite the
+        hot table without them. Rewrites the whole table, run it while no pipeline writes to it.
+        """
+        table_config = self.table_schemas[table_name]
+        if not table_config.cold_columns:
+            raise ValueError(f"Table {table_name} has no cold columns to split")
+        if not self.table_exists(table_name):
+            return {"rows_moved": 0}
+
+        with self.table_lock(table_name):
+            table = self.get_table(table_name)
+            # Checked on the stored schema rather than the cold table, so an interrupted migration can be rerun
+            if not set(table_config.cold_columns) & set(table.schema().to_pyarrow().names):
+                logger.info(f"Table: {table_name} - Already split")
+                return {"rows_moved": 0}
+
+            data = table.to_pyarrow_table()
+            hot, cold = self._split_columns(table_config, data)
+
+            self._persist(self.cold_table_name(table_name), cold)
+            write_deltalake(
+                table,
+                hot,
+                mode="overwrite",
+                schema_mode="overwrite",
+                partition_by=table_config.partition_columns or None,
+                writer_properties=table_config.writer.to_writer_properties(),
+            )
+            self._vacuum_table(table_name)
+
+        logger.info(f"Table: {table_name} - Moved {self._column_names(cold)} of {len(cold)} rows to the cold table")
+        return {"rows_moved": len(cold)}
+
+    def table_exists(self, table_name: str) -> bool:
+        return (self.table_schemas[table_name].base_path / '_delta_log').exists()
+
+    def enable_change_data_feed(self, table_name: str) -> None:
+        """Turn on the change data feed of a table created before it was configured, changes are recorded from then on."""
+        if not self.table_schemas[table_name].change_data_feed:
+            raise ValueError(f"Table {table_name} is not configured for the change data feed")
+        if not self.table_exists(table_name):
+            return
+
+        with self.table_lock(table_name):
+            table = self.get_table(table_name)
+            if table.metadata().configuration.get("delta.enableChangeDataFeed") != "true":
+                table.alter.set_table_properties(self.CHANGE_DATA_FEED_PROPERTIES)
+                logger.info(f"Table: {table_name} - Enabled the change data feed at version {table.version()}")
+
+    def version_before(self, table_name: str, timestamp: pd.Timestamp) -> int:
+        """
+        Last version committed before the UTC timestamp, -1 when the whole log is newer. Versions from before
+        the change data feed was enabled have no readable changes, the version enabling it is the earliest returned.
+        """
+        cutoff_ms = pd.Timestamp(timestamp).value // 1_000_000
+        with self.table_lock(table_name):
+            history = self.get_table(table_name).history()
+
+        # History is listed newest first
+        for commit in history:
+            enables_feed = (
+                commit.get('operation') == 'SET TBLPROPERTIES'
+                and 'delta.enableChangeDataFeed' in str(commit.get('operationParameters'))
+            )
+            if commit['timestamp'] < cutoff_ms or enables_feed:
+                return commit['version']
+        return history[-1]['version'] - 1 if history else -1
+
+    def read_changes(self, table_name: str, starting_version: int, ending_version: int) -> pd.DataFrame:
+        """
+        Latest state of the rows inserted or updated between two versions, both included. Deletes and
+        the before images of updates are dropped, a row changed several times is returned once.
+        """
+        table_config = self.table_schemas[table_name]
+
+        with metrics.timer("delta_read_seconds", table=table_name):
+            with self.table_lock(table_name):
+                reader = self.get_table(table_name).load_cdf(
+                    starting_version=starting_version, ending_version=ending_version
+                )
+            changes = reader.read_all()
+            changes = changes.filter(pc.is_in(changes['_change_type'], pa.array(['insert', 'update_postimage'])))
+            df = changes.to_pandas()
+
+        df = (
+            df.sort_values('_commit_version', kind='stable')
+            .drop_duplicates(subset=table_config.key_columns, keep='last')
+            .drop(columns=self.CHANGE_COLUMNS)
+            .reset_index(drop=True)
+        )
+        metrics.increment("delta_rows_read_total", len(df), table=table_name)
+        return df
+
+    def read_matching(
+        self, table_name: str,
+        rows: pd.DataFrame,
+        columns: Optional[List[str]] = None,
+        filters: Optional[List[tuple]] = None,
+    ) -> pd.DataFrame:
+        """
+        Rows of the table sharing their key with `rows`. The lookup is pinned to the partitions of `rows`,
+        so only the files of those partitions are scanned for the keys.
+        """
+        table_config = self.table_schemas[table_name]
+        if rows.empty:
+            return pd.DataFrame(columns=columns)
+
+        lookup_filters = [
+            (column, 'in', rows[column].drop_duplicates().tolist())
+            for column in table_config.id_columns if column in rows
+        ]
+        return self.read_table(table_name, filters=lookup_filters + (filters or []), columns=columns)
+
+    def _cache_read(self, table_name: str, key: tuple, df: pd.DataFrame) -> None:
+        """Keep a read result, dropping the results of older versions of the table."""
+        version = key[0]
+        cached = {
+            cached_key: cached_df for cached_key, cached_df in self._read_cache.get(table_name, {}).items()
+            if cached_key[0] == version
+        }
+        cached[key] = df
+        while len(cached) > self.MAX_CACHED_READS:
+            cached.pop(next(iter(cached)))
+        self._read_cache[table_name] = cached
+
+    def _read(self, table_name: str, filters: Optional[List[tuple]], columns: Optional[List[str]]) -> pd.DataFrame:
+        cache_reads = self.table_schemas[table_name].cache_reads
+
+        with metrics.timer("delta_read_seconds", table=table_name):
+            # The snapshot is pinned under the lock, the files are then read without holding it
+            with self.table_lock(table_name):
+                table = self.get_table(table_name)
+                version = table.version()
+                key = (version, repr(filters), None if columns is None else tuple(columns))
+                cached = self._read_cache.get(table_name, {}).get(key) if cache_reads else None
+                dataset = table.to_pyarrow_dataset() if cached is None else None
+
+            if cached is not None:
+                metrics.increment("delta_read_cache_hits_total", table=table_name)
+                df = cached.copy()
+            else:
+                df = dataset.to_table(
+                    columns=columns, filter=pq.filters_to_expression(filters) if filters else None
+                ).to_pandas()
+                if cache_reads:
+                    with self.table_lock(table_name):
+                        self._cache_read(table_name, key, df.copy())
+
+        self.last_read_versions[table_name] = version
+        df.attrs['delta_version'] = version
+        metrics.increment("delta_rows_read_total", len(df), table=table_name)
+        return df
+
+    def _read_split(
+        self, table_config: TableSchema, filters: Optional[List[tuple]], columns: Optional[List[str]]
+    ) -> pd.DataFrame:
+        """
+        Read the hot table and join the cold columns on the key, only when they are requested or
+        filtered on. The cold read is restricted to the keys and partitions of the hot rows.
+        """
+        cold_set = set(table_config.cold_columns)
+        hot_filters = [condition for condition in filters or [] if condition[0] not in cold_set]
+        cold_filters = [condition for condition in filters or [] if condition[0] in cold_set]
+
+        if columns is None:
+            hot_columns, cold_columns = None, table_config.cold_columns
         else:
-            results = self._merge_table(table_config.base_path, df, table_config.predicate)
-            logger.info(f"Table: {table_name} - Merged data: {results['num_target_rows_inserted']} rows inserted, "
-                       f"{results['num_target_rows_updated']} rows updated")
-            
+            hot_columns = [column for column in columns if column not in cold_set]
+            cold_columns = [column for column in columns if column in cold_set]
+
+        if not cold_columns and not cold_filters:
+            return self._read(table_config.name, hot_filters or None, hot_columns)
+
+        keys = table_config.key_columns
+        if hot_columns is not None:
+            hot_columns = hot_columns + [key for key in keys if key not in hot_columns]
+        hot = self._read(table_config.name, hot_filters or None, hot_columns)
+        if hot.empty:
+            return pd.DataFrame(columns=columns if columns is not None else [*hot.columns, *cold_columns])
+
+        cold_read_filters = [
+            *(condition for condition in hot_filters if condition[0] in table_config.partition_columns),
+            *((key, 'in', hot[key].drop_duplicates().tolist()) for key in keys),
+            *cold_filters,
+        ]
+        cold = self._read(
+            self.cold_table_name(table_config.name), cold_read_filters, keys + [
+                column for column in cold_columns if column not in keys
+            ]
+        )
+
+        df = hot.merge(cold, on=keys, how='inner' if cold_filters else 'left')
+        df = df[columns] if columns is not None else df
+        df.attrs['delta_version'] = hot.attrs['delta_version']
+        return df
+
     def read_table(
         self, table_name: str, 
         filters: Optional[List[tuple]] = None, 
         columns: Optional[List[tuple]] = None
     ) -> pd.DataFrame:
         """
-        Read data from a Delta table with optional filters
+        Read data from a Delta table with optional filters. The version of the snapshot read is kept in
+        `df.attrs['delta_version']` and `last_read_versions`.
         """
         
         table_config = self.table_schemas.get(table_name)
@@ -144,5 +716,20 @@ class DeltaLakeManager:
             logger.warning(f"Table {table_name} does not exist")
             return pd.DataFrame(columns = columns)
 
-        dt = DeltaTable(str(table_config.base_path))
-        return dt.to_pandas(filters=filters, columns = columns)
+        if table_config.cold_columns and self.table_exists(self.cold_table_name(table_name)):
+            return self._read_split(table_config, filters, columns)
+
+        return self._read(table_name, filters, columns)
+
+
+_shared_managers: Dict[Path, DeltaLakeManager] = {}
+_shared_managers_lock = threading.Lock()
+
+
+def get_deltalake(root: Optional[Path] = None) -> DeltaLakeManager:
+    """Process-wide manager per root, so endpoints share table handles and cached reads."""
+    root = Path(root) if root is not None else pyprojroot.here()
+    with _shared_managers_lock:
+        if root not in _shared_managers:
+            _shared_managers[root] = DeltaLakeManager(root)
+        return _shared_managers[root]
@@ -0,0 +1,81 @@
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+
+from src.core.storage.delta_lake import DeltaLakeManager, get_deltalake
+from src.core.logging.logger import setup_logger
+
+logger = setup_logger("DeltaQueryEngine", Path("delta_lake.log"))
+
+
+class DeltaQueryEngine:
+    """
+    SQL over the Delta tables with an embedded DuckDB.
+
+    Every table of DeltaLakeManager is registered as a view over its current snapshot's Arrow dataset,
+    so DuckDB pushes column projections and filters down to the parquet files and only reads what
+    the query needs. Views are refreshed to the latest table versions before each query.
+
+        engine = DeltaQueryEngine()
+        engine.query_df("SELECT source_name, count(*) FROM raw_data GROUP BY 1")
+    """
+
+    def __init__(self, deltalake: Optional[DeltaLakeManager] = None, threads: Optional[int] = None):
+        import duckdb
+
+        self.deltalake = deltalake or get_deltalake()
+        self.connection = duckdb.connect(database=":memory:")
+        if threads:
+            self.connection.execute(f"SET threads = {int(threads)}")
+
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self) -> Dict[str, int]:
+        """Register every existing table at its latest version, returns the version of each view."""
+        with self._lock:
+            for table_name in self.deltalake.table_schemas:
+                if not self.deltalake.table_exists(table_name):
+                    continue
+
+                with self.deltalake.table_lock(table_name):
+                    table = self.deltalake.get_table(table_name)
+                    if self._versions.get(table_name) == table.version():
+                        continue
+                    dataset, version = table.to_pyarrow_dataset(), table.version()
+
+                self.connection.register(table_name, dataset)
+                self._versions[table_name] = version
+
+            return dict(self._versions)
+
+    @property
+    def tables(self) -> List[str]:
+        return sorted(self.refresh())
+
+    def query(self, sql: str, parameters: Optional[Sequence] = None) -> pa.Table:
+        """Run a query against the latest table versions and return the result as an Arrow table."""
+        self.refresh()
+        # Registered views are local to the connection, which must not be used by two threads at once
+        with self._lock:
+            try:
+                return self.connection.execute(sql, parameters or []).fetch_arrow_table()
+            except Exception as e:
+                logger.error(f"Query failed: {e}\n{sql}")
+                raise
+
+    def query_df(self, sql: str, parameters: Optional[Sequence] = None) -> pd.DataFrame:
+        """Run a query and return the result as a pandas DataFrame."""
+        return self.query(sql, parameters).to_pandas()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
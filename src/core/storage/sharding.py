@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from typing import List
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class ShardSpec:
+    """Selects the disjoint slice of articles where hash(news_id) % count == index."""
+    index: int = 0
+    count: int = 1
+
+    def __post_init__(self):
+        if self.count < 1 or not 0 <= self.index < self.count:
+            raise ValueError(f"Invalid shard {self.index}/{self.count}")
+
+    def mask(self, news_ids: pd.Series) -> pd.Series:
+        """Boolean mask of the news_ids belonging to this shard."""
+        if self.count == 1:
+            return pd.Series(True, index=news_ids.index)
+
+        # hash_pandas_object uses a fixed key, so every process assigns an article to the same shard
+        hashes = pd.util.hash_pandas_object(news_ids.astype(str), index=False).to_numpy()
+        return pd.Series(hashes % self.count == self.index, index=news_ids.index)
+
+    def select(self, news_ids: List[str]) -> List[str]:
+        """The news_ids belonging to this shard."""
+        news_ids = pd.Series(news_ids, dtype=object)
+        return news_ids[self.mask(news_ids)].tolist()
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
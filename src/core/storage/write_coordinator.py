@@ -0,0 +1,85 @@
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import pandas as pd
+import pyarrow as pa
+
+from src.core.storage.delta_lake import DeltaLakeManager
+from src.core.logging.logger import setup_logger
+
+logger = setup_logger("DeltaWriteCoordinator", Path("delta_lake.log"))
+
+
+class DeltaWriteCoordinator:
+    """
+    Buffers writes per table and commits them as larger batched merges.
+
+    Tables are flushed in the order they were first written to, so data tables land before the status
+    updates that point at them. Commit conflicts are retried by DeltaLakeManager at the transaction level.
+    """
+
+    def __init__(self, deltalake: DeltaLakeManager, flush_rows: int = 5000):
+        self.deltalake = deltalake
+        self.flush_rows = flush_rows
+        self._buffers: Dict[str, List[Union[pd.DataFrame, pa.Table]]] = {}
+        self._lock = threading.RLock()
+
+    def buffer(self, table_name: str, df: Union[pd.DataFrame, pa.Table]) -> None:
+        """Queue rows for a table, flushing every table once one of them holds `flush_rows` rows."""
+        if len(df) == 0:
+            return
+
+        with self._lock:
+            self._buffers.setdefault(table_name, []).append(df)
+            if sum(map(len, self._buffers[table_name])) >= self.flush_rows:
+                self.flush()
+
+    def _combine(self, table_name: str, frames: List[Union[pd.DataFrame, pa.Table]]) -> Union[pd.DataFrame, pa.Table]:
+        """Concatenate the buffered frames, later writes of a key replace earlier ones."""
+        key = self.deltalake.table_schemas[table_name].key_columns
+
+        if all(isinstance(frame, pa.Table) for frame in frames):
+            combined = pa.concat_tables(frames, promote_options="default").to_pandas()
+            return pa.Table.from_pandas(
+                combined.drop_duplicates(subset=key, keep='last'), schema=frames[0].schema, preserve_index=False
+            )
+
+        combined = pd.concat(
+            [frame.to_pandas() if isinstance(frame, pa.Table) else frame for frame in frames],
+            ignore_index=True
+        )
+        return combined.drop_duplicates(subset=key, keep='last').reset_index(drop=True)
+
+    def flush(self, table_name: Optional[str] = None) -> None:
+        """Commit the buffered rows of one table, or of every table in first-write order."""
+        with self._lock:
+            table_names = [table_name] if table_name else list(self._buffers)
+            for name in table_names:
+                frames = self._buffers.pop(name, [])
+                if not frames:
+                    continue
+                combined = self._combine(name, frames)
+                logger.info(f"Table: {name} - Flushing {len(combined)} rows from {len(frames)} buffered writes")
+                try:
+                    self.deltalake.write_table(table_name=name, df=combined)
+                except Exception:
+                    # Drop the writes queued behind the failed one (e.g. status updates for data that did
+                    # not land), the affected articles stay pending and are picked up by the next run
+                    self._buffers.clear()
+                    raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, _):
+        if exc_type is None:
+            self.flush()
+            return
+
+        # Rows buffered before a failure are still valid work, persist them before propagating.
+        # A failing flush must not replace the original error, it is logged and attached to it
+        try:
+            self.flush()
+        except Exception as flush_error:
+            logger.error(f"Flush after failure failed: {flush_error}")
+            exc_value.add_note(f"DeltaWriteCoordinator flush after this error also failed: {flush_error!r}")
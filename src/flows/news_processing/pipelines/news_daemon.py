@@ -0,0 +1,164 @@
+import argparse
+import json
+import signal
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+import pyprojroot
+from more_itertools import chunked
+
+from src.core.storage.delta_lake import get_deltalake, TableNames
+from src.collect.news.news_fetcher import NewsImportEndpoint
+from src.collect.news.article_scraper import ArticleScrapeEndpoint
+from src.collect.news.utils.article_url_scraper import PowerScraper
+from src.clean.news.article_deduplicator import ArticleDedupEndpoint
+from src.clean.news.article_cleaner import ArticleCleanEndpoint
+from src.core.logging.logger import setup_logger
+
+logger = setup_logger("NewsDaemon", Path("news_daemon.log"))
+
+
+class NewsDaemon:
+    """
+    Long-running ingestion loop: polls the news API on a short interval and pushes new articles
+    through scrape, dedup and clean in micro-batches.
+
+    Endpoints, the scraper sessions and the loaded models are kept alive between polls.
+    Stops after the batch in progress on SIGINT / SIGTERM.
+
+    Full catch-up runs of every stage happen every `catch_up_every` cycles and after a failed cycle.
+    """
+
+    STAGES = ['scrape', 'dedup', 'clean']
+
+    def __init__(self, poll_interval_seconds: int = 60, batch_size: int = 50, catch_up_every: int = 30):
+        self.poll_interval_seconds = poll_interval_seconds
+        self.batch_size = batch_size
+        self.catch_up_every = catch_up_every
+        self.catch_up_requested = True
+
+        self.deltalake = get_deltalake()
+        self.stop_event = threading.Event()
+        self.metrics_path = pyprojroot.here() / Path("logs") / "news_daemon_metrics.json"
+
+        self.metrics: Dict = {
+            "cycles": 0,
+            "last_cycle_seconds": None,
+            "articles_imported": 0,
+            **{f"articles_{stage}": 0 for stage in self.STAGES},
+            # Seconds between publication and the end of each stage, for the latest batch
+            **{f"{stage}_lag_seconds": {"median": None, "max": None} for stage in self.STAGES},
+        }
+
+    def stop(self, *_) -> None:
+        """Request a graceful stop, the batch in progress is completed first."""
+        if not self.stop_event.is_set():
+            logger.info("Stop requested, finishing the current batch...")
+        self.stop_event.set()
+
+    def _install_signal_handlers(self) -> None:
+        if threading.current_thread() is not threading.main_thread():
+            return
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+    def _publication_dates(self, news_ids: List[str]) -> pd.Series:
+        metadata = self.deltalake.read_table(
+            table_name=TableNames.METADATA_ARTICLES.value,
+            filters=[("news_id", "in", news_ids)],
+            columns=['date_utc'],
+        )
+        return pd.to_datetime(metadata['date_utc'])
+
+    def _record_lag(self, stage: str, published: pd.Series, processed: int) -> None:
+        self.metrics[f"articles_{stage}"] += processed
+        if published.empty:
+            return
+        lag = (pd.Timestamp.now(tz='UTC').tz_localize(None) - published).dt.total_seconds()
+        self.metrics[f"{stage}_lag_seconds"] = {"median": round(lag.median(), 1), "max": round(lag.max(), 1)}
+
+    def _write_metrics(self) -> None:
+        self.metrics_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self.metrics_path.with_suffix('.tmp')
+        temporary_path.write_text(json.dumps(self.metrics, indent=2, default=str))
+        temporary_path.replace(self.metrics_path)
+
+    def run_cycle(self, importer, scraper, deduplicator, cleaner) -> None:
+        """Import new articles once and process everything pending in micro-batches."""
+        start_time = time.perf_counter()
+
+        import_result = importer.execute()
+        self.metrics["articles_imported"] += import_result.get("new_articles", 0)
+
+        for batch in chunked(scraper.pending_news_ids(), self.batch_size):
+            if self.stop_event.is_set():
+                break
+
+            published = self._publication_dates(batch)
+
+            scrape_result = scraper.execute(batch)
+            self._record_lag('scrape', published, scrape_result.get("articles_scraped", 0))
+
+            dedup_result = deduplicator.execute(batch)
+            self._record_lag('dedup', published, dedup_result.get("articles_checked", 0))
+
+            clean_result = cleaner.execute(batch)
+            self._record_lag('clean', published, clean_result.get("articles_cleaned", 0))
+
+        # Catch up on articles left behind by a failed batch in an earlier cycle, the full runs also
+        # move the change feed checkpoints past the articles the batches already processed
+        catch_up_due = self.catch_up_requested or self.metrics["cycles"] % self.catch_up_every == 0
+        if catch_up_due and not self.stop_event.is_set():
+            scraper.execute()
+            deduplicator.execute()
+            cleaner.execute()
+            self.catch_up_requested = False
+
+        self.metrics["cycles"] += 1
+        self.metrics["last_cycle_seconds"] = round(time.perf_counter() - start_time, 2)
+        self._write_metrics()
+        logger.info(f"Cycle completed: {self.metrics}")
+
+    def run(self) -> Dict:
+        """Poll and process until a stop is requested."""
+        self._install_signal_handlers()
+        logger.info(f"Starting news daemon, polling every {self.poll_interval_seconds}s")
+
+        with PowerScraper() as power_scraper:
+            importer = NewsImportEndpoint()
+            scraper = ArticleScrapeEndpoint(scraper=power_scraper)
+            deduplicator = ArticleDedupEndpoint()
+            cleaner = ArticleCleanEndpoint()
+
+            while not self.stop_event.is_set():
+                cycle_start = time.monotonic()
+                try:
+                    self.run_cycle(importer, scraper, deduplicator, cleaner)
+                except Exception as e:
+                    # Keep the daemon alive, pending articles are picked up by the catch-up of the next cycle
+                    logger.error(f"Error in news daemon cycle: {e}")
+                    self.catch_up_requested = True
+
+                remaining = self.poll_interval_seconds - (time.monotonic() - cycle_start)
+                self.stop_event.wait(max(remaining, 0))
+
+        logger.info("News daemon stopped")
+        return self.metrics
+
+
+def run_news_daemon(poll_interval_seconds: int = 60, batch_size: int = 50, catch_up_every: int = 30) -> Dict:
+    """Entry point for the continuous news ingestion daemon."""
+    return NewsDaemon(poll_interval_seconds, batch_size, catch_up_every).run()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Continuous micro-batch news ingestion")
+    parser.add_argument("--poll-interval", type=int, default=60, help="Seconds between news API polls")
+    parser.add_argument("--batch-size", type=int, default=50, help="Articles per scrape/clean micro-batch")
+    parser.add_argument("--catch-up-every", type=int, default=30, help="Cycles between full catch-up runs of every stage")
+    args = parser.parse_args()
+
+    run_news_daemon(args.poll_interval, args.batch_size, args.catch_up_every)
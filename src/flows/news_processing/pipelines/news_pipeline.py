@@ -1,9 +1,84 @@
-from prefect import flow
-from typing import Dict
+from prefect import flow, unmapped, allow_failure
+from typing import Dict, List, Optional
+from more_itertools import chunked
 from prefect.task_runners import ConcurrentTaskRunner
 from prefect.logging import get_run_logger
 
 from src.flows.news_processing.tasks import news_tasks
+from src.core.profiling.profiler import enable_profiling
+
+
+def _process_news_pipelined(batch_size: int, max_in_flight: int) -> Dict:
+    """
+    Push pending articles through scrape -> dedup -> clean in micro-batches of news_ids.
+
+    Batches are disjoint, so scrapes run independently and scraping batch N+1 overlaps with cleaning batch N.
+    Dedup batches run in order so earlier articles keep winning the canonical slot, a failed batch
+    does not hold back the ones after it. At most `max_in_flight` batches are scraped ahead of the clean stage.
+
+    A full scrape -> dedup -> clean pass closes the run, as the daemon's catch-up does. It retries what the
+    failed batches left pending and advances the stages' change feed checkpoints, which batches never commit.
+    """
+    logger = get_run_logger()
+
+    news_ids = news_tasks.list_pending_scrapes()
+    batches: List[List[str]] = list(chunked(news_ids, batch_size))
+    logger.info(f"Pipelining {len(news_ids)} articles in {len(batches)} batches of up to {batch_size}")
+
+    scrape_futures, dedup_futures, clean_futures = [], [], []
+    for batch in batches:
+        # Back-pressure: do not scrape further ahead than the clean stage can absorb
+        if len(clean_futures) >= max_in_flight:
+            clean_futures[-max_in_flight].wait()
+
+        scrape_futures.append(news_tasks.scrape_articles.submit(news_ids=batch))
+        dedup_futures.append(
+            news_tasks.dedup_articles.submit(
+                news_ids=batch, wait_for=scrape_futures[-1:] + [allow_failure(f) for f in dedup_futures[-1:]]
+            )
+        )
+        clean_futures.append(
+            news_tasks.clean_articles.submit(
+                news_ids=batch, wait_for=dedup_futures[-1:] + [allow_failure(f) for f in clean_futures[-1:]]
+            )
+        )
+
+    batch_futures = [allow_failure(f) for f in scrape_futures + dedup_futures + clean_futures]
+    catch_up_scrape = news_tasks.scrape_articles.submit(wait_for=batch_futures)
+    catch_up_dedup = news_tasks.dedup_articles.submit(wait_for=[allow_failure(catch_up_scrape)])
+    catch_up_clean = news_tasks.clean_articles.submit(wait_for=[allow_failure(catch_up_dedup)])
+
+    return {
+        "batches": len(batches),
+        "scrape": [future.result(raise_on_failure=False) for future in scrape_futures],
+        "dedup": [future.result(raise_on_failure=False) for future in dedup_futures],
+        "clean": [future.result(raise_on_failure=False) for future in clean_futures],
+        "catch_up": {
+            "scrape": catch_up_scrape.result(raise_on_failure=False),
+            "dedup": catch_up_dedup.result(raise_on_failure=False),
+            "clean": catch_up_clean.result(raise_on_failure=False),
+        },
+    }
+
+
+def _process_news_sharded(num_shards: int) -> Dict:
+    """
+    Scrape and clean with `num_shards` workers, each on the disjoint slice hash(news_id) % num_shards.
+
+    Scrape shards are network bound and run as concurrent tasks, clean shards run in worker processes.
+    Dedup stays a single task between them so canonical articles are chosen across all shards.
+    """
+    scrape_futures = news_tasks.scrape_articles.map(
+        shard_index=list(range(num_shards)), num_shards=unmapped(num_shards)
+    )
+    dedup_result = news_tasks.dedup_articles(wait_for=scrape_futures)
+    clean_results = news_tasks.clean_articles_sharded(num_shards, wait_for=[dedup_result])
+
+    return {
+        "scrape": [future.result(raise_on_failure=False) for future in scrape_futures],
+        "dedup": dedup_result,
+        "clean": clean_results,
+    }
 
 
 @flow(
@@ -11,24 +86,58 @@ from src.flows.news_processing.tasks import news_tasks
     task_runner=ConcurrentTaskRunner(),
     description="Process crypto news from import to LLM analysis",
 )
-def process_news(environment: str) -> Dict:
-    """Main flow for complete news processing pipeline"""
+def process_news(
+    environment: str,
+    pipelined: bool = False,
+    batch_size: int = 100,
+    max_in_flight: int = 2,
+    num_shards: int = 1,
+    profile: Optional[str] = None,
+    profile_mode: str = "sample",
+    profile_memory: bool = False,
+    analyze: bool = False,
+) -> Dict:
+    """
+    Main flow for complete news processing pipeline
+
+    With `analyze`, the articles cleaned since the last analysis are sent to the LLM at the end of the run.
+
+    `profile` lists the stages to profile ("import,scrape,clean" or "all"), profiles are written under logs/profiles.
+    `profile_memory` adds the tracemalloc allocation hotspots, at the cost of slowing every allocation down.
+    """
 
     logger = get_run_logger()
 
     logger.info(f"Processing news in the {environment.upper()} environment.")
 
+    if profile:
+        enable_profiling(profile, profile_mode, profile_memory)
+        logger.info(f"Profiling stages '{profile}' with the {profile_mode} profiler")
+
     try:
         import_result = news_tasks.import_news()
-        scrape_result = news_tasks.scrape_articles(wait_for=[import_result])
-        clean_result = news_tasks.clean_articles(wait_for=[scrape_result])
-        
-        return {
-            "import": import_result,
-            "scrape": scrape_result,
-            "clean": clean_result,
-        }
-    except:
+
+        if pipelined:
+            result = {"import": import_result, **_process_news_pipelined(batch_size, max_in_flight)}
+        elif num_shards > 1:
+            result = {"import": import_result, **_process_news_sharded(num_shards)}
+        else:
+            scrape_result = news_tasks.scrape_articles(wait_for=[import_result])
+            dedup_result = news_tasks.dedup_articles(wait_for=[scrape_result])
+            clean_result = news_tasks.clean_articles(wait_for=[dedup_result])
+
+            result = {
+                "import": import_result,
+                "scrape": scrape_result,
+                "dedup": dedup_result,
+                "clean": clean_result,
+            }
+
+        if analyze:
+            result["analyze"] = news_tasks.analyze_articles()
+
+        return result
+    except Exception as e:
         logger.error(f"Error in news processing: {str(e)}")
         return {
             "status": "error",
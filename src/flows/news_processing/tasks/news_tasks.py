@@ -1,10 +1,14 @@
 from prefect import task
 from prefect.logging import get_run_logger
-from typing import Dict
+from typing import Dict, List, Optional
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 from src.collect.news.news_fetcher import NewsImportEndpoint
 from src.collect.news.article_scraper import ArticleScrapeEndpoint
-from src.clean.news.article_cleaner import ArticleCleanEndpoint
+from src.clean.news.article_deduplicator import ArticleDedupEndpoint
+from src.clean.news.article_cleaner import ArticleCleanEndpoint, run_article_cleaning
+from src.core.storage.sharding import ShardSpec
 
 
 # +
@@ -21,28 +25,80 @@ def import_news() -> Dict:
         logger.error(f"Error importing news: {str(e)}")
         raise
 
+@task(name="list_pending_scrapes")
+def list_pending_scrapes() -> List[str]:
+    """Task to list the news_ids waiting to be scraped"""
+    return ArticleScrapeEndpoint().pending_news_ids()
+
 @task(name="scrape_articles", retries=2, retry_delay_seconds=30)
-def scrape_articles() -> Dict:
+def scrape_articles(news_ids: Optional[List[str]] = None, shard_index: int = 0, num_shards: int = 1) -> Dict:
     """Task to scrape article content"""
     logger = get_run_logger()
     try:
-        logger.info("Calling ArticleScrapeEndpoint...")
-        result = ArticleScrapeEndpoint().execute()
+        shard = ShardSpec(shard_index, num_shards)
+        logger.info(f"Calling ArticleScrapeEndpoint for shard {shard}...")
+        result = ArticleScrapeEndpoint(shard=shard).execute(news_ids)
         logger.info(f"Scraping completed: {result}")
         return result
     except Exception as e:
         logger.error(f"Error scraping articles: {str(e)}")
         raise
 
+@task(name="dedup_articles", retries=2, retry_delay_seconds=30)
+def dedup_articles(news_ids: Optional[List[str]] = None) -> Dict:
+    """Task to link near-duplicate articles to their canonical article"""
+    logger = get_run_logger()
+    try:
+        logger.info("Calling ArticleDedupEndpoint...")
+        result = ArticleDedupEndpoint().execute(news_ids)
+        logger.info(f"Deduplication completed: {result}")
+        return result
+    except Exception as e:
+        logger.error(f"Error deduplicating articles: {str(e)}")
+        raise
+
 @task(name="clean_articles", retries=2, retry_delay_seconds=30)
-def clean_articles() -> Dict:
+def clean_articles(news_ids: Optional[List[str]] = None) -> Dict:
     """Task to clean article text"""
     logger = get_run_logger()
     try:
         logger.info("Calling ArticleCleanEndpoint...")
-        result = ArticleCleanEndpoint().execute()
+        result = ArticleCleanEndpoint().execute(news_ids)
         logger.info(f"Cleaning completed: {result}")
         return result
     except Exception as e:
         logger.error(f"Error cleaning articles: {str(e)}")
         raise
+
+@task(name="clean_articles_sharded", retries=2, retry_delay_seconds=30)
+def clean_articles_sharded(num_shards: int) -> List[Dict]:
+    """Task to clean article text in parallel worker processes, one disjoint shard each"""
+    logger = get_run_logger()
+    try:
+        logger.info(f"Calling ArticleCleanEndpoint on {num_shards} shards...")
+        shards = [ShardSpec(index, num_shards) for index in range(num_shards)]
+        # Cleaning is CPU bound, separate processes sidestep the GIL that limits task threads.
+        # Workers are spawned, the delta-rs runtime and the logging listener threads do not survive a fork
+        with ProcessPoolExecutor(max_workers=num_shards, mp_context=multiprocessing.get_context("spawn")) as executor:
+            results = list(executor.map(run_article_cleaning, [None] * num_shards, shards))
+        logger.info(f"Cleaning completed: {results}")
+        return results
+    except Exception as e:
+        logger.error(f"Error cleaning articles: {str(e)}")
+        raise
+
+@task(name="analyze_articles", retries=2, retry_delay_seconds=30)
+def analyze_articles(news_ids: Optional[List[str]] = None) -> Dict:
+    """Task to analyze cleaned articles with the LLM"""
+    # The LLM client is only needed by runs that analyze
+    from src.model.llm_processor import ArticleAnalysisEndpoint
+
+    logger = get_run_logger()
+    try:
+        logger.info("Calling ArticleAnalysisEndpoint...")
+        result = ArticleAnalysisEndpoint().execute(news_ids)
+        logger.info(f"Analysis completed: {result}")
+        return result
+    except Exception as e:
+        logger.error(f"Error analyzing articles: {str(e)}")
+        raise
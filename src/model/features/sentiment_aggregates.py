@@ -0,0 +1,240 @@
+from typing import Dict, List, Optional
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from src.core.storage.delta_lake import get_deltalake, TableNames
+from src.model.schema import dataclasses as ds
+from src.core.logging.logger import setup_logger
+from src.core.metrics.metrics import instrumented_endpoint
+
+logger = setup_logger("SentimentAggregateEndpoint", Path("features.log"))
+
+
+class SentimentAggregateEndpoint:
+    """
+    Endpoint for maintaining hourly and daily sentiment aggregates from newly analyzed articles.
+
+    Buckets hold mergeable partial states (count, sum and sum of squares per score, event counts), so
+    any range or rolling window is the sum of its buckets. Every article's contribution is kept to
+    re-bucket late or re-analyzed articles without rescanning llm_data.
+    """
+
+    SCORE_COLUMNS = ['positive', 'negative', 'neutral', 'fud_score', 'impact_magnitude', 'emotion_intensity']
+    # net_sentiment = positive - negative, impact_weighted_sentiment = impact_magnitude * net_sentiment
+    METRICS = [*SCORE_COLUMNS, 'net_sentiment', 'impact_weighted_sentiment']
+    EVENT_COLUMNS = {category.value: f"event_{category.value.lower()}_count" for category in ds.EventCategory}
+    GRANULARITIES = {"1h": "h", "1d": "D"}
+
+    def __init__(self):
+        self.deltalake = get_deltalake()
+        self.state_columns = [
+            'article_count',
+            *(f"{metric}_sum" for metric in self.METRICS),
+            *(f"{metric}_sumsq" for metric in self.METRICS),
+            *self.EVENT_COLUMNS.values(),
+        ]
+
+    def _get_watermark(self) -> Optional[pd.Timestamp]:
+        """Newest analysis already aggregated, from the state row or once from the contributions."""
+        state = self.deltalake.read_table(
+            TableNames.SENTIMENT_WATERMARK.value,
+            filters=[('source_table', '=', TableNames.LLM_ARTICLES.value)],
+            columns=['analyzed_at_utc'],
+        )
+        if not state.empty:
+            return state['analyzed_at_utc'].iloc[0]
+
+        # Aggregates built before the state row existed
+        contributions = self.deltalake.read_table(
+            TableNames.SENTIMENT_CONTRIBUTIONS.value, columns=['analyzed_at_utc']
+        )
+        return contributions['analyzed_at_utc'].max() if not contributions.empty else None
+
+    def _get_new_analyses(self) -> pd.DataFrame:
+        """llm_data rows analyzed after the newest contribution already aggregated."""
+        watermark = self._get_watermark()
+
+        return self.deltalake.read_table(
+            TableNames.LLM_ARTICLES.value,
+            filters=[('analyzed_at_utc', '>', watermark.to_pydatetime())] if watermark is not None else None,
+            columns=['news_id', 'date_utc', 'year_utc', 'month_utc', 'analyzed_at_utc', 'event_category', *self.SCORE_COLUMNS],
+        )
+
+    def _to_contributions(self, analyses: pd.DataFrame) -> pd.DataFrame:
+        """Per article bucket and values, one row per article."""
+        contributions = analyses.drop(columns='event_category').copy()
+        contributions['bucket_hour'] = contributions['date_utc'].dt.floor('h').astype('datetime64[ns]')
+        contributions['net_sentiment'] = contributions['positive'] - contributions['negative']
+        contributions['impact_weighted_sentiment'] = contributions['impact_magnitude'] * contributions['net_sentiment']
+
+        events = analyses[['news_id', 'event_category']].explode('event_category')
+        flags = (
+            pd.crosstab(events['news_id'], events['event_category'])
+            .clip(upper=1)
+            .reindex(columns=list(self.EVENT_COLUMNS), fill_value=0)
+            .rename(columns=self.EVENT_COLUMNS)
+        )
+        return contributions.merge(flags, left_on='news_id', right_index=True, how='left').fillna(
+            {column: 0 for column in self.EVENT_COLUMNS.values()}
+        )
+
+    def _bucket_states(self, contributions: pd.DataFrame, buckets: pd.Series) -> pd.DataFrame:
+        """Partial states of the contributions grouped by bucket."""
+        values = contributions[self.METRICS].to_numpy(float)
+        frame = pd.concat([
+            pd.DataFrame({'article_count': np.ones(len(contributions), dtype='int64')}, index=contributions.index),
+            pd.DataFrame(values, columns=[f"{metric}_sum" for metric in self.METRICS], index=contributions.index),
+            pd.DataFrame(values ** 2, columns=[f"{metric}_sumsq" for metric in self.METRICS], index=contributions.index),
+            contributions[list(self.EVENT_COLUMNS.values())].astype('int64'),
+        ], axis=1)
+        return frame.groupby(buckets.to_numpy()).sum()
+
+    def _recompute_hours(self, hours: pd.DatetimeIndex, contributions: pd.DataFrame) -> pd.DataFrame:
+        """Hourly states of the affected hours from their stored contributions, with the new ones replacing old versions."""
+        # Only the partitions and hours affected are read, a late article does not pull in the months in between
+        stored = self.deltalake.read_table(
+            TableNames.SENTIMENT_CONTRIBUTIONS.value,
+            filters=[
+                ('year_utc', 'in', sorted(hours.year.unique().tolist())),
+                ('month_utc', 'in', sorted(hours.month.unique().tolist())),
+                ('bucket_hour', 'in', hours.to_pydatetime().tolist()),
+            ],
+        )
+        if not stored.empty:
+            stored['bucket_hour'] = stored['bucket_hour'].astype('datetime64[ns]')
+            stored = stored[stored['bucket_hour'].isin(hours) & ~stored['news_id'].isin(contributions['news_id'])]
+
+        combined = pd.concat([stored, contributions], ignore_index=True)
+        # Hours left without any article are written as empty states rather than kept stale
+        return self._bucket_states(combined, combined['bucket_hour']).reindex(hours, fill_value=0)
+
+    def _recompute_days(self, hourly: pd.DataFrame) -> pd.DataFrame:
+        """Daily states of the days touched by the recomputed hours, merged from their hourly states."""
+        days = hourly.index.floor('D').unique()
+        day_hours = pd.DatetimeIndex([hour for day in days for hour in pd.date_range(day, periods=24, freq='h')])
+        stored = self.deltalake.read_table(
+            TableNames.SENTIMENT_AGGREGATES.value,
+            filters=[
+                ('granularity', '=', '1h'),
+                ('year', 'in', sorted(days.year.unique().tolist())),
+                ('bucket_start', 'in', day_hours.to_pydatetime().tolist()),
+            ],
+            columns=['bucket_start', *self.state_columns],
+        )
+        merged = hourly
+        if not stored.empty:
+            stored = stored.set_index('bucket_start')
+            stored.index = stored.index.astype('datetime64[ns]')
+            stored = stored[~stored.index.isin(hourly.index) & stored.index.floor('D').isin(days)]
+            merged = pd.concat([stored, hourly])
+
+        return merged.groupby(merged.index.floor('D')).sum().reindex(days, fill_value=0)
+
+    def _to_rows(self, states: pd.DataFrame, granularity: str) -> pd.DataFrame:
+        count_columns = ['article_count', *self.EVENT_COLUMNS.values()]
+        rows = states.astype({column: 'int64' for column in count_columns}).rename_axis('bucket_start').reset_index()
+        rows['bucket_start'] = rows['bucket_start'].astype('datetime64[us]')
+        rows.insert(0, 'granularity', granularity)
+        rows['year'] = rows['bucket_start'].dt.year.astype('int32')
+        return rows
+
+    @instrumented_endpoint("sentiment_aggregates")
+    def execute(self) -> Dict:
+        """Execute the aggregate update for the articles analyzed since the last run."""
+        try:
+            analyses = self._get_new_analyses()
+            if analyses.empty:
+                logger.info("No newly analyzed articles to aggregate")
+                return {"articles_aggregated": 0}
+
+            contributions = self._to_contributions(analyses)
+            previous = self.deltalake.read_table(
+                TableNames.SENTIMENT_CONTRIBUTIONS.value,
+                filters=[('news_id', 'in', contributions['news_id'].tolist())],
+                columns=['bucket_hour'],
+            )
+            # Re-analyzed articles may have moved, their former hours are recomputed as well
+            hours = pd.DatetimeIndex(
+                pd.concat([contributions['bucket_hour'], previous['bucket_hour'].astype('datetime64[ns]')]).unique()
+            ).sort_values()
+
+            hourly = self._recompute_hours(hours, contributions)
+            daily = self._recompute_days(hourly)
+
+            # Aggregates are recomputed from the contributions, writing these last keeps a failed run repeatable
+            self.deltalake.write_table(
+                TableNames.SENTIMENT_AGGREGATES.value,
+                pd.concat([self._to_rows(hourly, '1h'), self._to_rows(daily, '1d')], ignore_index=True),
+            )
+            self.deltalake.write_table(TableNames.SENTIMENT_CONTRIBUTIONS.value, contributions)
+            self.deltalake.write_table(TableNames.SENTIMENT_WATERMARK.value, pd.DataFrame({
+                'source_table': [TableNames.LLM_ARTICLES.value],
+                'analyzed_at_utc': [contributions['analyzed_at_utc'].max()],
+            }))
+
+            result = {
+                "articles_aggregated": len(contributions),
+                "hours_updated": len(hourly),
+                "days_updated": len(daily),
+            }
+            logger.info(f"Sentiment aggregate update completed: {result}")
+            return result
+
+        except Exception as e:
+            logger.error(f"Error in sentiment aggregate update: {e}")
+            raise
+
+    def read_aggregates(
+        self,
+        granularity: str = "1h",
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None,
+        window: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Per bucket article counts, score means and standard deviations, impact weighted sentiment and
+        event counts. With `window`, every bucket covers the trailing `window` buckets.
+        """
+        if granularity not in self.GRANULARITIES:
+            raise ValueError(f"Unknown granularity '{granularity}', expected one of {list(self.GRANULARITIES)}")
+
+        lookback = pd.Timedelta(1, self.GRANULARITIES[granularity]) * ((window or 1) - 1)
+        filters = [('granularity', '=', granularity)]
+        if start is not None:
+            filters.append(('bucket_start', '>=', (pd.Timestamp(start) - lookback).to_pydatetime()))
+        if end is not None:
+            filters.append(('bucket_start', '<', pd.Timestamp(end).to_pydatetime()))
+
+        states = self.deltalake.read_table(
+            TableNames.SENTIMENT_AGGREGATES.value, filters=filters, columns=['bucket_start', *self.state_columns]
+        )
+        if states.empty:
+            return states
+
+        states = states.set_index('bucket_start').sort_index()
+        if window:
+            frequency = self.GRANULARITIES[granularity]
+            states = states.reindex(pd.date_range(states.index.min(), states.index.max(), freq=frequency), fill_value=0)
+            states = states.rolling(window, min_periods=1).sum()
+            if start is not None:
+                states = states[states.index >= pd.Timestamp(start)]
+
+        count = states['article_count'].replace(0, np.nan)
+        aggregates = pd.DataFrame({'article_count': states['article_count']}, index=states.index)
+        for metric in self.METRICS:
+            mean = states[f"{metric}_sum"] / count
+            aggregates[f"{metric}_mean"] = mean
+            aggregates[f"{metric}_std"] = np.sqrt((states[f"{metric}_sumsq"] / count - mean ** 2).clip(lower=0))
+        aggregates['impact_weighted_sentiment'] = (
+            states['impact_weighted_sentiment_sum'] / states['impact_magnitude_sum'].replace(0, np.nan)
+        )
+        aggregates[list(self.EVENT_COLUMNS.values())] = states[list(self.EVENT_COLUMNS.values())]
+
+        return aggregates.rename_axis('bucket_start')
+
+
+def run_sentiment_aggregation() -> Dict:
+    """Entry point for the sentiment aggregate update"""
+    endpoint = SentimentAggregateEndpoint()
+    return endpoint.execute()
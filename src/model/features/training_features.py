@@ -0,0 +1,176 @@
+from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from src.core.storage.delta_lake import get_deltalake, TableNames
+from src.collect.technical.price_importer import GetCryptoPrices
+from src.clean.technical.utils import indicators
+from src.model.schema import dataclasses as ds
+from src.core.logging.logger import setup_logger
+from src.core.metrics.metrics import instrumented_endpoint
+
+logger = setup_logger("TrainingFeatureEndpoint", Path("features.log"))
+
+
+class TrainingFeatureEndpoint:
+    """Endpoint for joining analyzed articles to the price moves and indicators around their publication."""
+
+    TARGET_TICKER = "BTC-USD"
+    FORWARD_HOURS = [1, 4, 24]
+    FORWARD_DAYS = [1, 3, 7]
+    # Daily indicators older than this at publication time are left empty instead of joined
+    INDICATOR_TOLERANCE = pd.Timedelta(days=3)
+
+    ARTICLE_COLUMNS = [
+        'news_id', 'date_utc', 'year_utc', 'month_utc',
+        'emotion_category', 'timeframe_category', 'price_direction_category',
+        *ds.ContinuousFeatures.model_fields,
+    ]
+
+    def __init__(self):
+        self.deltalake = get_deltalake()
+        self.prices = GetCryptoPrices(self.deltalake)
+        self.feature_columns = [
+            *(f"fwd_return_{hours}h" for hours in self.FORWARD_HOURS),
+            *(f"fwd_return_{days}d" for days in self.FORWARD_DAYS),
+            *indicators.INDICATOR_COLUMNS,
+        ]
+
+    def _get_months(self, since: Optional[pd.Timestamp]) -> List[Tuple[int, int]]:
+        """Month partitions of the analyzed articles, from `since` on when given."""
+        filters = [('year_utc', '>=', since.year)] if since is not None else None
+        months = self.deltalake.read_table(
+            TableNames.LLM_ARTICLES.value, filters=filters, columns=['year_utc', 'month_utc']
+        ).drop_duplicates()
+
+        months = sorted(zip(months['year_utc'].astype(int), months['month_utc'].astype(int)))
+        if since is not None:
+            months = [month for month in months if month >= (since.year, since.month)]
+        return months
+
+    @staticmethod
+    def _forward_returns(
+        event_times: np.ndarray, bars: pd.DataFrame, bar_length: pd.Timedelta, horizons: List[int], unit: str
+    ) -> Dict[str, np.ndarray]:
+        """
+        Return from the open of the first bar starting at or after each event to the close of the bar
+        ending `horizon` later. Events without an entry bar or whose exit bar is missing get NaN.
+        """
+        timestamps = bars['timestamp'].to_numpy('datetime64[ns]')
+        opens, closes = bars['open'].to_numpy(float), bars['close'].to_numpy(float)
+
+        entry = np.searchsorted(timestamps, event_times, side='left')
+        has_entry = entry < len(timestamps)
+        entry = np.minimum(entry, len(timestamps) - 1)
+        has_entry &= (timestamps[entry] - event_times) < bar_length.to_timedelta64()
+        entry_price = np.where(has_entry, opens[entry], np.nan)
+
+        returns = {}
+        for horizon in horizons:
+            exit_time = timestamps[entry] + (pd.Timedelta(horizon, unit) - bar_length).to_timedelta64()
+            exit_ = np.searchsorted(timestamps, exit_time, side='right') - 1
+            has_exit = has_entry & (exit_ >= 0) & (timestamps[np.maximum(exit_, 0)] == exit_time)
+            returns[f"fwd_return_{horizon}{unit}"] = np.where(
+                has_exit, closes[np.maximum(exit_, 0)] / entry_price - 1, np.nan
+            )
+        return returns
+
+    def _build_month(self, year: int, month: int) -> pd.DataFrame:
+        """Training rows of the articles published in one month, reading only the bars that month needs."""
+        articles = self.deltalake.read_table(
+            TableNames.LLM_ARTICLES.value,
+            filters=[('year_utc', '=', year), ('month_utc', '=', month)],
+            columns=self.ARTICLE_COLUMNS,
+        )
+        if articles.empty:
+            return articles
+
+        articles['date_utc'] = articles['date_utc'].astype('datetime64[ns]')
+        articles = articles.sort_values('date_utc', ignore_index=True)
+        month_start = pd.Timestamp(year=year, month=month, day=1)
+        month_end = month_start + pd.offsets.MonthBegin(1)
+        event_times = articles['date_utc'].to_numpy('datetime64[ns]')
+
+        hourly = self.prices.fetch_intraday_prices(
+            self.TARGET_TICKER, start=month_start, end=month_end + pd.Timedelta(hours=max(self.FORWARD_HOURS) + 1),
+            interval="1h", layout="long",
+        )
+        if not hourly.empty:
+            articles = articles.assign(**self._forward_returns(
+                event_times, hourly, pd.Timedelta(hours=1), self.FORWARD_HOURS, "h"
+            ))
+
+        daily = self.prices.fetch_crypto_prices(
+            self.TARGET_TICKER, start=month_start, end=month_end + pd.Timedelta(days=max(self.FORWARD_DAYS) + 1),
+            layout="long",
+        )
+        if not daily.empty:
+            articles = articles.assign(**self._forward_returns(
+                event_times, daily, pd.Timedelta(days=1), self.FORWARD_DAYS, "d"
+            ))
+
+        indicators_start = month_start - self.INDICATOR_TOLERANCE - pd.Timedelta(days=1)
+        trailing = self.deltalake.read_table(
+            TableNames.CRYPTO_INDICATORS.value,
+            filters=[
+                ('ticker', '=', self.TARGET_TICKER),
+                ('year', '>=', indicators_start.year),
+                ('year', '<=', year),
+                ('timestamp', '>=', indicators_start.to_pydatetime()),
+                ('timestamp', '<', month_end.to_pydatetime()),
+            ],
+            columns=['timestamp', *indicators.INDICATOR_COLUMNS],
+        )
+        if not trailing.empty:
+            # A daily bar and its indicators are only known once the day has closed
+            trailing['indicator_available_at'] = trailing.pop('timestamp').astype('datetime64[ns]') + pd.Timedelta(days=1)
+            articles = pd.merge_asof(
+                articles,
+                trailing.sort_values('indicator_available_at'),
+                left_on='date_utc',
+                right_on='indicator_available_at',
+                direction='backward',
+                tolerance=self.INDICATOR_TOLERANCE,
+            )
+
+        # Months without bars or indicators keep the same schema as the others
+        for column in self.feature_columns:
+            if column not in articles:
+                articles[column] = np.nan
+        if 'indicator_available_at' not in articles:
+            articles['indicator_available_at'] = pd.NaT
+
+        return articles
+
+    @instrumented_endpoint("features")
+    def execute(self, since: Optional[pd.Timestamp] = None) -> Dict:
+        """Execute the feature build one month partition at a time, from `since` on or for every month."""
+        try:
+            months = self._get_months(pd.Timestamp(since) if since is not None else None)
+            if not months:
+                logger.info("No analyzed articles to build features for")
+                return {"months_processed": 0, "rows_written": 0}
+
+            rows_written = 0
+            for year, month in months:
+                features = self._build_month(year, month)
+                if features.empty:
+                    continue
+                self.deltalake.write_table(TableNames.TRAINING_FEATURES.value, features)
+                rows_written += len(features)
+                logger.info(f"Built {len(features)} training rows for {year}-{month:02d}")
+
+            result = {"months_processed": len(months), "rows_written": rows_written}
+            logger.info(f"Feature build completed: {result}")
+            return result
+
+        except Exception as e:
+            logger.error(f"Error in feature build: {e}")
+            raise
+
+
+def run_feature_build(since: Optional[pd.Timestamp] = None) -> Dict:
+    """Entry point for the training feature build"""
+    endpoint = TrainingFeatureEndpoint()
+    return endpoint.execute(since)
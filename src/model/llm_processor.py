@@ -1,21 +1,195 @@
-from transformers import GPT2TokenizerFast
-from clean import clean_news_data
+from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+import pandas as pd
 
-from src.core.storage.delta_lake import DeltaLakeManager, TableNames
+from src.core.config import settings
+from src.core.storage.delta_lake import get_deltalake, TableNames, article_status
+from src.core.storage.change_feed import ChangeFeedConsumer
 from src.model.utils.llm_client import LLMClient
 from src.model.utils.message_creator import BatchMessageCreator
+from src.core.logging.logger import setup_logger
+from src.core.metrics.metrics import metrics, instrumented_endpoint
 
-for _, article in clean_news_data.news_data.iterrows():
-    break
+logger = setup_logger("ArticleAnalysisEndpoint", Path("llm_processing.log"))
 
-message = utils_message.BatchMessageCreator.create_single_article_messages(article)
 
-print(message[-1]['content'])
+class ArticleAnalysisEndpoint:
+    """
+    Endpoint for analyzing cleaned articles with the LLM.
 
-llm_client = utils_call_llm.LLMClient()
+    Without news_ids the articles cleaned since the last full run are read from the change feed.
+    Articles whose request fails or whose response is malformed are recorded in the retry table,
+    full runs send them again next to the feed's changes until they reach `max_attempts`.
+    """
 
-llm_client.send_message_to_gpt(message)
+    ARTICLE_COLUMNS = ['news_id', 'title_text', 'llm_ready_text', 'date_utc', 'year_utc', 'month_utc', 'day_utc']
 
+    RETRY_COLUMNS = ['news_id', 'year_utc', 'month_utc', 'day_utc']
 
+    def __init__(self, max_attempts: int = settings.LLM_PARAMS['max_attempts']):
+        self.deltalake = get_deltalake()
+        self.feed = ChangeFeedConsumer("llm", TableNames.CLEANED_ARTICLES.value, self.deltalake)
+        self.client = LLMClient()
+        self.max_attempts = max_attempts
 
+    def _get_pending_articles(self, news_ids: Optional[List[str]] = None) -> List[str]:
+        """Get cleaned articles pending analysis from status table."""
+        filters = [
+            (TableNames.CLEANED_ARTICLES.value, "=", True),
+            (TableNames.LLM_ARTICLES.value, "=", False),
+        ]
+        if news_ids is not None:
+            filters.append(("news_id", "in", news_ids))
 
+        status_table = self.deltalake.read_table(
+            table_name=TableNames.STATUS_ARTICLES.value,
+            filters=filters,
+            columns=['news_id'],
+        )
+        return status_table['news_id'].tolist()
+
+    def _read_partitions(self, news_ids: List[str]) -> pd.DataFrame:
+        """Keys and partitions of cleaned articles, looked up by news_id."""
+        return self.deltalake.read_table(
+            TableNames.CLEANED_ARTICLES.value,
+            filters=[("news_id", "in", news_ids)],
+            columns=['news_id', 'year_utc', 'month_utc', 'day_utc'],
+        ) if news_ids else pd.DataFrame()
+
+    def _get_new_articles(self) -> Optional[pd.DataFrame]:
+        """
+        Cleaned rows changed since the last full run that are not analyzed yet, None without a feed checkpoint.
+
+        Articles that failed in earlier runs are no longer in the feed, they are added from the retry table.
+        """
+        changes = self.feed.read_changes()
+        if changes is None:
+            return None
+
+        retries = self._get_retries()
+        if not retries.empty:
+            logger.info(f"Retrying {len(retries)} articles that failed in earlier runs")
+            changes = pd.concat([changes, retries[self.RETRY_COLUMNS]], ignore_index=True)
+        if changes.empty:
+            return changes
+
+        changes = changes.drop_duplicates('news_id')
+        analyzed = self.deltalake.read_matching(TableNames.LLM_ARTICLES.value, changes, columns=['news_id'])
+        return changes[~changes['news_id'].isin(analyzed['news_id'])].reset_index(drop=True)
+
+    def _get_retries(self) -> pd.DataFrame:
+        """Failed articles still below the attempt limit, with their attempt counts."""
+        return self.deltalake.read_table(
+            TableNames.LLM_RETRIES.value,
+            filters=[('pending', '=', True), ('attempts', '<', self.max_attempts)],
+            columns=[*self.RETRY_COLUMNS, 'attempts'],
+        )
+
+    def _record_attempts(self, articles: pd.DataFrame, analyzed_ids: List[str]) -> None:
+        """Count an attempt for every failed article and close the retries of the analyzed ones."""
+        retries = self.deltalake.read_matching(
+            TableNames.LLM_RETRIES.value, articles, columns=['news_id', 'attempts']
+        )
+        failed = articles.loc[~articles['news_id'].isin(analyzed_ids), self.RETRY_COLUMNS]
+        recovered = articles.loc[
+            articles['news_id'].isin(analyzed_ids) & articles['news_id'].isin(retries['news_id']), self.RETRY_COLUMNS
+        ]
+        if failed.empty and recovered.empty:
+            return
+
+        previous = retries.set_index('news_id')['attempts']
+        failed = failed.assign(
+            attempts=failed['news_id'].map(previous).fillna(0).astype('int64') + 1, pending=True
+        )
+        recovered = recovered.assign(attempts=recovered['news_id'].map(previous).astype('int64'), pending=False)
+        given_up = failed.loc[failed['attempts'] >= self.max_attempts, 'news_id'].tolist()
+        if given_up:
+            logger.warning(f"Giving up on {len(given_up)} articles after {self.max_attempts} attempts: {given_up}")
+
+        self.deltalake.write_table(TableNames.LLM_RETRIES.value, pd.concat([failed, recovered], ignore_index=True))
+
+    def _fetch_articles(self, rows: pd.DataFrame) -> pd.DataFrame:
+        """Prompt fields and partitions of the articles, looked up in their partitions only."""
+        cleaned = self.deltalake.read_matching(
+            TableNames.CLEANED_ARTICLES.value, rows,
+            columns=['news_id', 'llm_ready_text', 'date_utc', 'year_utc', 'month_utc', 'day_utc'],
+        )
+        titles = self.deltalake.read_matching(TableNames.METADATA_ARTICLES.value, rows, columns=['news_id', 'title_text'])
+        return cleaned.merge(titles, on='news_id', how='left')[self.ARTICLE_COLUMNS]
+
+    def _analyze(self, articles: pd.DataFrame) -> Tuple[List[Dict], int]:
+        """Send every article to the LLM, failed requests are logged and left out."""
+        responses, failed = [], 0
+        for article in articles.to_dict('records'):
+            try:
+                messages = BatchMessageCreator.create_single_article_messages(article)
+                responses.append(self.client.send_message_to_gpt(messages))
+            except Exception as e:
+                failed += 1
+                metrics.increment("llm_failed_articles_total")
+                logger.warning(f"Analysis failed for article {article['news_id']}: {e}")
+        return responses, failed
+
+    def _persist_results(self, analyses, news_ids: List[str]) -> None:
+        """Persist the analyses and mark their articles as analyzed."""
+        try:
+            # Analyses are committed before the status update that points at them
+            self.deltalake.write_table(TableNames.LLM_ARTICLES.value, analyses)
+            self.deltalake.write_table(
+                TableNames.STATUS_ARTICLES.value, article_status(news_ids, TableNames.LLM_ARTICLES)
+            )
+            logger.info(f"Successfully persisted {len(news_ids)} analyzed articles")
+
+        except Exception as e:
+            logger.error(f"Error persisting results: {e}")
+            raise
+
+    @instrumented_endpoint("llm")
+    def execute(self, news_ids: Optional[List[str]] = None) -> Dict:
+        """Execute the article analysis, optionally for a batch of news_ids only."""
+        try:
+            # Pending articles, from the status table for batches or when the feed has no checkpoint yet
+            changes = self._get_new_articles() if news_ids is None else None
+            if changes is None:
+                changes = self._read_partitions(self._get_pending_articles(news_ids))
+
+            if changes.empty:
+                if news_ids is None:
+                    self.feed.commit()
+                return {
+                    "status": "success",
+                    "articles_analyzed": 0,
+                    "message": "No pending articles to analyze"
+                }
+
+            articles = self._fetch_articles(changes)
+            responses, failed = self._analyze(articles)
+
+            parsed = BatchMessageCreator.parse_batch_response(responses, article_metadata=articles)
+            analyzed_ids = parsed.table['news_id'].to_pylist()
+            if analyzed_ids:
+                self._persist_results(parsed.table, analyzed_ids)
+            self._record_attempts(articles, analyzed_ids)
+
+            if news_ids is None:
+                self.feed.commit()
+
+            return {
+                "status": "success",
+                "articles_analyzed": len(analyzed_ids),
+                "failed_requests": failed,
+                "malformed_responses": len(parsed.malformed),
+            }
+
+        except Exception as e:
+            logger.error(f"Error in article analysis process: {e}")
+            raise
+
+
+def run_article_analysis(news_ids: Optional[List[str]] = None) -> Dict:
+    """Entry point for the article analysis endpoint."""
+    return ArticleAnalysisEndpoint().execute(news_ids)
+
+
+if __name__ == "__main__":
+    run_article_analysis()
@@ -43,7 +43,7 @@ class TimeFrame(Enum):
 
 class CategoricalFeatures(BaseModel):
     emotion_category: EmotionCategory = Field(description="The dominant emotional tone in the article")
-    event_category: List[EventCategory] = Field(sdescription="Categories of events discussed")
+    event_category: List[EventCategory] = Field(description="Categories of events discussed")
     timeframe_category: TimeFrame = Field(description="Expected timeframe for impact")
     price_direction_category: PriceDirection = Field(description="Expected direction of price movement")
 
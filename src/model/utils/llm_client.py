@@ -5,11 +5,11 @@ from typing import List
 
 from dotenv import load_dotenv
 import openai
-from config import parameters
 # -
 
-from src.core.schemas import data_structures as ds
+from src.model.schema import dataclasses as ds
 from src.core.config import settings
+from src.core.metrics.metrics import metrics
 
 # # Setup
 
@@ -28,19 +28,24 @@ class LLMClient:
     def __init__(self):
 
         self.client = openai.OpenAI(api_key=API_KEY, project=PROJECT_ID)
-        self.config = parameters.LLM_PARAMS
+        self.config = settings.LLM_PARAMS
 
     def send_message_to_gpt(self, message: list) -> dict:
         """Sends a message batch to ChatGPT and retrieves the JSON response."""
         try:
 
-            completion = self.client.chat.completions.create(
-                model=self.config['model_name'],
-                messages=message,
-                temperature=self.config['temperature'],
-                max_tokens=self.config['max_tokens'],
-                timeout=self.config['timeout_seconds'],
-            )
+            with metrics.timer("llm_request_seconds", model=self.config['model_name']):
+                completion = self.client.chat.completions.create(
+                    model=self.config['model_name'],
+                    messages=message,
+                    temperature=self.config['temperature'],
+                    max_tokens=self.config['max_tokens'],
+                    timeout=self.config['timeout_seconds'],
+                )
+
+            if completion.usage is not None:
+                metrics.increment("llm_prompt_tokens_total", completion.usage.prompt_tokens, model=self.config['model_name'])
+                metrics.increment("llm_completion_tokens_total", completion.usage.completion_tokens, model=self.config['model_name'])
 
             choice = completion.choices[0]
             response_content = choice.message.content
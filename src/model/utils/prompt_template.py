@@ -0,0 +1,200 @@
+import json
+from functools import lru_cache, cached_property
+from typing import Dict, List, Optional, Union, get_args, get_origin
+from enum import Enum
+
+from pydantic import BaseModel
+
+from src.model.schema import dataclasses as ds
+from src.core.config import settings
+from src.core.models.model_registry import model_registry
+
+
+class PromptTemplate:
+    """
+    Chat prompt split into a static prefix and a per-article suffix.
+
+    The static prefix (system prompt, analysis requirements and response format) is rendered and
+    tokenized once; only the article fields are formatted and counted per request.
+    """
+
+    # Chat format overhead for gpt-4o style models: every message is wrapped in
+    # <|start|>{role}<|message|>{content}<|end|> and the reply is primed with <|start|>assistant<|message|>
+    TOKENS_PER_MESSAGE = 3
+    TOKENS_PER_REPLY = 3
+
+    def __init__(
+        self,
+        version: str,
+        system_prompt: str,
+        instructions: str,
+        article_template: str,
+        encoding_name: str,
+    ):
+        # The article section is appended to the instructions, the boundary has to fall on a
+        # line break so tokenizing the two halves separately matches tokenizing the whole message
+        if not instructions.endswith("\n"):
+            raise ValueError("Prompt instructions must end with a line break")
+
+        self.version = version
+        self.system_prompt = system_prompt
+        self.instructions = instructions
+        self.article_template = article_template
+        self.encoding_name = encoding_name
+
+    @property
+    def tokenizer(self):
+        return model_registry.tokenizer(self.encoding_name)
+
+    @cached_property
+    def static_token_count(self) -> int:
+        """Tokens taken by the static prefix and the chat format overhead, counted once."""
+        return (
+            2 * self.TOKENS_PER_MESSAGE + self.TOKENS_PER_REPLY
+            + len(self.tokenizer.encode("system")) + len(self.tokenizer.encode(self.system_prompt))
+            + len(self.tokenizer.encode("user")) + len(self.tokenizer.encode(self.instructions))
+        )
+
+    def render_article(self, article: Dict[str, str]) -> str:
+        """Fill in the per-article fields of the prompt."""
+        return self.article_template.format(
+            news_id=article['news_id'],
+            title_text=article['title_text'],
+            llm_ready_text=article['llm_ready_text'],
+        )
+
+    def _messages(self, article_text: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": self.instructions + article_text},
+        ]
+
+    def render(self, article: Dict[str, str]) -> List[Dict[str, str]]:
+        """Render the chat messages for a single article."""
+        return self._messages(self.render_article(article))
+
+    def render_with_token_count(self, article: Dict[str, str]) -> tuple[List[Dict[str, str]], int]:
+        """Render the chat messages for a single article along with their prompt token count."""
+        article_text = self.render_article(article)
+        return self._messages(article_text), self.static_token_count + len(self.tokenizer.encode(article_text))
+
+
+# # Template Rendering
+
+SYSTEM_PROMPT = (
+    "You are a financial sentiment analyst. Your role is to analyze crypto-related articles "
+    "and provide structured assessments of their potential impact on Bitcoin prices. "
+    "Analyze each article separately and provide structured results."
+)
+
+ARTICLE_TEMPLATE = (
+    "News ID: {news_id}\n"
+    "Title: {title_text}\n"
+    "Article: {llm_ready_text}"
+)
+
+MAX_SENTENCES = 5
+
+
+def _humanize(field_name: str) -> str:
+    return field_name.replace('_', ' ').title()
+
+
+def _enum_choices(enum_cls: type[Enum], separator: str) -> str:
+    return separator.join(item.value for item in enum_cls)
+
+
+def _field_bounds(field_info) -> tuple[Optional[float], Optional[float]]:
+    """Lower and upper bounds declared on a constrained pydantic field."""
+    lower, upper = None, None
+    for constraint in field_info.metadata:
+        lower = getattr(constraint, 'ge', lower)
+        upper = getattr(constraint, 'le', upper)
+    return lower, upper
+
+
+def _response_placeholder(field_info) -> Union[str, List[str]]:
+    """Placeholder describing the expected JSON value of a schema field."""
+    annotation = field_info.annotation
+    origin = get_origin(annotation)
+
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return f"<{_enum_choices(annotation, ' | ')}>"
+    if origin is list:
+        (item_type,) = get_args(annotation)
+        if isinstance(item_type, type) and issubclass(item_type, Enum):
+            return [f"<{_enum_choices(item_type, ' | ')}>"]
+        return ["<str>", "..."]
+    if origin is Union and type(None) in get_args(annotation):
+        return "<str | null>"
+    if annotation is float:
+        lower, upper = _field_bounds(field_info)
+        return f"<float between {lower} and {upper}>"
+    return "<str>"
+
+
+def _response_format(*models: type[BaseModel]) -> str:
+    skeleton = {"news_id": "<News ID of the article>"}
+    for model in models:
+        for name, field_info in model.model_fields.items():
+            skeleton[name] = _response_placeholder(field_info)
+    return json.dumps(skeleton, indent=4)
+
+
+def create_analysis_requirements() -> str:
+    """Creates the analysis requirements section of the prompt."""
+
+    continuous = "\n".join(
+        f"    - {_humanize(name)}: {field_info.description}"
+        for name, field_info in ds.ContinuousFeatures.model_fields.items()
+    )
+
+    text_fields = []
+    for name, field_info in ds.ArticleTextFields.model_fields.items():
+        if field_info.annotation is str:
+            suffix = f" ({MAX_SENTENCES} sentences max)"
+        elif get_origin(field_info.annotation) is Union:
+            suffix = " (if applicable)"
+        else:
+            suffix = ""
+        text_fields.append(f"    - {_humanize(name)}: {field_info.description}{suffix}")
+
+    return "\n".join([
+        "1. Categorical Analysis:",
+        f"    - Emotion Category: One of: {_enum_choices(ds.EmotionCategory, ', ')}",
+        f"    - Event Categories: A list of: {_enum_choices(ds.EventCategory, ', ')}",
+        f"    - Expected Price Direction: One of: {_enum_choices(ds.PriceDirection, ', ')}",
+        f"    - Timeframe of Impact: One of: {_enum_choices(ds.TimeFrame, ', ')}",
+        "",
+        "2. Continuous Analysis - all values between 0.0 (minimum) and 1.0 (maximum), "
+        "positive, negative and neutral should add up to 1:",
+        continuous,
+        "",
+        "3. Additional Information:",
+        *text_fields,
+    ])
+
+
+@lru_cache(maxsize=None)
+def get_prompt_template(version: str, encoding_name: str = settings.LLM_PARAMS['encoding_name']) -> PromptTemplate:
+    """Build the prompt template for a prompt version, rendered and tokenized once per process."""
+
+    instructions = "\n".join([
+        "Analyze the article provided at the end of this message.",
+        "",
+        "Provide the following details:",
+        create_analysis_requirements(),
+        "",
+        "Respond in structured JSON format, without Markdown or code block formatting:",
+        _response_format(ds.CategoricalFeatures, ds.ContinuousFeatures, ds.ArticleTextFields),
+        "",
+        "",
+    ])
+
+    return PromptTemplate(
+        version=version,
+        system_prompt=SYSTEM_PROMPT,
+        instructions=instructions,
+        article_template=ARTICLE_TEMPLATE,
+        encoding_name=encoding_name,
+    )
@@ -0,0 +1,205 @@
+import json
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union, get_args, get_origin
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pydantic import BaseModel
+
+from src.model.schema import dataclasses as ds
+from src.core.logging.logger import setup_logger
+
+logger = setup_logger("BatchResponseParser", Path("llm_processing.log"))
+
+
+@dataclass
+class ParsedBatch:
+    """Result of parsing a batch of LLM responses."""
+    table: pa.Table
+    malformed: pd.DataFrame = field(
+        default_factory=lambda: pd.DataFrame(columns=['position', 'news_id', 'error'])
+    )
+
+
+class BatchResponseParser:
+    """
+    Validates a batch of LLM responses against the article analysis schema column by column
+    and emits a typed Arrow table, malformed items are reported instead of failing the batch.
+    """
+
+    SCHEMA_MODELS = (ds.CategoricalFeatures, ds.ContinuousFeatures, ds.ArticleTextFields)
+    PARTITION_SCHEMA = pa.schema([
+        pa.field('date_utc', pa.timestamp('us')),
+        pa.field('year_utc', pa.int32()),
+        pa.field('month_utc', pa.int32()),
+        pa.field('day_utc', pa.int32()),
+    ])
+
+    def __init__(self):
+        self.enum_fields: Dict[str, frozenset] = {}
+        self.enum_list_fields: Dict[str, frozenset] = {}
+        self.float_fields: Dict[str, tuple] = {}
+        self.str_fields: List[str] = []
+        self.optional_str_fields: List[str] = []
+        self.str_list_fields: List[str] = []
+
+        arrow_fields = [pa.field('news_id', pa.string(), nullable=False)]
+        for model in self.SCHEMA_MODELS:
+            arrow_fields.extend(self._register_model(model))
+        arrow_fields.append(pa.field('analyzed_at_utc', pa.timestamp('us')))
+
+        self.schema = pa.schema(arrow_fields)
+        self.columns = self.schema.names
+
+    def _register_model(self, model: type[BaseModel]) -> List[pa.Field]:
+        """Derive validation rules and Arrow fields from a pydantic schema model."""
+        arrow_fields = []
+        for name, field_info in model.model_fields.items():
+            annotation = field_info.annotation
+            origin = get_origin(annotation)
+
+            if isinstance(annotation, type) and issubclass(annotation, Enum):
+                self.enum_fields[name] = frozenset(item.value for item in annotation)
+                arrow_fields.append(pa.field(name, pa.string()))
+            elif origin is list:
+                (item_type,) = get_args(annotation)
+                if isinstance(item_type, type) and issubclass(item_type, Enum):
+                    self.enum_list_fields[name] = frozenset(item.value for item in item_type)
+                else:
+                    self.str_list_fields.append(name)
+                arrow_fields.append(pa.field(name, pa.list_(pa.string())))
+            elif origin is Union and type(None) in get_args(annotation):
+                self.optional_str_fields.append(name)
+                arrow_fields.append(pa.field(name, pa.string()))
+            elif annotation is float:
+                lower, upper = -np.inf, np.inf
+                for constraint in field_info.metadata:
+                    lower = getattr(constraint, 'ge', lower)
+                    upper = getattr(constraint, 'le', upper)
+                self.float_fields[name] = (lower, upper)
+                arrow_fields.append(pa.field(name, pa.float32()))
+            else:
+                self.str_fields.append(name)
+                arrow_fields.append(pa.field(name, pa.string()))
+
+        return arrow_fields
+
+    @staticmethod
+    def _decode(responses: Union[str, Iterable[Union[str, Dict[str, Any]]]]) -> tuple[List[Dict], List[Dict]]:
+        """Decode raw responses into dictionaries, collecting the ones that are not JSON objects."""
+        if isinstance(responses, str):
+            responses = json.loads(responses)
+            if isinstance(responses, dict):
+                responses = [responses]
+
+        items, malformed = [], []
+        for position, response in enumerate(responses):
+            try:
+                item = json.loads(response) if isinstance(response, str) else response
+            except json.JSONDecodeError as e:
+                malformed.append({'position': position, 'news_id': None, 'error': f"invalid JSON: {e}"})
+                continue
+
+            if not isinstance(item, dict):
+                malformed.append({'position': position, 'news_id': None, 'error': "response is not a JSON object"})
+                continue
+
+            items.append({**item, '_position': position})
+
+        return items, malformed
+
+    def _validate(self, frame: pd.DataFrame) -> pd.Series:
+        """Return the validation errors of every row, empty strings for valid rows."""
+        errors = pd.Series('', index=frame.index, dtype=object)
+
+        def flag(mask: pd.Series, message: str) -> None:
+            errors.loc[mask[mask].index] += message + '; '
+
+        def is_instance(column: str, types) -> pd.Series:
+            return frame[column].map(lambda value: isinstance(value, types))
+
+        flag(~is_instance('news_id', str), "news_id missing")
+
+        for name, choices in self.enum_fields.items():
+            flag(~frame[name].isin(choices), f"{name} not one of the allowed values")
+
+        for name, choices in self.enum_list_fields.items():
+            is_list = is_instance(name, list)
+            exploded = frame.loc[is_list, name].explode()
+            invalid_members = exploded.notna() & ~exploded.isin(choices)
+            flag(~is_list | frame.index.isin(exploded.index[invalid_members]), f"{name} contains invalid values")
+
+        for name, (lower, upper) in self.float_fields.items():
+            values = pd.to_numeric(frame[name].where(~is_instance(name, bool)), errors='coerce')
+            flag(values.isna() | (values < lower) | (values > upper), f"{name} not a number between {lower} and {upper}")
+            frame[name] = values
+
+        for name in self.str_fields:
+            flag(~is_instance(name, str), f"{name} missing")
+
+        for name in self.optional_str_fields:
+            flag(frame[name].notna() & ~is_instance(name, str), f"{name} not a string")
+
+        for name in self.str_list_fields:
+            valid = frame[name].map(lambda value: isinstance(value, list) and all(isinstance(v, str) for v in value))
+            flag(~valid, f"{name} not a list of strings")
+
+        return errors.str.rstrip('; ')
+
+    def parse(
+        self,
+        responses: Union[str, Iterable[Union[str, Dict[str, Any]]]],
+        article_metadata: Optional[pd.DataFrame] = None,
+    ) -> ParsedBatch:
+        """
+        Parse a batch of responses, either a JSON array or an iterable of JSON documents / decoded objects.
+
+        When article metadata is provided, its date partition columns are attached so the table can be
+        written straight to the LLM Delta table.
+        """
+        items, malformed = self._decode(responses)
+
+        frame = pd.DataFrame.from_records(items, columns=list(dict.fromkeys(['_position', *self.columns[:-1]])))
+        frame = frame.set_index('_position', drop=False)
+
+        errors = self._validate(frame)
+
+        # The Delta merge rejects duplicate source keys, only the last response per article is kept
+        duplicated = frame['news_id'].duplicated(keep='last') & errors.eq('')
+        errors[duplicated] = "duplicate news_id in batch"
+
+        if article_metadata is not None:
+            frame = frame.merge(
+                article_metadata[['news_id'] + self.PARTITION_SCHEMA.names].drop_duplicates('news_id'),
+                on='news_id', how='left'
+            ).set_index('_position', drop=False)
+            errors[frame['date_utc'].isna() & errors.eq('')] = "unknown news_id"
+
+        invalid = errors.ne('')
+        malformed.extend(
+            pd.DataFrame({
+                'position': frame.loc[invalid, '_position'],
+                'news_id': frame.loc[invalid, 'news_id'],
+                'error': errors[invalid],
+            }).to_dict('records')
+        )
+
+        valid = frame.loc[~invalid].drop(columns='_position').reset_index(drop=True)
+        valid['analyzed_at_utc'] = pd.Timestamp.now(tz='UTC').tz_localize(None)
+
+        schema = self.schema
+        if article_metadata is not None:
+            schema = pa.unify_schemas([schema, self.PARTITION_SCHEMA])
+
+        table = pa.Table.from_pandas(valid[schema.names], schema=schema, preserve_index=False)
+
+        if malformed:
+            logger.warning(f"{len(malformed)} out of {len(malformed) + table.num_rows} responses are malformed")
+
+        return ParsedBatch(
+            table=table,
+            malformed=pd.DataFrame(malformed, columns=['position', 'news_id', 'error']).sort_values('position', ignore_index=True),
+        )